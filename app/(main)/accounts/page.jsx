@@ -43,7 +43,6 @@ function AccountsContent() {
   const [deletingAccount, setDeletingAccount] = useState(null);
   const [selectedAccount, setSelectedAccount] = useState(null);
   const [accountTransactions, setAccountTransactions] = useState([]);
-  const [transactionsPage, setTransactionsPage] = useState(1);
   const [balanceChartData, setBalanceChartData] = useState([]);
   const [chartDateRange, setChartDateRange] = useState({
     startDate: new Date(new Date().getFullYear(), new Date().getMonth() - 5, 1).toISOString().split('T')[0],
@@ -66,7 +65,7 @@ function AccountsContent() {
     if (selectedAccount) {
       fetchAccountTransactions(selectedAccount.id);
     }
-  }, [selectedAccount, transactionsPage]);
+  }, [selectedAccount]);
 
   const fetchAccounts = async () => {
     try {
@@ -102,7 +101,7 @@ function AccountsContent() {
 
   const fetchAccountTransactions = async (accountId) => {
     try {
-      const response = await fetch(`/api/transactions?accountId=${accountId}&page=${transactionsPage}&limit=${transactionsPerPage}`);
+      const response = await fetch(`/api/transactions?accountId=${accountId}&limit=${transactionsPerPage}`);
       if (response.ok) {
         const data = await response.json();
         if (data.success) {
@@ -39,39 +39,22 @@ function CategoriesContent() {
 
   const fetchCategories = async () => {
     try {
-      const response = await fetch('/api/categories');
+      // Per-category counts and totals are computed server-side
+      const response = await fetch('/api/categories?stats=true');
       if (response.ok) {
         const data = await response.json();
         if (data.success) {
-          // Calculate total amount for each category by fetching transactions
-          const transactionsResponse = await fetch('/api/transactions');
-          let transactionsByCategory = {};
-          
-          if (transactionsResponse.ok) {
-            const transactionsData = await transactionsResponse.json();
-            if (transactionsData.success) {
-              transactionsByCategory = transactionsData.data.reduce((acc, t) => {
-                const categoryId = t.categoryId;
-                if (!acc[categoryId]) {
-                  acc[categoryId] = { total: 0, count: 0 };
-                }
-                acc[categoryId].total += t.amount;
-                acc[categoryId].count += 1;
-                return acc;
-              }, {});
-            }
-          }
-
           const formattedCategories = data.data.map(cat => ({
             id: cat.id,
             name: cat.name,
             type: cat.type,
-            transactionCount: transactionsByCategory[cat.id]?.count || 0,
-            totalAmount: transactionsByCategory[cat.id]?.total || 0,
+            transactionCount: cat.transactionCount,
+            totalAmount: cat.totalAmount,
             subcategories: cat.subcategories.map(sub => ({
               id: sub.id,
               name: sub.name,
-              transactionCount: 0 // Would need to calculate this properly
+              transactionCount: sub.transactionCount,
+              totalAmount: sub.totalAmount
             }))
           }));
           setCategories(formattedCategories);
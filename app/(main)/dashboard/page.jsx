@@ -61,83 +61,50 @@ function DashboardContent() {
 
   const fetchDashboardData = async () => {
     try {
-      // Fetch analytics data
-      const analyticsResponse = await fetch("/api/analytics");
-      if (analyticsResponse.ok) {
-        const analyticsData = await analyticsResponse.json();
-        if (analyticsData.success) {
-          const data = analyticsData.data;
-          setAnalytics({
-            totalIncome: data.totalIncome || 0,
-            totalExpense: data.totalExpense || 0,
-            netSavings: data.netSavings || 0,
-            transactionCount: data.transactionCount || 0,
-            accountsTotal: data.accountsTotal || 0,
-            monthlyGrowth: 2.5, // Calculate this properly later
-          });
-
-          // Generate monthly data from transactions
-          if (data.monthlyTransactions && data.monthlyTransactions.length > 0) {
-            generateMonthlyData(data.monthlyTransactions);
-          } else {
-            // Set default monthly data if no transactions
-            setMonthlyData([
-              { month: "Oct", income: 0, expense: 0 },
-              { month: "Nov", income: 0, expense: 0 },
-              { month: "Dec", income: 0, expense: 0 },
-              {
-                month: "Jan",
-                income: data.totalIncome || 0,
-                expense: data.totalExpense || 0,
-              },
-            ]);
-          }
-        } else {
-          console.error("Analytics API error:", analyticsData.error);
-        }
+      // Summary, chart, recent transactions and budgets in one request
+      const response = await fetch("/api/dashboard?recent=5");
+      const dashboard = await response.json();
+      if (!response.ok || !dashboard.success) {
+        throw new Error(dashboard.error || `Request failed with status ${response.status}`);
       }
 
-      // Fetch recent transactions (limit to 5)
-      const transactionsResponse = await fetch("/api/transactions");
-      if (transactionsResponse.ok) {
-        const transactionsData = await transactionsResponse.json();
-        if (transactionsData.success) {
-          const transactions = transactionsData.data.slice(0, 5).map((t) => ({
-            id: t.id,
-            description: t.description,
-            amount: t.category.type === "INCOME" ? t.amount : -t.amount,
-            category: t.category.name,
-            date: t.date,
-            account: t.account.name,
-          }));
-          setRecentTransactions(transactions);
-        }
-      }
+      const { summary, monthly, recentTransactions, budgets } = dashboard.data;
+      setAnalytics({
+        ...summary,
+        monthlyGrowth: 2.5, // Calculate this properly later
+      });
 
-      // For now, keep budget data as mock since we haven't implemented budgets yet
-      setBudgets([
-        {
-          id: 1,
-          name: "Food & Dining",
-          spent: 450,
-          budget: 600,
-          percentage: 75,
-        },
-        {
-          id: 2,
-          name: "Transportation",
-          spent: 180,
-          budget: 200,
-          percentage: 90,
-        },
-        {
-          id: 3,
-          name: "Entertainment",
-          spent: 120,
-          budget: 300,
-          percentage: 40,
-        },
-      ]);
+      setMonthlyData(
+        monthly.map((m) => ({
+          month: new Date(`${m.month}-01T00:00:00Z`).toLocaleString("default", {
+            month: "short",
+            timeZone: "UTC",
+          }),
+          income: m.income,
+          expense: m.expense,
+        }))
+      );
+
+      setRecentTransactions(
+        recentTransactions.map((t) => ({
+          id: t.id,
+          description: t.description,
+          amount: t.category.type === "INCOME" ? t.amount : -t.amount,
+          category: t.category.name,
+          date: t.date,
+          account: t.account.name,
+        }))
+      );
+
+      setBudgets(
+        budgets.map((b) => ({
+          id: b.id,
+          name: b.name,
+          spent: b.spent,
+          budget: b.amount,
+          percentage: Math.round(b.progress),
+        }))
+      );
     } catch (error) {
       console.error("Failed to fetch dashboard data:", error);
       // If API calls fail, set default values
@@ -150,6 +117,7 @@ function DashboardContent() {
         monthlyGrowth: 0,
       });
       setRecentTransactions([]);
+      setBudgets([]);
     } finally {
       setLoading(false);
     }
@@ -165,37 +133,6 @@ function DashboardContent() {
     }).format(Math.abs(amount));
   };
 
-  // Helper function to generate monthly data from transactions
-  const generateMonthlyData = (transactions) => {
-    const monthlyMap = {};
-    const now = new Date();
-
-    // Initialize last 4 months
-    for (let i = 3; i >= 0; i--) {
-      const date = new Date(now.getFullYear(), now.getMonth() - i, 1);
-      const monthKey = date.toLocaleString("default", { month: "short" });
-      monthlyMap[monthKey] = { month: monthKey, income: 0, expense: 0 };
-    }
-
-    // Process transactions
-    transactions.forEach((transaction) => {
-      const transactionDate = new Date(transaction.date);
-      const monthKey = transactionDate.toLocaleString("default", {
-        month: "short",
-      });
-
-      if (monthlyMap[monthKey]) {
-        if (transaction.category.type === "INCOME") {
-          monthlyMap[monthKey].income += transaction.amount;
-        } else {
-          monthlyMap[monthKey].expense += transaction.amount;
-        }
-      }
-    });
-
-    setMonthlyData(Object.values(monthlyMap));
-  };
-
   // Handler functions for dashboard buttons
   const handleAddTransaction = () => {
     setShowAddTransactionModal(true);
@@ -205,62 +142,51 @@ function DashboardContent() {
     // Create file input element
     const input = document.createElement("input");
     input.type = "file";
-    input.accept = ".csv,.xlsx,.xls";
-    input.onchange = (e) => {
+    input.accept = ".csv";
+    input.onchange = async (e) => {
       const file = e.target.files[0];
-      if (file) {
+      if (!file) return;
+
+      try {
+        const formData = new FormData();
+        formData.append("file", file);
+        const response = await fetch("/api/upload", {
+          method: "POST",
+          body: formData,
+        });
+        const result = await response.json();
+        if (!result.success) {
+          alert(`Import failed: ${result.error}`);
+          return;
+        }
+
+        const { imported, skipped, failed, errors } = result.data;
+        const details = errors
+          .slice(0, 5)
+          .map((e) => `Line ${e.row}: ${e.error}`)
+          .join("\n");
         alert(
-          `Import functionality for "${file.name}" will be implemented soon!`
+          `Imported ${imported} transactions` +
+            (skipped ? `, ${skipped} already imported` : "") +
+            (failed ? `, ${failed} rows skipped:\n${details}` : "")
         );
+        fetchDashboardData();
+      } catch (error) {
+        console.error("Error importing data:", error);
+        alert("Import failed");
       }
     };
     input.click();
   };
 
   const handleExportData = () => {
-    // Export all transactions to CSV
-    fetch("/api/transactions")
-      .then((response) => response.json())
-      .then((data) => {
-        if (data.success) {
-          const csvContent = [
-            [
-              "Date",
-              "Description",
-              "Category",
-              "Account",
-              "Type",
-              "Amount",
-            ].join(","),
-            ...data.data.map((t) =>
-              [
-                new Date(t.date).toLocaleDateString(),
-                `"${t.description}"`,
-                t.category.name,
-                t.account.name,
-                t.category.type,
-                t.amount,
-              ].join(",")
-            ),
-          ].join("\n");
-
-          const blob = new Blob([csvContent], {
-            type: "text/csv;charset=utf-8;",
-          });
-          const link = document.createElement("a");
-          const url = URL.createObjectURL(blob);
-          link.setAttribute("href", url);
-          link.setAttribute(
-            "download",
-            `financial_data_${new Date().toISOString().split("T")[0]}.csv`
-          );
-          link.style.visibility = "hidden";
-          document.body.appendChild(link);
-          link.click();
-          document.body.removeChild(link);
-        }
-      })
-      .catch((error) => console.error("Export failed:", error));
+    // The server streams every transaction as CSV
+    const link = document.createElement("a");
+    link.setAttribute("href", "/api/export?format=csv");
+    link.style.visibility = "hidden";
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
   };
 
   const handleTransactionSuccess = () => {
@@ -41,6 +41,15 @@ import {
 
 const CHART_COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042', '#8884D8', '#82CA9D', '#FFC658', '#FF7C7C'];
 
+// Time filter -> /api/reports bucket
+const REPORT_BUCKETS = {
+  daily: 'day',
+  weekly: 'week',
+  monthly: 'month',
+  quarterly: 'quarter',
+  yearly: 'year'
+};
+
 export default function ReportsPage() {
   const [timeFilter, setTimeFilter] = useState("monthly");
   const [reportType, setReportType] = useState("overview");
@@ -50,8 +59,6 @@ export default function ReportsPage() {
     startDate: new Date(new Date().getFullYear(), new Date().getMonth() - 2, 1).toISOString().split('T')[0],
     endDate: new Date().toISOString().split('T')[0]
   });
-  const [transactions, setTransactions] = useState([]);
-  const [categories, setCategories] = useState([]);
   const [categoryTableVisible, setCategoryTableVisible] = useState(true);
 
   useEffect(() => {
@@ -61,22 +68,17 @@ export default function ReportsPage() {
   const fetchReportData = async () => {
     setLoading(true);
     try {
-      // Fetch transactions based on date range
-      const transactionsUrl = `/api/transactions?startDate=${dateRange.startDate}&endDate=${dateRange.endDate}`;
-      const transactionsResponse = await fetch(transactionsUrl);
-      const transactionsData = await transactionsResponse.json();
-      
-      // Fetch categories
-      const categoriesResponse = await fetch('/api/categories');
-      const categoriesData = await categoriesResponse.json();
+      // Totals, series and breakdown are computed server-side for the range
+      const params = new URLSearchParams({
+        bucket: REPORT_BUCKETS[timeFilter],
+        startDate: dateRange.startDate,
+        endDate: dateRange.endDate
+      });
+      const response = await fetch(`/api/reports?${params}`);
+      const report = await response.json();
       
-      if (transactionsData.success && categoriesData.success) {
-        setTransactions(transactionsData.data);
-        setCategories(categoriesData.data);
-        
-        // Process data based on current filters
-        const processedData = processTransactionData(transactionsData.data, categoriesData.data);
-        setReportData(processedData);
+      if (report.success) {
+        setReportData(processReport(report.data));
       }
     } catch (error) {
       console.error("Failed to fetch report data:", error);
@@ -85,97 +87,26 @@ export default function ReportsPage() {
     }
   };
 
-  const processTransactionData = (transactions, categories) => {
-    const income = transactions.filter(t => t.category.type === 'INCOME');
-    const expenses = transactions.filter(t => t.category.type === 'EXPENSE');
-    
-    const totalIncome = income.reduce((sum, t) => sum + t.amount, 0);
-    const totalExpense = expenses.reduce((sum, t) => sum + t.amount, 0);
-    const netSavings = totalIncome - totalExpense;
-    
-    // Category breakdown
-    const categoryBreakdown = {};
-    expenses.forEach(t => {
-      if (!categoryBreakdown[t.category.name]) {
-        categoryBreakdown[t.category.name] = 0;
-      }
-      categoryBreakdown[t.category.name] += t.amount;
-    });
-    
-    const categoryChartData = Object.entries(categoryBreakdown)
-      .map(([name, value], index) => ({
-        name,
-        value,
+  const processReport = ({ totals, series, categories }) => {
+    const categoryBreakdown = categories
+      .filter(category => category.type === 'EXPENSE')
+      .map((category, index) => ({
+        name: category.name,
+        value: category.totalAmount,
         color: CHART_COLORS[index % CHART_COLORS.length]
-      }))
-      .sort((a, b) => b.value - a.value);
-    
-    // Time-based data
-    const timeBasedData = generateTimeBasedData(transactions);
+      }));
     
     return {
       overview: {
-        totalIncome,
-        totalExpense,
-        netSavings,
-        transactionCount: transactions.length,
-        avgTransactionSize: transactions.length > 0 ? (totalIncome + totalExpense) / transactions.length : 0,
-        categoryBreakdown: categoryChartData,
-        timeBasedData,
-        categoryWiseTable: generateCategoryTable(categories, transactions)
+        ...totals,
+        categoryBreakdown,
+        monthlyTrend: series,
+        dailySpending: series.map(point => ({ date: point.period, amount: point.expense })),
+        categoryWiseTable: categories
       }
     };
   };
 
-  const generateTimeBasedData = (transactions) => {
-    const data = {};
-    
-    transactions.forEach(t => {
-      const date = new Date(t.date);
-      let key;
-      
-      if (timeFilter === 'daily') {
-        key = date.toLocaleDateString();
-      } else if (timeFilter === 'monthly') {
-        key = date.toLocaleString('default', { month: 'short', year: 'numeric' });
-      } else if (timeFilter === 'yearly') {
-        key = date.getFullYear().toString();
-      }
-      
-      if (!data[key]) {
-        data[key] = { period: key, income: 0, expense: 0, net: 0 };
-      }
-      
-      if (t.category.type === 'INCOME') {
-        data[key].income += t.amount;
-      } else {
-        data[key].expense += t.amount;
-      }
-      data[key].net = data[key].income - data[key].expense;
-    });
-    
-    return Object.values(data).sort((a, b) => new Date(a.period) - new Date(b.period));
-  };
-
-  const generateCategoryTable = (categories, transactions) => {
-    return categories.map(category => {
-      const categoryTransactions = transactions.filter(t => t.categoryId === category.id);
-      const totalAmount = categoryTransactions.reduce((sum, t) => sum + t.amount, 0);
-      const transactionCount = categoryTransactions.length;
-      const avgAmount = transactionCount > 0 ? totalAmount / transactionCount : 0;
-      
-      return {
-        id: category.id,
-        name: category.name,
-        type: category.type,
-        totalAmount,
-        transactionCount,
-        avgAmount,
-        percentage: transactions.length > 0 ? (transactionCount / transactions.length) * 100 : 0
-      };
-    }).filter(cat => cat.totalAmount > 0).sort((a, b) => b.totalAmount - a.totalAmount);
-  };
-
   const formatCurrency = (amount) => {
     return new Intl.NumberFormat('en-IN', {
       style: 'currency',
@@ -244,7 +175,9 @@ export default function ReportsPage() {
             </SelectTrigger>
             <SelectContent>
               <SelectItem value="daily">Daily</SelectItem>
+              <SelectItem value="weekly">Weekly</SelectItem>
               <SelectItem value="monthly">Monthly</SelectItem>
+              <SelectItem value="quarterly">Quarterly</SelectItem>
               <SelectItem value="yearly">Yearly</SelectItem>
             </SelectContent>
           </Select>
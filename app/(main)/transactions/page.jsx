@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState } from "react";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
@@ -25,10 +25,20 @@ import DashboardLayout from "@/components/layout/DashboardLayout";
 import AddTransactionModal from "@/components/modals/AddTransactionModal";
 import AddIncomeModal from "@/components/modals/AddIncomeModal";
 import AddExpenseModal from "@/components/modals/AddExpenseModal";
+import { useCursorPages } from "@/hooks/useCursorPages";
+
+// Rows fetched per request; older transactions load on demand
+const TRANSACTIONS_PAGE_SIZE = 50;
 
 function TransactionsContent() {
-  const [transactions, setTransactions] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const {
+    rows,
+    hasMore,
+    loading,
+    loadingMore,
+    loadMore,
+    reload: fetchTransactions
+  } = useCursorPages('/api/transactions', { limit: TRANSACTIONS_PAGE_SIZE });
   const [searchQuery, setSearchQuery] = useState("");
   const [currentPage, setCurrentPage] = useState(1);
   const [viewType, setViewType] = useState("table"); // "table" or "card"
@@ -42,42 +52,16 @@ function TransactionsContent() {
   const [dateRange, setDateRange] = useState({ start: "", end: "" });
   const transactionsPerPage = 10;
 
-  useEffect(() => {
-    fetchTransactions();
-  }, [currentPage]);
-
-  const fetchTransactions = async () => {
-    try {
-      const response = await fetch('/api/transactions');
-      if (response.ok) {
-        const data = await response.json();
-        if (data.success) {
-          const formattedTransactions = data.data.map(t => ({
-            id: t.id,
-            description: t.description,
-            amount: t.amount,
-            category: t.category.name,
-            subcategory: t.subcategory?.name || null,
-            account: t.account.name,
-            date: t.date,
-            type: t.category.type
-          }));
-          setTransactions(formattedTransactions);
-        } else {
-          console.error('API error:', data.error);
-          setTransactions([]);
-        }
-      } else {
-        console.error('Failed to fetch transactions');
-        setTransactions([]);
-      }
-    } catch (error) {
-      console.error("Failed to fetch transactions:", error);
-      setTransactions([]);
-    } finally {
-      setLoading(false);
-    }
-  };
+  const transactions = rows.map(t => ({
+    id: t.id,
+    description: t.description,
+    amount: t.amount,
+    category: t.category.name,
+    subcategory: t.subcategory?.name || null,
+    account: t.account.name,
+    date: t.date,
+    type: t.category.type
+  }));
 
   const formatCurrency = (amount) => {
     return new Intl.NumberFormat('en-IN', {
@@ -126,27 +110,13 @@ function TransactionsContent() {
   };
 
   const handleExport = () => {
-    // Convert transactions to CSV format
-    const csvContent = [
-      // Header row
-      ['Date', 'Description', 'Category', 'Account', 'Type', 'Amount'].join(','),
-      // Data rows
-      ...filteredTransactions.map(t => [
-        new Date(t.date).toLocaleDateString(),
-        `"${t.description}"`,
-        t.category,
-        t.account,
-        t.type,
-        t.amount
-      ].join(','))
-    ].join('\n');
-
-    // Create and download file
-    const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
+    // Only some pages are loaded here, so the server streams the full CSV
+    // for the selected date range
+    const params = new URLSearchParams({ format: 'csv' });
+    if (dateRange.start) params.set('startDate', dateRange.start);
+    if (dateRange.end) params.set('endDate', dateRange.end);
     const link = document.createElement('a');
-    const url = URL.createObjectURL(blob);
-    link.setAttribute('href', url);
-    link.setAttribute('download', `transactions_${new Date().toISOString().split('T')[0]}.csv`);
+    link.setAttribute('href', `/api/export?${params}`);
     link.style.visibility = 'hidden';
     document.body.appendChild(link);
     link.click();
@@ -327,7 +297,7 @@ function TransactionsContent() {
       {/* Transactions List */}
       <Card>
         <CardHeader>
-          <CardTitle>All Transactions ({filteredTransactions.length})</CardTitle>
+          <CardTitle>All Transactions ({filteredTransactions.length}{hasMore ? "+" : ""})</CardTitle>
         </CardHeader>
         <CardContent>
           {filteredTransactions.length === 0 ? (
@@ -515,6 +485,19 @@ function TransactionsContent() {
               )}
             </>
           )}
+
+          {/* Older transactions, one page per click */}
+          {hasMore && (
+            <div className="flex justify-center mt-4">
+              <Button
+                variant="outline"
+                onClick={loadMore}
+                disabled={loadingMore}
+              >
+                {loadingMore ? "Loading..." : "Load more transactions"}
+              </Button>
+            </div>
+          )}
         </CardContent>
       </Card>
 
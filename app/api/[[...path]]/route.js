@@ -1,32 +1,9 @@
 import { NextResponse } from 'next/server'
-import { auth } from '@clerk/nextjs/server'
 import { prisma } from '@/lib/prisma'
-import * as XLSX from 'xlsx'
-
-// Helper function to get authenticated user
-async function getAuthenticatedUser() {
-  const { userId } = auth()
-  if (!userId) {
-    return null
-  }
-  
-  // Find or create user in our database
-  let user = await prisma.user.findUnique({
-    where: { clerkId: userId }
-  })
-  
-  if (!user) {
-    // Create user if doesn't exist
-    user = await prisma.user.create({
-      data: {
-        clerkId: userId,
-        email: '', // Will be updated when user provides it
-      }
-    })
-  }
-  
-  return user
-}
+import { getAuthenticatedUser, invalidateUser } from '@/lib/auth'
+import { LedgerConflictError, createLedgerTransaction, deleteLedgerTransaction, findAccountAndCategory, updateLedgerAccount, updateLedgerTransaction } from '@/lib/ledger'
+import { invalidFilter, transactionWhere } from '@/lib/filters'
+import { invalidateReports } from '@/lib/reports'
 
 // GET /api/accounts
 async function getAccounts() {
@@ -68,6 +45,7 @@ async function createAccount(request) {
         name, 
         type, 
         balance: parseFloat(balance),
+        openingBalance: parseFloat(balance),
         userId: user.id
       }
     })
@@ -171,40 +149,11 @@ async function getTransactions(request) {
     }
 
     const url = new URL(request.url)
-    const search = url.searchParams.get('search') || ''
-    const categoryId = url.searchParams.get('categoryId')
-    const subcategoryId = url.searchParams.get('subcategoryId')
-    const accountId = url.searchParams.get('accountId')
-    const startDate = url.searchParams.get('startDate')
-    const endDate = url.searchParams.get('endDate')
-    
-    const whereClause = { userId: user.id }
-    
-    if (search) {
-      whereClause.description = {
-        contains: search,
-        mode: 'insensitive'
-      }
-    }
-    
-    if (categoryId) {
-      whereClause.categoryId = categoryId
-    }
-    
-    if (subcategoryId) {
-      whereClause.subcategoryId = subcategoryId
-    }
-    
-    if (accountId) {
-      whereClause.accountId = accountId
-    }
-    
-    if (startDate && endDate) {
-      whereClause.date = {
-        gte: new Date(startDate),
-        lte: new Date(endDate)
-      }
+    const filterError = invalidFilter(url.searchParams)
+    if (filterError) {
+      return NextResponse.json({ success: false, error: filterError }, { status: 400 })
     }
+    const whereClause = transactionWhere(user.id, url.searchParams)
     
     const transactions = await prisma.transaction.findMany({
       where: whereClause,
@@ -232,45 +181,18 @@ async function createTransaction(request) {
     }
 
     const body = await request.json()
-    const { amount, description, date, accountId, categoryId, subcategoryId } = body
+    const { accountId, categoryId } = body
     
     // Verify account and category belong to user
-    const account = await prisma.account.findFirst({
-      where: { id: accountId, userId: user.id }
-    })
-    
-    const category = await prisma.category.findFirst({
-      where: { id: categoryId, userId: user.id }
-    })
+    const [account, category] = await findAccountAndCategory(user.id, accountId, categoryId)
     
     if (!account || !category) {
       return NextResponse.json({ success: false, error: 'Invalid account or category' }, { status: 400 })
     }
     
-    // Create transaction
-    const transaction = await prisma.transaction.create({
-      data: {
-        amount: parseFloat(amount),
-        description,
-        date: new Date(date),
-        accountId,
-        categoryId,
-        subcategoryId: subcategoryId || null,
-        userId: user.id
-      },
-      include: {
-        account: true,
-        category: true,
-        subcategory: true
-      }
-    })
-    
-    // Update account balance
-    const balanceChange = category.type === 'INCOME' ? parseFloat(amount) : -parseFloat(amount)
-    await prisma.account.update({
-      where: { id: accountId },
-      data: { balance: { increment: balanceChange } }
-    })
+    // Create the transaction, its rollup entry and the balance change atomically
+    const transaction = await createLedgerTransaction(user.id, body, category)
+    invalidateReports(user.id)
     
     return NextResponse.json({ success: true, data: transaction })
   } catch (error) {
@@ -372,128 +294,6 @@ async function getAnalytics(request) {
   }
 }
 
-// GET /api/export?format=csv|xlsx
-async function exportTransactions(request) {
-  try {
-    const user = await getAuthenticatedUser()
-    if (!user) {
-      return NextResponse.json({ success: false, error: 'Unauthorized' }, { status: 401 })
-    }
-
-    const url = new URL(request.url)
-    const format = url.searchParams.get('format') || 'csv'
-    
-    // Fetch user's transactions with related data
-    const transactions = await prisma.transaction.findMany({
-      where: { userId: user.id },
-      include: {
-        account: true,
-        category: true,
-        subcategory: true
-      },
-      orderBy: { date: 'desc' }
-    })
-    
-    // Prepare data for export
-    const exportData = transactions.map(t => ({
-      Date: new Date(t.date).toLocaleDateString(),
-      Description: t.description,
-      Amount: t.amount,
-      Category: t.category.name,
-      Subcategory: t.subcategory?.name || '',
-      Account: t.account.name,
-      Type: t.category.type
-    }))
-    
-    if (format === 'xlsx') {
-      // Create Excel file
-      const wb = XLSX.utils.book_new()
-      const ws = XLSX.utils.json_to_sheet(exportData)
-      
-      // Auto-size columns
-      const colWidths = []
-      const headers = Object.keys(exportData[0] || {})
-      headers.forEach((header, i) => {
-        const maxLength = Math.max(
-          header.length,
-          ...exportData.map(row => String(row[header]).length)
-        )
-        colWidths[i] = { wch: Math.min(maxLength + 2, 50) }
-      })
-      ws['!cols'] = colWidths
-      
-      XLSX.utils.book_append_sheet(wb, ws, 'Transactions')
-      
-      const buffer = XLSX.write(wb, { type: 'buffer', bookType: 'xlsx' })
-      
-      return new NextResponse(buffer, {
-        headers: {
-          'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-          'Content-Disposition': `attachment; filename="transactions-${new Date().toISOString().split('T')[0]}.xlsx"`
-        }
-      })
-    } else {
-      // Create CSV
-      const headers = ['Date', 'Description', 'Amount', 'Category', 'Subcategory', 'Account', 'Type']
-      const csvRows = [headers.join(',')]
-      
-      exportData.forEach(row => {
-        const values = headers.map(header => {
-          const value = row[header] || ''
-          // Escape quotes and wrap in quotes if contains comma or quote
-          if (typeof value === 'string' && (value.includes(',') || value.includes('"'))) {
-            return `"${value.replace(/"/g, '""')}"`
-          }
-          return value
-        })
-        csvRows.push(values.join(','))
-      })
-      
-      const csvContent = csvRows.join('\n')
-      
-      return new NextResponse(csvContent, {
-        headers: {
-          'Content-Type': 'text/csv',
-          'Content-Disposition': `attachment; filename="transactions-${new Date().toISOString().split('T')[0]}.csv"`
-        }
-      })
-    }
-  } catch (error) {
-    console.error('Error exporting transactions:', error)
-    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
-  }
-}
-
-// File upload handler (placeholder - needs implementation)
-async function uploadFile(request) {
-  try {
-    const user = await getAuthenticatedUser()
-    if (!user) {
-      return NextResponse.json({ success: false, error: 'Unauthorized' }, { status: 401 })
-    }
-    // TODO: Implement file upload logic
-    return NextResponse.json({ success: false, error: 'File upload not implemented' }, { status: 501 })
-  } catch (error) {
-    console.error('Error uploading file:', error)
-    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
-  }
-}
-
-// Import transactions handler (placeholder - needs implementation)
-async function importTransactions(request) {
-  try {
-    const user = await getAuthenticatedUser()
-    if (!user) {
-      return NextResponse.json({ success: false, error: 'Unauthorized' }, { status: 401 })
-    }
-    // TODO: Implement import logic
-    return NextResponse.json({ success: false, error: 'Import not implemented' }, { status: 501 })
-  } catch (error) {
-    console.error('Error importing transactions:', error)
-    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
-  }
-}
-
 export async function GET(request, { params }) {
   const path = params?.path?.join('/') || ''
   
@@ -507,8 +307,6 @@ export async function GET(request, { params }) {
         return await getTransactions(request)
       case 'analytics':
         return await getAnalytics(request)
-      case 'export':
-        return await exportTransactions(request)
       default:
         return NextResponse.json({ error: 'Not found' }, { status: 404 })
     }
@@ -529,10 +327,6 @@ export async function POST(request, { params }) {
         return await createCategory(request)
       case 'transactions':
         return await createTransaction(request)
-      case 'upload':
-        return await uploadFile(request)
-      case 'import':
-        return await importTransactions(request)
       default:
         // Handle subcategory creation
         if (path.includes('categories') && path.includes('subcategories')) {
@@ -561,65 +355,36 @@ export async function PUT(request, { params }) {
     if (pathParts[0] === 'transactions' && pathParts[1]) {
       const transactionId = pathParts[1]
       const body = await request.json()
-      const { amount, description, date, accountId, categoryId, subcategoryId } = body
+      const { accountId, categoryId } = body
       
-      // Get the old transaction to calculate balance difference
-      const oldTransaction = await prisma.transaction.findFirst({
-        where: { id: transactionId, userId: user.id },
-        include: { category: true }
-      })
+      // Get the old transaction and verify the new account and category belong to user
+      const [oldTransaction, [account, category]] = await Promise.all([
+        prisma.transaction.findFirst({
+          where: { id: transactionId, userId: user.id },
+          include: { category: true }
+        }),
+        findAccountAndCategory(user.id, accountId, categoryId)
+      ])
       
       if (!oldTransaction) {
         return NextResponse.json({ success: false, error: 'Transaction not found' }, { status: 404 })
       }
       
-      // Verify new account and category belong to user
-      const account = await prisma.account.findFirst({
-        where: { id: accountId, userId: user.id }
-      })
-      
-      const category = await prisma.category.findFirst({
-        where: { id: categoryId, userId: user.id }
-      })
-      
       if (!account || !category) {
         return NextResponse.json({ success: false, error: 'Invalid account or category' }, { status: 400 })
       }
       
-      // Update transaction
-      const updatedTransaction = await prisma.transaction.update({
-        where: { id: transactionId },
-        data: {
-          amount: parseFloat(amount),
-          description,
-          date: new Date(date),
-          accountId,
-          categoryId,
-          subcategoryId: subcategoryId || null
-        },
-        include: {
-          account: true,
-          category: true,
-          subcategory: true
+      // Update the transaction, move it between rollup buckets and balances atomically
+      let updatedTransaction
+      try {
+        updatedTransaction = await updateLedgerTransaction(oldTransaction, body, category)
+      } catch (error) {
+        if (error instanceof LedgerConflictError) {
+          return NextResponse.json({ success: false, error: error.message }, { status: 409 })
         }
-      })
-      
-      // Recalculate account balances if account or amount changed
-      if (oldTransaction.accountId !== accountId || oldTransaction.amount !== parseFloat(amount) || oldTransaction.categoryId !== categoryId) {
-        // Reverse old transaction effect
-        const oldBalanceChange = oldTransaction.category.type === 'INCOME' ? -oldTransaction.amount : oldTransaction.amount
-        await prisma.account.update({
-          where: { id: oldTransaction.accountId },
-          data: { balance: { increment: oldBalanceChange } }
-        })
-        
-        // Apply new transaction effect
-        const newBalanceChange = category.type === 'INCOME' ? parseFloat(amount) : -parseFloat(amount)
-        await prisma.account.update({
-          where: { id: accountId },
-          data: { balance: { increment: newBalanceChange } }
-        })
+        throw error
       }
+      invalidateReports(user.id)
       
       return NextResponse.json({ success: true, data: updatedTransaction })
     }
@@ -659,6 +424,7 @@ export async function PUT(request, { params }) {
         where: { id: user.id },
         data: { defaultAccountId: accountId }
       })
+      invalidateUser(user.id)
       
       return NextResponse.json({ success: true, data: updatedAccount })
     }
@@ -669,10 +435,7 @@ export async function PUT(request, { params }) {
       const body = await request.json()
       const { name, type, balance } = body
       
-      const updatedAccount = await prisma.account.update({
-        where: { id: accountId, userId: user.id },
-        data: { name, type, balance: parseFloat(balance) }
-      })
+      const updatedAccount = await updateLedgerAccount(user.id, accountId, { name, type, balance })
       
       return NextResponse.json({ success: true, data: updatedAccount })
     }
@@ -687,6 +450,7 @@ export async function PUT(request, { params }) {
         where: { id: categoryId, userId: user.id },
         data: { name, type }
       })
+      invalidateReports(user.id)
       
       return NextResponse.json({ success: true, data: updatedCategory })
     }
@@ -712,22 +476,10 @@ export async function DELETE(request, { params }) {
     if (pathParts[0] === 'transactions' && pathParts[1]) {
       const transactionId = pathParts[1]
       
-      // Get transaction details before deleting to reverse account balance
-      const transaction = await prisma.transaction.findFirst({
-        where: { id: transactionId, userId: user.id },
-        include: { category: true }
-      })
-      
+      // Delete the transaction and reverse its rollup entry and balance change atomically
+      const transaction = await deleteLedgerTransaction(user.id, transactionId)
       if (transaction) {
-        // Reverse the transaction's effect on account balance
-        const balanceChange = transaction.category.type === 'INCOME' ? -transaction.amount : transaction.amount
-        await prisma.account.update({
-          where: { id: transaction.accountId },
-          data: { balance: { increment: balanceChange } }
-        })
-        
-        // Delete the transaction
-        await prisma.transaction.delete({ where: { id: transactionId } })
+        invalidateReports(user.id)
       }
       
       return NextResponse.json({ success: true })
@@ -752,6 +504,8 @@ export async function DELETE(request, { params }) {
       await prisma.account.delete({ 
         where: { id: accountId, userId: user.id } 
       })
+      // The cached user may still point its defaultAccountId at this account
+      invalidateUser(user.id)
       return NextResponse.json({ success: true })
     }
     
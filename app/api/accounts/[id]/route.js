@@ -1,29 +1,7 @@
 import { NextResponse } from 'next/server'
-import { auth } from '@clerk/nextjs/server'
 import { prisma } from '@/lib/prisma'
-
-// Helper function to get authenticated user
-async function getAuthenticatedUser() {
-  const { userId } = auth()
-  if (!userId) {
-    return null
-  }
-  
-  let user = await prisma.user.findUnique({
-    where: { clerkId: userId }
-  })
-  
-  if (!user) {
-    user = await prisma.user.create({
-      data: {
-        clerkId: userId,
-        email: '',
-      }
-    })
-  }
-  
-  return user
-}
+import { getAuthenticatedUser, invalidateUser } from '@/lib/auth'
+import { updateLedgerAccount } from '@/lib/ledger'
 
 // PUT /api/accounts/[id]
 export async function PUT(request, { params }) {
@@ -37,10 +15,7 @@ export async function PUT(request, { params }) {
     const body = await request.json()
     const { name, type, balance } = body
     
-    const updatedAccount = await prisma.account.update({
-      where: { id: accountId, userId: user.id },
-      data: { name, type, balance: parseFloat(balance) }
-    })
+    const updatedAccount = await updateLedgerAccount(user.id, accountId, { name, type, balance })
     
     return NextResponse.json({ success: true, data: updatedAccount })
   } catch (error) {
@@ -74,6 +49,8 @@ export async function DELETE(request, { params }) {
     await prisma.account.delete({ 
       where: { id: accountId, userId: user.id } 
     })
+    // The cached user may still point its defaultAccountId at this account
+    invalidateUser(user.id)
     return NextResponse.json({ success: true })
   } catch (error) {
     console.error('Delete Error:', error)
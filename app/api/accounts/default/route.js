@@ -1,23 +1,7 @@
 import { NextResponse } from 'next/server'
 import { prisma } from '@/lib/prisma'
-
-// Temporary helper function without authentication
-async function getAuthenticatedUser() {
-  // For development, return the first user or create a demo user
-  let user = await prisma.user.findFirst()
-  
-  if (!user) {
-    // Create a demo user if none exists
-    user = await prisma.user.create({
-      data: {
-        clerkId: 'demo-user-001',
-        email: 'demo@example.com',
-      }
-    })
-  }
-  
-  return user
-}
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser, invalidateUser } from '@/lib/auth'
 
 // PUT /api/accounts/default - Set default account
 export async function PUT(request) {
@@ -60,6 +44,7 @@ export async function PUT(request) {
       where: { id: user.id },
       data: { defaultAccountId: accountId }
     })
+    invalidateUser(user.id)
     
     return NextResponse.json({ 
       success: true, 
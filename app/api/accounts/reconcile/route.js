@@ -0,0 +1,38 @@
+import { NextResponse } from 'next/server'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { ReconcileError, reconcileBalances } from '@/lib/reconcile'
+
+// The handlers read nothing from the request, so without this Next.js would
+// prerender GET at build time and serve that stale report forever
+export const dynamic = 'force-dynamic'
+
+const reconcile = async (apply) => {
+  try {
+    const user = await getAuthenticatedUser()
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'User not found' }, { status: 400 })
+    }
+
+    const result = await reconcileBalances({ userId: user.id, apply })
+    return NextResponse.json({ success: true, data: result })
+  } catch (error) {
+    if (error instanceof ReconcileError) {
+      return NextResponse.json({ success: false, error: error.message }, { status: 409 })
+    }
+    console.error('Error reconciling balances:', error)
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
+  }
+}
+
+// GET /api/accounts/reconcile - report accounts whose balance differs from
+// opening balance plus transactions, without changing anything
+export async function GET() {
+  return reconcile(false)
+}
+
+// POST /api/accounts/reconcile - same report, then correct those balances;
+// refused with 409 while any account is still waiting for its baseline
+export async function POST() {
+  return reconcile(true)
+}
@@ -1,68 +1,38 @@
 import { NextResponse } from 'next/server'
-// import { auth } from '@clerk/nextjs/server' // Temporarily disabled
 import { prisma } from '@/lib/prisma'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser, invalidateUser } from '@/lib/auth'
+import { ACCOUNT_SELECTION, parseSelection, pickFields } from '@/lib/fields'
+import { updateLedgerAccount } from '@/lib/ledger'
+import { invalidateReports } from '@/lib/reports'
 
-// Temporary helper function without authentication
-async function getAuthenticatedUser() {
-  // For development, return the first user or create a demo user
-  let user = await prisma.user.findFirst()
-  
-  if (!user) {
-    // Create a demo user if none exists
-    user = await prisma.user.create({
-      data: {
-        clerkId: 'demo-user-001',
-        email: 'demo@example.com',
-      }
-    })
-  }
-  
-  return user
-}
-
-// Original Clerk helper function (commented out)
-// async function getAuthenticatedUser() {
-//   const { userId } = auth()
-//   if (!userId) {
-//     return null
-//   }
-//   
-//   // Find or create user in our database
-//   let user = await prisma.user.findUnique({
-//     where: { clerkId: userId }
-//   })
-//   
-//   if (!user) {
-//     // Create user if doesn't exist
-//     user = await prisma.user.create({
-//       data: {
-//         clerkId: userId,
-//         email: '', // Will be updated when user provides it
-//       }
-//     })
-//   }
-//   
-//   return user
-// }
-
-// GET /api/accounts
-export async function GET() {
+// GET /api/accounts - `fields`/`include` trim the rows, e.g. ?fields=id,name,balance
+export async function GET(request) {
   try {
     const user = await getAuthenticatedUser()
     if (!user) {
       return NextResponse.json({ success: false, error: 'User not found' }, { status: 400 })
     }
 
+    const selection = parseSelection(new URL(request.url).searchParams, ACCOUNT_SELECTION)
+    if (selection.error) {
+      return NextResponse.json({ success: false, error: selection.error }, { status: 400 })
+    }
+
     const accounts = await prisma.account.findMany({
       where: { userId: user.id },
-      include: {
-        _count: {
-          select: { transactions: true }
-        }
-      },
+      ...(selection.select
+        ? { select: selection.select }
+        : {
+          include: {
+            _count: {
+              select: { transactions: true }
+            }
+          }
+        }),
       orderBy: { createdAt: 'desc' }
     })
-    return NextResponse.json({ success: true, data: accounts })
+    return NextResponse.json({ success: true, data: pickFields(accounts, selection) })
   } catch (error) {
     console.error('Error fetching accounts:', error)
     return NextResponse.json({ success: false, error: error.message }, { status: 500 })
@@ -85,6 +55,7 @@ export async function POST(request) {
         name, 
         type, 
         balance: parseFloat(balance),
+        openingBalance: parseFloat(balance),
         userId: user.id
       }
     })
@@ -116,14 +87,7 @@ export async function PUT(request) {
       return NextResponse.json({ success: false, error: 'Account not found' }, { status: 404 })
     }
     
-    const account = await prisma.account.update({
-      where: { id },
-      data: { 
-        name, 
-        type, 
-        balance: parseFloat(balance)
-      }
-    })
+    const account = await updateLedgerAccount(user.id, id, { name, type, balance })
     
     return NextResponse.json({ success: true, data: account })
   } catch (error) {
@@ -156,9 +120,13 @@ export async function DELETE(request) {
       return NextResponse.json({ success: false, error: 'Account not found' }, { status: 404 })
     }
     
+    // Deleting an account deletes its transactions too, and clears the
+    // user's defaultAccountId if it was the default
     await prisma.account.delete({
       where: { id }
     })
+    invalidateReports(user.id)
+    invalidateUser(user.id)
     
     return NextResponse.json({ success: true, message: 'Account deleted successfully' })
   } catch (error) {
@@ -1,86 +1,90 @@
 import { NextResponse } from 'next/server'
-// import { auth } from '@clerk/nextjs/server' // Temporarily disabled
 import { prisma } from '@/lib/prisma'
-
-// Temporary helper function without authentication
-async function getAuthenticatedUser() {
-  // For development, return the first user or create a demo user
-  let user = await prisma.user.findFirst()
-  
-  if (!user) {
-    // Create a demo user if none exists
-    user = await prisma.user.create({
-      data: {
-        clerkId: 'demo-user-001',
-        email: 'demo@example.com',
-      }
-    })
-  }
-  
-  return user
-}
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { monthKey, monthRange } from '@/lib/rollups'
 
 // GET /api/analytics
-export async function GET() {
+// Totals come from the monthly rollup; pass ?include=transactions to also get the month's rows
+export async function GET(request) {
   try {
     const user = await getAuthenticatedUser()
     if (!user) {
       return NextResponse.json({ success: false, error: 'User not found' }, { status: 400 })
     }
 
-    // Get current month dates
+    const url = new URL(request.url)
+    const include = (url.searchParams.get('include') || '').split(',')
+    const includeTransactions = include.includes('transactions')
+
+    // The current UTC month, the same bucket the rollup totals below come from
     const now = new Date()
-    const startOfMonth = new Date(now.getFullYear(), now.getMonth(), 1)
-    const endOfMonth = new Date(now.getFullYear(), now.getMonth() + 1, 0)
+    const monthWhere = {
+      userId: user.id,
+      date: monthRange(now)
+    }
 
-    // Get all transactions for current month
-    const transactions = await prisma.transaction.findMany({
-      where: {
-        userId: user.id,
-        date: {
-          gte: startOfMonth,
-          lte: endOfMonth
-        }
-      },
-      include: {
-        category: true,
-        account: true
-      }
+    // This month's totals per category from the rollup (one row per category and
+    // account), plus all account balances, summed in the database
+    const [categoryTotals, accountTotals, transactions] = await Promise.all([
+      prisma.monthlyRollup.groupBy({
+        by: ['categoryId'],
+        where: { userId: user.id, month: monthKey(now) },
+        _sum: { total: true, count: true }
+      }),
+      prisma.account.aggregate({
+        where: { userId: user.id },
+        _sum: { balance: true }
+      }),
+      includeTransactions
+        ? prisma.transaction.findMany({
+            where: monthWhere,
+            include: {
+              category: true,
+              account: true
+            }
+          })
+        : null
+    ])
+
+    // Only categories used this month are looked up, to split the totals by type
+    const categories = await prisma.category.findMany({
+      where: { id: { in: categoryTotals.map(group => group.categoryId) } },
+      select: { id: true, type: true }
     })
+    const categoryTypes = new Map(categories.map(category => [category.id, category.type]))
 
     // Calculate analytics
     let totalIncome = 0
     let totalExpense = 0
-    
-    transactions.forEach(transaction => {
-      if (transaction.category.type === 'INCOME') {
-        totalIncome += transaction.amount
+    let transactionCount = 0
+
+    categoryTotals.forEach(group => {
+      const amount = group._sum.total || 0
+      if (categoryTypes.get(group.categoryId) === 'INCOME') {
+        totalIncome += amount
       } else {
-        totalExpense += transaction.amount
+        totalExpense += amount
       }
+      transactionCount += group._sum.count || 0
     })
 
     const netSavings = totalIncome - totalExpense
-    const transactionCount = transactions.length
+    const accountsTotal = accountTotals._sum.balance || 0
 
-    // Get total account balances
-    const accounts = await prisma.account.findMany({
-      where: { userId: user.id }
-    })
-    
-    const accountsTotal = accounts.reduce((sum, account) => sum + account.balance, 0)
+    const data = {
+      totalIncome,
+      totalExpense,
+      netSavings,
+      transactionCount,
+      accountsTotal
+    }
 
-    return NextResponse.json({
-      success: true,
-      data: {
-        totalIncome,
-        totalExpense,
-        netSavings,
-        transactionCount,
-        accountsTotal,
-        monthlyTransactions: transactions
-      }
-    })
+    if (includeTransactions) {
+      data.monthlyTransactions = transactions
+    }
+
+    return NextResponse.json({ success: true, data })
   } catch (error) {
     console.error('Error fetching analytics:', error)
     return NextResponse.json({ success: false, error: error.message }, { status: 500 })
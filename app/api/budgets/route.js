@@ -1,25 +1,11 @@
 import { NextResponse } from 'next/server'
 import { prisma } from '@/lib/prisma'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { BUDGET_SELECTION, parseSelection, pickFields, wantsField } from '@/lib/fields'
+import { spentByBudget, withProgress } from '@/lib/budgets'
 
-// Temporary helper function without authentication
-async function getAuthenticatedUser() {
-  // For development, return the first user or create a demo user
-  let user = await prisma.user.findFirst()
-  
-  if (!user) {
-    // Create a demo user if none exists
-    user = await prisma.user.create({
-      data: {
-        clerkId: 'demo-user-001',
-        email: 'demo@example.com',
-      }
-    })
-  }
-  
-  return user
-}
-
-// GET /api/budgets - Fetch all budgets for user
+// GET /api/budgets - Fetch all budgets for user; `fields`/`include` trim the rows
 export async function GET(request) {
   try {
     const user = await getAuthenticatedUser()
@@ -30,6 +16,10 @@ export async function GET(request) {
     const { searchParams } = new URL(request.url)
     const active = searchParams.get('active')
     const categoryId = searchParams.get('categoryId')
+    const selection = parseSelection(searchParams, BUDGET_SELECTION)
+    if (selection.error) {
+      return NextResponse.json({ success: false, error: selection.error }, { status: 400 })
+    }
 
     const where = { userId: user.id }
     if (active === 'true') {
@@ -41,69 +31,29 @@ export async function GET(request) {
 
     const budgets = await prisma.budget.findMany({
       where,
-      include: {
-        category: {
-          select: {
-            id: true,
-            name: true,
-            type: true
+      ...(selection.select
+        ? { select: selection.select }
+        : {
+          include: {
+            category: {
+              select: {
+                id: true,
+                name: true,
+                type: true
+              }
+            }
           }
-        }
-      },
+        }),
       orderBy: { createdAt: 'desc' }
     })
 
-    // Calculate spent amounts and progress for each budget
-    const budgetsWithProgress = await Promise.all(
-      budgets.map(async (budget) => {
-        // Calculate spent amount in the current period
-        const now = new Date()
-        let periodStart = budget.startDate
-        let periodEnd = budget.endDate
-
-        // If the budget period has ended, calculate for the last complete period
-        if (periodEnd < now) {
-          // For ongoing tracking, you might want to calculate the next period
-          // For now, we'll use the original period
-        }
-
-        // Get transactions in this period for this category (if specified)
-        const transactionWhere = {
-          userId: user.id,
-          date: {
-            gte: periodStart,
-            lte: periodEnd
-          }
-        }
-
-        if (budget.categoryId) {
-          transactionWhere.categoryId = budget.categoryId
-        }
-
-        const transactions = await prisma.transaction.findMany({
-          where: transactionWhere,
-          select: { amount: true }
-        })
-
-        // Calculate spent amount (sum of expense transactions)
-        const spent = transactions
-          .filter(t => t.amount < 0) // Only expenses (negative amounts)
-          .reduce((sum, t) => sum + Math.abs(t.amount), 0)
-
-        const progress = budget.amount > 0 ? (spent / budget.amount) * 100 : 0
-        const remaining = Math.max(0, budget.amount - spent)
-
-        return {
-          ...budget,
-          spent,
-          progress: Math.min(100, progress),
-          remaining,
-          status: progress >= 100 ? 'exceeded' : progress >= budget.warningThreshold * 100 ? 'warning' : 'on-track'
-        }
-      })
-    )
+    // Progress needs the grouped spent query; skipped when the caller asked
+    // for none of the progress fields
+    const needsSpent = ['spent', 'progress', 'remaining', 'status'].some(field => wantsField(selection, field))
+    const spent = needsSpent ? await spentByBudget(user.id, budgets.map(budget => budget.id)) : new Map()
+    const budgetsWithProgress = budgets.map(budget => withProgress(budget, spent.get(budget.id)))
 
-    return NextResponse.json({ success: true, data: budgetsWithProgress })
+    return NextResponse.json({ success: true, data: pickFields(budgetsWithProgress, selection) })
   } catch (error) {
     console.error('Error fetching budgets:', error)
     return NextResponse.json({ success: false, error: error.message }, { status: 500 })
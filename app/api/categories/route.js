@@ -1,56 +1,26 @@
 import { NextResponse } from 'next/server'
-// import { auth } from '@clerk/nextjs/server' // Temporarily disabled
 import { prisma } from '@/lib/prisma'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { invalidFilter, transactionWhere } from '@/lib/filters'
+import { invalidateReports } from '@/lib/reports'
 
-// Temporary helper function without authentication
-async function getAuthenticatedUser() {
-  // For development, return the first user or create a demo user
-  let user = await prisma.user.findFirst()
-  
-  if (!user) {
-    // Create a demo user if none exists
-    user = await prisma.user.create({
-      data: {
-        clerkId: 'demo-user-001',
-        email: 'demo@example.com',
-      }
-    })
-  }
-  
-  return user
-}
-
-// Original Clerk helper function (commented out)
-// async function getAuthenticatedUser() {
-//   const { userId } = auth()
-//   if (!userId) {
-//     return null
-//   }
-//   
-//   let user = await prisma.user.findUnique({
-//     where: { clerkId: userId }
-//   })
-//   
-//   if (!user) {
-//     user = await prisma.user.create({
-//       data: {
-//         clerkId: userId,
-//         email: '',
-//       }
-//     })
-//   }
-//   
-//   return user
-// }
-
-// GET /api/categories
-export async function GET() {
+// GET /api/categories - stats=true adds transactionCount and totalAmount to every
+// category and subcategory, over the transactions matching the usual filters
+export async function GET(request) {
   try {
     const user = await getAuthenticatedUser()
     if (!user) {
       return NextResponse.json({ success: false, error: 'User not found' }, { status: 400 })
     }
 
+    const { searchParams } = new URL(request.url)
+    const withStats = searchParams.get('stats') === 'true'
+    const filterError = withStats && invalidFilter(searchParams)
+    if (filterError) {
+      return NextResponse.json({ success: false, error: filterError }, { status: 400 })
+    }
+
     const categories = await prisma.category.findMany({
       where: { userId: user.id },
       include: {
@@ -61,7 +31,41 @@ export async function GET() {
       },
       orderBy: { name: 'asc' }
     })
-    return NextResponse.json({ success: true, data: categories })
+    if (!withStats) {
+      return NextResponse.json({ success: true, data: categories })
+    }
+
+    // Count and total per (category, subcategory) in one grouped query;
+    // category figures are the sum of their subcategory groups
+    const groups = await prisma.transaction.groupBy({
+      by: ['categoryId', 'subcategoryId'],
+      where: transactionWhere(user.id, searchParams),
+      _count: { _all: true },
+      _sum: { amount: true }
+    })
+    const stats = new Map()
+    const add = (key, group) => {
+      const entry = stats.get(key) || { transactionCount: 0, totalAmount: 0 }
+      entry.transactionCount += group._count._all
+      entry.totalAmount += group._sum.amount || 0
+      stats.set(key, entry)
+    }
+    groups.forEach(group => {
+      add(group.categoryId, group)
+      if (group.subcategoryId) add(`${group.categoryId}/${group.subcategoryId}`, group)
+    })
+
+    const empty = { transactionCount: 0, totalAmount: 0 }
+    const data = categories.map(category => ({
+      ...category,
+      ...(stats.get(category.id) || empty),
+      subcategories: category.subcategories.map(subcategory => ({
+        ...subcategory,
+        ...(stats.get(`${category.id}/${subcategory.id}`) || empty)
+      }))
+    }))
+
+    return NextResponse.json({ success: true, data })
   } catch (error) {
     console.error('Error fetching categories:', error)
     return NextResponse.json({ success: false, error: error.message }, { status: 500 })
@@ -122,6 +126,9 @@ export async function PUT(request) {
       }
     })
     
+    // Renaming or retyping a category changes report breakdowns
+    invalidateReports(user.id)
+    
     return NextResponse.json({ success: true, data: category })
   } catch (error) {
     console.error('Error updating category:', error)
@@ -0,0 +1,111 @@
+import { NextResponse } from 'next/server'
+import { prisma } from '@/lib/prisma'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { monthKey } from '@/lib/rollups'
+import { spentByBudget, withProgress } from '@/lib/budgets'
+
+// Months of income/expense history for the chart, including the current one
+const DASHBOARD_MONTHS = 4
+const DEFAULT_RECENT = 5
+const MAX_RECENT = 50
+
+const parseRecent = (value) => {
+  const recent = parseInt(value, 10)
+  return Number.isFinite(recent) && recent > 0 ? Math.min(recent, MAX_RECENT) : DEFAULT_RECENT
+}
+
+// GET /api/dashboard - summary cards, monthly chart, recent transactions,
+// account balances and active budgets in one response; ?recent=N sets how
+// many transactions to return
+export async function GET(request) {
+  try {
+    const user = await getAuthenticatedUser()
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'User not found' }, { status: 400 })
+    }
+
+    const recent = parseRecent(new URL(request.url).searchParams.get('recent'))
+    const now = new Date()
+    const months = Array.from({ length: DASHBOARD_MONTHS }, (_, i) =>
+      monthKey(new Date(Date.UTC(now.getUTCFullYear(), now.getUTCMonth() - (DASHBOARD_MONTHS - 1 - i), 1)))
+    )
+
+    // Independent queries, run concurrently; monthly totals come from the rollup
+    const [monthTotals, categories, accounts, recentTransactions, budgets] = await Promise.all([
+      prisma.monthlyRollup.groupBy({
+        by: ['month', 'categoryId'],
+        where: { userId: user.id, month: { in: months } },
+        _sum: { total: true, count: true }
+      }),
+      prisma.category.findMany({
+        where: { userId: user.id },
+        select: { id: true, type: true }
+      }),
+      prisma.account.findMany({
+        where: { userId: user.id },
+        select: { id: true, name: true, type: true, balance: true, isDefault: true },
+        orderBy: { createdAt: 'desc' }
+      }),
+      prisma.transaction.findMany({
+        where: { userId: user.id },
+        select: {
+          id: true,
+          description: true,
+          amount: true,
+          date: true,
+          category: { select: { name: true, type: true } },
+          account: { select: { name: true } }
+        },
+        orderBy: [{ date: 'desc' }, { id: 'desc' }],
+        take: recent
+      }),
+      // Spent is totalled as soon as the budgets are in, alongside the rest
+      prisma.budget.findMany({
+        where: { userId: user.id, isActive: true },
+        select: { id: true, name: true, amount: true, warningThreshold: true, startDate: true, endDate: true },
+        orderBy: { createdAt: 'desc' }
+      }).then(async rows => {
+        const spent = await spentByBudget(user.id, rows.map(budget => budget.id))
+        return rows.map(budget => withProgress(budget, spent.get(budget.id)))
+      })
+    ])
+
+    const categoryTypes = new Map(categories.map(category => [category.id, category.type]))
+    const monthly = months.map(month => ({ month, income: 0, expense: 0, count: 0 }))
+    const byMonth = new Map(monthly.map(entry => [entry.month, entry]))
+    monthTotals.forEach(group => {
+      const entry = byMonth.get(group.month)
+      const amount = group._sum.total || 0
+      if (categoryTypes.get(group.categoryId) === 'INCOME') {
+        entry.income += amount
+      } else {
+        entry.expense += amount
+      }
+      entry.count += group._sum.count || 0
+    })
+
+    const current = monthly[monthly.length - 1]
+    const summary = {
+      totalIncome: current.income,
+      totalExpense: current.expense,
+      netSavings: current.income - current.expense,
+      transactionCount: current.count,
+      accountsTotal: accounts.reduce((sum, account) => sum + account.balance, 0)
+    }
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        summary,
+        monthly,
+        recentTransactions,
+        accounts,
+        budgets
+      }
+    })
+  } catch (error) {
+    console.error('Error fetching dashboard:', error)
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
+  }
+}
@@ -0,0 +1,58 @@
+import { NextResponse } from 'next/server'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { arrowExportStream, compressStream, csvExportStream, negotiateEncoding, parquetExportStream, xlsxExportStream } from '@/lib/export'
+import { invalidFilter, transactionWhere } from '@/lib/filters'
+
+// GET /api/export?format=csv|xlsx|parquet|arrow, with the GET /api/transactions filters
+export async function GET(request) {
+  try {
+    const user = await getAuthenticatedUser()
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'User not found' }, { status: 400 })
+    }
+
+    const url = new URL(request.url)
+    const format = url.searchParams.get('format') || 'csv'
+    const filterError = invalidFilter(url.searchParams)
+    if (filterError) {
+      return NextResponse.json({ success: false, error: filterError }, { status: 400 })
+    }
+    const where = transactionWhere(user.id, url.searchParams)
+    
+    if (format === 'parquet' || format === 'arrow') {
+      // Typed, columnar output for analysis tools (pandas, pyarrow, DuckDB)
+      const parquet = format === 'parquet'
+      return new NextResponse(parquet ? parquetExportStream(where) : arrowExportStream(where), {
+        headers: {
+          'Content-Type': parquet ? 'application/vnd.apache.parquet' : 'application/vnd.apache.arrow.stream',
+          'Content-Disposition': `attachment; filename="transactions-${new Date().toISOString().split('T')[0]}.${parquet ? 'parquet' : 'arrows'}"`
+        }
+      })
+    } else if (format === 'xlsx') {
+      // Stream the workbook row by row; column widths come from the first batch
+      return new NextResponse(xlsxExportStream(where), {
+        headers: {
+          'Content-Type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+          'Content-Disposition': `attachment; filename="transactions-${new Date().toISOString().split('T')[0]}.xlsx"`
+        }
+      })
+    } else {
+      // Stream the CSV batch by batch instead of building it in memory,
+      // compressed on the fly when the client accepts it
+      const encoding = negotiateEncoding(request.headers.get('accept-encoding'))
+      const headers = {
+        'Content-Type': 'text/csv',
+        'Content-Disposition': `attachment; filename="transactions-${new Date().toISOString().split('T')[0]}.csv"`,
+        'Vary': 'Accept-Encoding'
+      }
+      if (encoding) {
+        headers['Content-Encoding'] = encoding
+      }
+      return new NextResponse(compressStream(csvExportStream(where), encoding), { headers })
+    }
+  } catch (error) {
+    console.error('Error exporting transactions:', error)
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
+  }
+}
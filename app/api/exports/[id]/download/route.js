@@ -0,0 +1,59 @@
+import { createReadStream } from 'node:fs'
+import { Readable } from 'node:stream'
+import { NextResponse } from 'next/server'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { EXPORT_FORMATS } from '@/lib/export'
+import { getJob, jobFile, parseRange } from '@/lib/jobs'
+
+// GET /api/exports/[id]/download - the finished file; honours Range so downloads can resume
+export async function GET(request, { params }) {
+  try {
+    const user = await getAuthenticatedUser()
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Unauthorized' }, { status: 401 })
+    }
+
+    const job = await getJob(params.id, user.id)
+    if (!job) {
+      return NextResponse.json({ success: false, error: 'Export job not found' }, { status: 404 })
+    }
+    if (job.status !== 'completed') {
+      return NextResponse.json({ success: false, error: `Export is ${job.status}` }, { status: 409 })
+    }
+
+    const { path, size } = await jobFile(job)
+    const { contentType, extension } = EXPORT_FORMATS[job.format]
+    // The file never changes once written, so the job id and size identify it
+    const etag = `"${job.id}-${size}"`
+    const headers = {
+      'Content-Type': contentType,
+      'Content-Disposition': `attachment; filename="transactions-${job.createdAt.split('T')[0]}.${extension}"`,
+      'Accept-Ranges': 'bytes',
+      'ETag': etag,
+      // Byte ranges refer to the file as stored, so the server must not re-encode it
+      'Cache-Control': 'private, no-transform'
+    }
+
+    // A Range with a stale If-Range validator gets the whole file
+    const ifRange = request.headers.get('if-range')
+    const range = ifRange && ifRange !== etag ? null : parseRange(request.headers.get('range'), size)
+    if (range === false) {
+      return new NextResponse(null, { status: 416, headers: { ...headers, 'Content-Range': `bytes */${size}` } })
+    }
+
+    const { start, end } = range || { start: 0, end: size - 1 }
+    const body = size === 0 ? null : Readable.toWeb(createReadStream(path, { start, end }))
+    return new NextResponse(body, {
+      status: range ? 206 : 200,
+      headers: {
+        ...headers,
+        'Content-Length': String(end - start + 1),
+        ...(range && { 'Content-Range': `bytes ${start}-${end}/${size}` })
+      }
+    })
+  } catch (error) {
+    console.error('Error downloading export:', error)
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
+  }
+}
@@ -0,0 +1,24 @@
+import { NextResponse } from 'next/server'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { getJob, jobStatus } from '@/lib/jobs'
+
+// GET /api/exports/[id] - job status and progress
+export async function GET(request, { params }) {
+  try {
+    const user = await getAuthenticatedUser()
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Unauthorized' }, { status: 401 })
+    }
+
+    const job = await getJob(params.id, user.id)
+    if (!job) {
+      return NextResponse.json({ success: false, error: 'Export job not found' }, { status: 404 })
+    }
+
+    return NextResponse.json({ success: true, data: jobStatus(job) })
+  } catch (error) {
+    console.error('Error fetching export job:', error)
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
+  }
+}
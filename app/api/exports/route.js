@@ -0,0 +1,43 @@
+import { NextResponse } from 'next/server'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { EXPORT_FORMATS } from '@/lib/export'
+import { invalidFilter, transactionWhere } from '@/lib/filters'
+import { createJob, jobStatus } from '@/lib/jobs'
+
+// POST /api/exports - queue a background export
+// Takes `format` and the GET /api/transactions filters from the query string or a JSON body
+export async function POST(request) {
+  try {
+    const user = await getAuthenticatedUser()
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Unauthorized' }, { status: 401 })
+    }
+
+    const url = new URL(request.url)
+    const params = new URLSearchParams(url.searchParams)
+    if (request.headers.get('content-type')?.includes('application/json')) {
+      const body = await request.json()
+      for (const [key, value] of Object.entries(body || {})) {
+        if (value !== null && value !== undefined && value !== '') {
+          params.set(key, String(value))
+        }
+      }
+    }
+
+    const format = params.get('format') || 'csv'
+    if (!EXPORT_FORMATS[format]) {
+      return NextResponse.json({ success: false, error: `Unsupported format: ${format}` }, { status: 400 })
+    }
+    const filterError = invalidFilter(params)
+    if (filterError) {
+      return NextResponse.json({ success: false, error: filterError }, { status: 400 })
+    }
+
+    const job = await createJob(user.id, format, transactionWhere(user.id, params))
+    return NextResponse.json({ success: true, data: jobStatus(job) }, { status: 202 })
+  } catch (error) {
+    console.error('Error creating export job:', error)
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
+  }
+}
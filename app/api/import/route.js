@@ -0,0 +1,28 @@
+import { NextResponse } from 'next/server'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { ImportError, importCsv, importOptions } from '@/lib/import'
+import { invalidateReports } from '@/lib/reports'
+
+// POST /api/import - raw CSV request body, parsed as it arrives
+export async function POST(request) {
+  try {
+    const user = await getAuthenticatedUser()
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'User not found' }, { status: 400 })
+    }
+    if (!request.body) {
+      return NextResponse.json({ success: false, error: 'Empty request body' }, { status: 400 })
+    }
+
+    const result = await importCsv(user.id, request.body, importOptions(new URL(request.url)))
+    invalidateReports(user.id)
+    return NextResponse.json({ success: true, data: result })
+  } catch (error) {
+    if (error instanceof ImportError) {
+      return NextResponse.json({ success: false, error: error.message }, { status: 400 })
+    }
+    console.error('Error importing transactions:', error)
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
+  }
+}
@@ -1,25 +1,10 @@
 import { NextResponse } from 'next/server'
 import { prisma } from '@/lib/prisma'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { INVESTMENT_SELECTION, parseSelection, pickFields } from '@/lib/fields'
 
-// Temporary helper function without authentication
-async function getAuthenticatedUser() {
-  // For development, return the first user or create a demo user
-  let user = await prisma.user.findFirst()
-  
-  if (!user) {
-    // Create a demo user if none exists
-    user = await prisma.user.create({
-      data: {
-        clerkId: 'demo-user-001',
-        email: 'demo@example.com',
-      }
-    })
-  }
-  
-  return user
-}
-
-// GET /api/investments - Fetch all investments for user
+// GET /api/investments - Fetch all investments for user; `fields` trims the rows
 export async function GET(request) {
   try {
     const user = await getAuthenticatedUser()
@@ -29,6 +14,10 @@ export async function GET(request) {
 
     const { searchParams } = new URL(request.url)
     const type = searchParams.get('type')
+    const selection = parseSelection(searchParams, INVESTMENT_SELECTION)
+    if (selection.error) {
+      return NextResponse.json({ success: false, error: selection.error }, { status: 400 })
+    }
 
     const where = { userId: user.id }
     if (type) {
@@ -37,6 +26,7 @@ export async function GET(request) {
 
     const investments = await prisma.investment.findMany({
       where,
+      ...(selection.select && { select: selection.select }),
       orderBy: { createdAt: 'desc' }
     })
 
@@ -59,7 +49,7 @@ export async function GET(request) {
       }
     })
 
-    return NextResponse.json({ success: true, data: investmentsWithMetrics })
+    return NextResponse.json({ success: true, data: pickFields(investmentsWithMetrics, selection) })
   } catch (error) {
     console.error('Error fetching investments:', error)
     return NextResponse.json({ success: false, error: error.message }, { status: 500 })
@@ -0,0 +1,32 @@
+import { NextResponse } from 'next/server'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { invalidFilter, transactionWhere } from '@/lib/filters'
+import { DEFAULT_BUCKET, REPORT_BUCKETS, getReport } from '@/lib/reports'
+
+// GET /api/reports - totals, a bucketed income/expense series and a category
+// breakdown; ?bucket=day|week|month|quarter|year plus the usual transaction filters
+export async function GET(request) {
+  try {
+    const user = await getAuthenticatedUser()
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'User not found' }, { status: 400 })
+    }
+
+    const { searchParams } = new URL(request.url)
+    const bucket = searchParams.get('bucket') || DEFAULT_BUCKET
+    if (!REPORT_BUCKETS.includes(bucket)) {
+      return NextResponse.json({ success: false, error: `Invalid bucket; expected one of: ${REPORT_BUCKETS.join(', ')}` }, { status: 400 })
+    }
+    const filterError = invalidFilter(searchParams)
+    if (filterError) {
+      return NextResponse.json({ success: false, error: filterError }, { status: 400 })
+    }
+
+    const report = await getReport(transactionWhere(user.id, searchParams), bucket)
+    return NextResponse.json({ success: true, data: report })
+  } catch (error) {
+    console.error('Error building report:', error)
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
+  }
+}
@@ -1,49 +1,16 @@
 import { NextResponse } from 'next/server'
-// import { auth } from '@clerk/nextjs/server' // Temporarily disabled
 import { prisma } from '@/lib/prisma'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { TRANSACTION_ORDER, afterCursor, decodeCursor, parsePageSize, toPage } from '@/lib/pagination'
+import { LedgerConflictError, createLedgerTransaction, deleteLedgerTransaction, findAccountAndCategory, updateLedgerTransaction } from '@/lib/ledger'
+import { invalidFilter, transactionWhere } from '@/lib/filters'
+import { searchTransactionIds, usesSearchIndex } from '@/lib/search'
+import { TRANSACTION_SELECTION, parseSelection, pickFields } from '@/lib/fields'
+import { invalidateReports } from '@/lib/reports'
 
-// Temporary helper function without authentication
-async function getAuthenticatedUser() {
-  // For development, return the first user or create a demo user
-  let user = await prisma.user.findFirst()
-  
-  if (!user) {
-    // Create a demo user if none exists
-    user = await prisma.user.create({
-      data: {
-        clerkId: 'demo-user-001',
-        email: 'demo@example.com',
-      }
-    })
-  }
-  
-  return user
-}
-
-// Original Clerk helper function (commented out)
-// async function getAuthenticatedUser() {
-//   const { userId } = auth()
-//   if (!userId) {
-//     return null
-//   }
-//   
-//   let user = await prisma.user.findUnique({
-//     where: { clerkId: userId }
-//   })
-//   
-//   if (!user) {
-//     user = await prisma.user.create({
-//       data: {
-//         clerkId: userId,
-//         email: '',
-//       }
-//     })
-//   }
-//   
-//   return user
-// }
-
-// GET /api/transactions
+// GET /api/transactions - newest first; `search` with sort=relevance ranks matches instead.
+// `fields`/`include` trim the rows, e.g. ?fields=id,amount,category.name
 export async function GET(request) {
   try {
     const user = await getAuthenticatedUser()
@@ -52,52 +19,55 @@ export async function GET(request) {
     }
 
     const url = new URL(request.url)
-    const search = url.searchParams.get('search') || ''
-    const categoryId = url.searchParams.get('categoryId')
-    const subcategoryId = url.searchParams.get('subcategoryId')
-    const accountId = url.searchParams.get('accountId')
-    const startDate = url.searchParams.get('startDate')
-    const endDate = url.searchParams.get('endDate')
-    
-    const whereClause = { userId: user.id }
-    
-    if (search) {
-      whereClause.description = {
-        contains: search,
-        mode: 'insensitive'
-      }
+    const filterError = invalidFilter(url.searchParams)
+    if (filterError) {
+      return NextResponse.json({ success: false, error: filterError }, { status: 400 })
     }
-    
-    if (categoryId) {
-      whereClause.categoryId = categoryId
+    const whereClause = transactionWhere(user.id, url.searchParams)
+    
+    // Keyset pagination: resume strictly after the (date, id) of the previous page
+    const limit = parsePageSize(url.searchParams.get('limit'))
+    const cursor = url.searchParams.get('cursor')
+    const position = cursor ? decodeCursor(cursor) : null
+    if (cursor && !position) {
+      return NextResponse.json({ success: false, error: 'Invalid cursor' }, { status: 400 })
     }
-    
-    if (subcategoryId) {
-      whereClause.subcategoryId = subcategoryId
-    }
-    
-    if (accountId) {
-      whereClause.accountId = accountId
+
+    const selection = parseSelection(url.searchParams, TRANSACTION_SELECTION)
+    if (selection.error) {
+      return NextResponse.json({ success: false, error: selection.error }, { status: 400 })
     }
-    
-    if (startDate && endDate) {
-      whereClause.date = {
-        gte: new Date(startDate),
-        lte: new Date(endDate)
-      }
+    const shape = selection.select
+      ? { select: selection.select }
+      : { include: { account: true, category: true, subcategory: true } }
+
+    const search = url.searchParams.get('search')
+    if (usesSearchIndex(search)) {
+      // Match through the full-text index, then load the page's rows by id
+      const relevance = url.searchParams.get('sort') === 'relevance'
+      const { description, ...filters } = whereClause
+      const ids = await searchTransactionIds(filters, search, { limit: limit + 1, position, relevance })
+      const rows = await prisma.transaction.findMany({ where: { id: { in: ids } }, ...shape })
+      const byId = new Map(rows.map(row => [row.id, row]))
+      const matches = ids.map(id => byId.get(id)).filter(Boolean)
+
+      // Relevance order has no keyset position to resume from: one page only
+      const { data, nextCursor } = relevance
+        ? { data: matches.slice(0, limit), nextCursor: null }
+        : toPage(matches, limit)
+      return NextResponse.json({ success: true, data: pickFields(data, selection), nextCursor })
     }
-    
+
     const transactions = await prisma.transaction.findMany({
-      where: whereClause,
-      include: {
-        account: true,
-        category: true,
-        subcategory: true
-      },
-      orderBy: { date: 'desc' }
+      where: position ? { AND: [whereClause, afterCursor(position)] } : whereClause,
+      ...shape,
+      orderBy: TRANSACTION_ORDER,
+      take: limit + 1
     })
-    
-    return NextResponse.json({ success: true, data: transactions })
+
+    const { data, nextCursor } = toPage(transactions, limit)
+
+    return NextResponse.json({ success: true, data: pickFields(data, selection), nextCursor })
   } catch (error) {
     console.error('Error fetching transactions:', error)
     return NextResponse.json({ success: false, error: error.message }, { status: 500 })
@@ -113,45 +83,18 @@ export async function POST(request) {
     }
 
     const body = await request.json()
-    const { amount, description, date, accountId, categoryId, subcategoryId } = body
+    const { accountId, categoryId } = body
     
     // Verify account and category belong to user
-    const account = await prisma.account.findFirst({
-      where: { id: accountId, userId: user.id }
-    })
-    
-    const category = await prisma.category.findFirst({
-      where: { id: categoryId, userId: user.id }
-    })
+    const [account, category] = await findAccountAndCategory(user.id, accountId, categoryId)
     
     if (!account || !category) {
       return NextResponse.json({ success: false, error: 'Invalid account or category' }, { status: 400 })
     }
     
-    // Create transaction
-    const transaction = await prisma.transaction.create({
-      data: {
-        amount: parseFloat(amount),
-        description,
-        date: new Date(date),
-        accountId,
-        categoryId,
-        subcategoryId: subcategoryId || null,
-        userId: user.id
-      },
-      include: {
-        account: true,
-        category: true,
-        subcategory: true
-      }
-    })
-    
-    // Update account balance
-    const balanceChange = category.type === 'INCOME' ? parseFloat(amount) : -parseFloat(amount)
-    await prisma.account.update({
-      where: { id: accountId },
-      data: { balance: { increment: balanceChange } }
-    })
+    // Create the transaction, its rollup entry and the balance change atomically
+    const transaction = await createLedgerTransaction(user.id, body, category)
+    invalidateReports(user.id)
     
     return NextResponse.json({ success: true, data: transaction })
   } catch (error) {
@@ -169,65 +112,34 @@ export async function PUT(request) {
     }
 
     const body = await request.json()
-    const { id, amount, description, date, accountId, categoryId, subcategoryId } = body
+    const { id, accountId, categoryId } = body
     
-    // Get the existing transaction
-    const existingTransaction = await prisma.transaction.findFirst({
-      where: { id, userId: user.id },
-      include: { category: true }
-    })
+    // Get the existing transaction and verify account and category belong to user
+    const [existingTransaction, [account, category]] = await Promise.all([
+      prisma.transaction.findFirst({
+        where: { id, userId: user.id },
+        include: { category: true }
+      }),
+      findAccountAndCategory(user.id, accountId, categoryId)
+    ])
     
     if (!existingTransaction) {
       return NextResponse.json({ success: false, error: 'Transaction not found' }, { status: 404 })
     }
     
-    // Verify account and category belong to user
-    const account = await prisma.account.findFirst({
-      where: { id: accountId, userId: user.id }
-    })
-    
-    const category = await prisma.category.findFirst({
-      where: { id: categoryId, userId: user.id }
-    })
-    
     if (!account || !category) {
       return NextResponse.json({ success: false, error: 'Invalid account or category' }, { status: 400 })
     }
     
-    // Reverse the old transaction's balance change
-    const oldBalanceChange = existingTransaction.category.type === 'INCOME' ? -existingTransaction.amount : existingTransaction.amount
-    await prisma.account.update({
-      where: { id: existingTransaction.accountId },
-      data: { balance: { increment: oldBalanceChange } }
-    })
-    
-    // Update transaction
-    const transaction = await prisma.transaction.update({
-      where: { id },
-      data: {
-        amount: parseFloat(amount),
-        description,
-        date: new Date(date),
-        accountId,
-        categoryId,
-        subcategoryId: subcategoryId || null
-      },
-      include: {
-        account: true,
-        category: true,
-        subcategory: true
-      }
-    })
-    
-    // Apply the new transaction's balance change
-    const newBalanceChange = category.type === 'INCOME' ? parseFloat(amount) : -parseFloat(amount)
-    await prisma.account.update({
-      where: { id: accountId },
-      data: { balance: { increment: newBalanceChange } }
-    })
+    // Update the transaction, move it between rollup buckets and balances atomically
+    const transaction = await updateLedgerTransaction(existingTransaction, body, category)
+    invalidateReports(user.id)
     
     return NextResponse.json({ success: true, data: transaction })
   } catch (error) {
+    if (error instanceof LedgerConflictError) {
+      return NextResponse.json({ success: false, error: error.message }, { status: 409 })
+    }
     console.error('Error updating transaction:', error)
     return NextResponse.json({ success: false, error: error.message }, { status: 500 })
   }
@@ -248,31 +160,17 @@ export async function DELETE(request) {
       return NextResponse.json({ success: false, error: 'Transaction ID required' }, { status: 400 })
     }
     
-    // Get the transaction to reverse its balance change
-    const transaction = await prisma.transaction.findFirst({
-      where: { id, userId: user.id },
-      include: { category: true }
-    })
+    // Delete the transaction and reverse its rollup entry and balance change atomically
+    const transaction = await deleteLedgerTransaction(user.id, id)
     
     if (!transaction) {
       return NextResponse.json({ success: false, error: 'Transaction not found' }, { status: 404 })
     }
-    
-    // Reverse the balance change
-    const balanceChange = transaction.category.type === 'INCOME' ? -transaction.amount : transaction.amount
-    await prisma.account.update({
-      where: { id: transaction.accountId },
-      data: { balance: { increment: balanceChange } }
-    })
-    
-    // Delete the transaction
-    await prisma.transaction.delete({
-      where: { id }
-    })
+    invalidateReports(user.id)
     
     return NextResponse.json({ success: true, message: 'Transaction deleted successfully' })
   } catch (error) {
     console.error('Error deleting transaction:', error)
     return NextResponse.json({ success: false, error: error.message }, { status: 500 })
   }
-}
\ No newline at end of file
+}
@@ -0,0 +1,31 @@
+import { NextResponse } from 'next/server'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser } from '@/lib/auth'
+import { ImportError, importCsv, importOptions } from '@/lib/import'
+import { invalidateReports } from '@/lib/reports'
+
+// POST /api/upload - multipart form with a CSV `file` field
+export async function POST(request) {
+  try {
+    const user = await getAuthenticatedUser()
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'User not found' }, { status: 400 })
+    }
+
+    const form = await request.formData()
+    const file = form.get('file')
+    if (!file || typeof file === 'string') {
+      return NextResponse.json({ success: false, error: 'Missing file' }, { status: 400 })
+    }
+
+    const result = await importCsv(user.id, file.stream(), importOptions(new URL(request.url), form))
+    invalidateReports(user.id)
+    return NextResponse.json({ success: true, data: result })
+  } catch (error) {
+    if (error instanceof ImportError) {
+      return NextResponse.json({ success: false, error: error.message }, { status: 400 })
+    }
+    console.error('Error uploading file:', error)
+    return NextResponse.json({ success: false, error: error.message }, { status: 500 })
+  }
+}
@@ -1,56 +1,20 @@
 import { NextResponse } from 'next/server'
-// import { auth } from '@clerk/nextjs/server' // Temporarily disabled
 import { prisma } from '@/lib/prisma'
+// Clerk auth is temporarily disabled; import getAuthenticatedUser instead to turn it back on
+import { getDemoUser as getAuthenticatedUser, invalidateUser, userCacheStats } from '@/lib/auth'
 
-// Temporary helper function without authentication
-async function getAuthenticatedUser() {
-  // For development, return the first user or create a demo user
-  let user = await prisma.user.findFirst()
-  
-  if (!user) {
-    // Create a demo user if none exists
-    user = await prisma.user.create({
-      data: {
-        clerkId: 'demo-user-001',
-        email: 'demo@example.com',
-      }
-    })
-  }
-  
-  return user
-}
-
-// Original Clerk helper function (commented out)
-// async function getAuthenticatedUser() {
-//   const { userId } = auth()
-//   if (!userId) {
-//     return null
-//   }
-//   
-//   let user = await prisma.user.findUnique({
-//     where: { clerkId: userId }
-//   })
-//   
-//   if (!user) {
-//     user = await prisma.user.create({
-//       data: {
-//         clerkId: userId,
-//         email: '',
-//       }
-//     })
-//   }
-//   
-//   return user
-// }
-
-// GET /api/users
-export async function GET() {
+// GET /api/users - cacheStats=true adds the user cache's hit/miss counters
+export async function GET(request) {
   try {
     const user = await getAuthenticatedUser()
     if (!user) {
       return NextResponse.json({ success: false, error: 'User not found' }, { status: 400 })
     }
 
+    const { searchParams } = new URL(request.url)
+    if (searchParams.get('cacheStats') === 'true') {
+      return NextResponse.json({ success: true, data: user, cache: userCacheStats() })
+    }
     return NextResponse.json({ success: true, data: user })
   } catch (error) {
     console.error('Error fetching user:', error)
@@ -77,6 +41,7 @@ export async function PUT(request) {
         lastName: lastName || user.lastName
       }
     })
+    invalidateUser(user.id)
     
     return NextResponse.json({ success: true, data: updatedUser })
   } catch (error) {
@@ -8,165 +8,210 @@ Focus: Authentication security, user context, and data isolation
 import requests
 import json
 import os
-from datetime import datetime
+import re
+import subprocess
+import threading
+import time
 
-# Get base URL from environment
-BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://cashflow-182.preview.emergentagent.com')
-API_BASE = f"{BASE_URL}/api"
+from tests.base import BaseTester, exit_code
+from tests.client import API_BASE
+from tests.runner import fan_out
 
-class ClerkAuthAPITester:
-    def __init__(self):
-        self.test_results = []
-        self.session = requests.Session()
-        self.critical_issues = []
-        
-    def log_test(self, test_name, success, message, details=None, critical=False):
-        """Log test results"""
-        result = {
-            'test': test_name,
-            'success': success,
-            'message': message,
-            'details': details,
-            'timestamp': datetime.now().isoformat(),
-            'critical': critical
-        }
-        self.test_results.append(result)
-        
-        if critical and not success:
-            self.critical_issues.append(result)
-            
-        status = "✅ PASS" if success else "❌ FAIL"
-        priority = " [CRITICAL]" if critical else ""
-        print(f"{status}{priority}: {test_name} - {message}")
-        if details and not success:
-            print(f"   Details: {details}")
+# Checkout the code analysis reads (the deployed app lives in /app)
+APP_DIR = os.getenv('APP_DIR', '/app')
+
+# Concurrent requests standing in for one page load
+USER_CACHE_BURST = 5
+
+# Routes that serve the cached demo user while Clerk auth is disabled
+DEMO_USER_ENDPOINTS = ['/users', '/export?format=csv']
+
+# Drives lib/cache.js with resolveUser's cache key from lib/auth.js: two Clerk
+# IDs must get different users, a burst for one must load it once, and
+# invalidating one user must leave the other cached
+USER_CACHE_ISOLATION_SCRIPT = """
+import { readFileSync } from 'node:fs'
+
+const appDir = process.argv[1]
+const { LruCache } = await import(`data:text/javascript,${encodeURIComponent(readFileSync(`${appDir}/lib/cache.js`, 'utf8'))}`)
+const key = readFileSync(`${appDir}/lib/auth.js`, 'utf8').match(/resolveUser = \\(userId\\) => userCache\\.getOrLoad\\((`[^`]*`)/)[1]
+const keyFor = new Function('userId', `return ${key}`)
+
+const cache = new LruCache({ max: 10, ttlMs: 60000 })
+const loads = []
+const resolveUser = (clerkId) => cache.getOrLoad(keyFor(clerkId), async () => {
+  loads.push(clerkId)
+  await new Promise(resolve => setTimeout(resolve, 10))
+  return { id: `db-${clerkId}`, clerkId }
+})
+
+const burst = await Promise.all(Array.from({ length: 5 }, () => resolveUser('user_a')))
+const burstLoads = loads.length
+const other = await resolveUser('user_b')
+cache.deleteWhere(value => value instanceof Promise || value.id === burst[0].id)
+const reloaded = [await resolveUser('user_b'), await resolveUser('user_a')]
+
+console.log(JSON.stringify({
+  burstLoads,
+  burstUsers: new Set(burst.map(user => user.id)).size,
+  distinct: burst[0].id !== other.id && other.clerkId === 'user_b',
+  reloads: loads.slice(2),
+  reloadedUsers: reloaded.map(user => user.id)
+}))
+"""
+
+# Key API endpoints that should require authentication
+UNAUTHENTICATED_ENDPOINTS = [
+    ("GET", "/accounts", "Get Accounts"),
+    ("GET", "/categories", "Get Categories"), 
+    ("GET", "/transactions", "Get Transactions"),
+    ("GET", "/analytics", "Get Analytics"),
+    ("POST", "/accounts", "Create Account"),
+    ("POST", "/categories", "Create Category"),
+    ("POST", "/transactions", "Create Transaction")
+]
+
+# Test a few endpoints to check response structure
+RESPONSE_STRUCTURE_ENDPOINTS = [
+    ("GET", "/accounts", "Get Accounts"),
+    ("GET", "/categories", "Get Categories"),
+    ("GET", "/transactions", "Get Transactions")
+]
+
+class ClerkAuthAPITester(BaseTester):
+    BANNER = [
+        "🔐 Starting Clerk Authentication API Testing Suite",
+        "🎯 Focus: Authentication Security, User Context, Data Isolation"
+    ]
+    SUMMARY_TITLE = "CLERK AUTHENTICATION API TESTING SUMMARY"
+    SUMMARY_CATEGORIES = [
+        ('Authentication Security', ['Auth Security']),
+        ('Code Implementation', ['Code Analysis']),
+        ('Data Isolation', ['Data Isolation']),
+        ('Response Structure', ['Response Structure']),
+        ('User Cache', ['User Cache'])
+    ]
     
     def test_unauthenticated_api_requests(self):
         """Test that all API endpoints properly require authentication"""
         print("\n=== Testing Unauthenticated API Requests ===")
         
-        # Key API endpoints that should require authentication
-        endpoints = [
-            ("GET", "/accounts", "Get Accounts"),
-            ("GET", "/categories", "Get Categories"), 
-            ("GET", "/transactions", "Get Transactions"),
-            ("GET", "/analytics", "Get Analytics"),
-            ("GET", "/export?format=csv", "Export CSV"),
-            ("GET", "/export?format=xlsx", "Export Excel"),
-            ("POST", "/accounts", "Create Account"),
-            ("POST", "/categories", "Create Category"),
-            ("POST", "/transactions", "Create Transaction")
-        ]
-        
-        for method, endpoint, name in endpoints:
-            try:
-                url = f"{API_BASE}{endpoint}"
-                
-                # Prepare request data for POST requests
-                data = {}
-                if method == "POST":
-                    if "accounts" in endpoint:
-                        data = {"name": "Test Account", "type": "BANK", "balance": 1000}
-                    elif "categories" in endpoint:
-                        data = {"name": "Test Category", "type": "EXPENSE"}
-                    elif "transactions" in endpoint:
-                        data = {
-                            "amount": 100,
-                            "description": "Test Transaction",
-                            "date": "2024-01-01",
-                            "accountId": "test-id",
-                            "categoryId": "test-id"
-                        }
-                
-                # Make request without authentication
-                if method == "GET":
-                    response = self.session.get(url, timeout=15)
-                else:
-                    response = self.session.post(url, json=data, timeout=15)
-                
-                # Check response
-                if response.status_code == 401:
-                    try:
-                        response_data = response.json()
-                        if response_data.get('error') == 'Unauthorized':
-                            self.log_test(
-                                f"Auth Security - {name}",
-                                True,
-                                "Correctly returns 401 Unauthorized",
-                                f"Response: {response_data}",
-                                critical=True
-                            )
-                        else:
-                            self.log_test(
-                                f"Auth Security - {name}",
-                                False,
-                                "Returns 401 but with unexpected error message",
-                                f"Response: {response_data}",
-                                critical=True
-                            )
-                    except json.JSONDecodeError:
+        for method, endpoint, name in UNAUTHENTICATED_ENDPOINTS:
+            self.check_unauthenticated_request(method, endpoint, name)
+    
+    def check_unauthenticated_request(self, method, endpoint, name):
+        """Check that a single endpoint rejects an unauthenticated request"""
+        try:
+            url = f"{API_BASE}{endpoint}"
+            
+            # Prepare request data for POST requests
+            data = {}
+            if method == "POST":
+                if "accounts" in endpoint:
+                    data = {"name": "Test Account", "type": "BANK", "balance": 1000}
+                elif "categories" in endpoint:
+                    data = {"name": "Test Category", "type": "EXPENSE"}
+                elif "transactions" in endpoint:
+                    data = {
+                        "amount": 100,
+                        "description": "Test Transaction",
+                        "date": "2024-01-01",
+                        "accountId": "test-id",
+                        "categoryId": "test-id"
+                    }
+            
+            # Make request without authentication
+            if method == "GET":
+                response = self.session.get(url, timeout=15)
+            else:
+                response = self.session.post(url, json=data, timeout=15)
+            
+            # Check response
+            if response.status_code == 401:
+                try:
+                    response_data = response.json()
+                    if response_data.get('error') == 'Unauthorized':
                         self.log_test(
                             f"Auth Security - {name}",
                             True,
-                            "Returns 401 Unauthorized (non-JSON response)",
-                            f"Response text: {response.text[:200]}",
+                            "Correctly returns 401 Unauthorized",
+                            f"Response: {response_data}",
                             critical=True
                         )
-                elif response.status_code == 200:
-                    try:
-                        response_data = response.json()
-                        if response_data.get('success') and response_data.get('data'):
-                            self.log_test(
-                                f"Auth Security - {name}",
-                                False,
-                                "CRITICAL SECURITY ISSUE: Returns data without authentication",
-                                f"Status: {response.status_code}, Data: {str(response_data)[:200]}",
-                                critical=True
-                            )
-                        else:
-                            self.log_test(
-                                f"Auth Security - {name}",
-                                True,
-                                "Returns 200 but no sensitive data (acceptable)",
-                                f"Response: {response_data}",
-                                critical=False
-                            )
-                    except json.JSONDecodeError:
+                    else:
                         self.log_test(
                             f"Auth Security - {name}",
                             False,
-                            "Returns 200 with non-JSON response",
-                            f"Response text: {response.text[:200]}",
+                            "Returns 401 but with unexpected error message",
+                            f"Response: {response_data}",
+                            critical=True
+                        )
+                except json.JSONDecodeError:
+                    self.log_test(
+                        f"Auth Security - {name}",
+                        True,
+                        "Returns 401 Unauthorized (non-JSON response)",
+                        f"Response text: {response.text[:200]}",
+                        critical=True
+                    )
+            elif response.status_code == 200:
+                try:
+                    response_data = response.json()
+                    if response_data.get('success') and response_data.get('data'):
+                        self.log_test(
+                            f"Auth Security - {name}",
+                            False,
+                            "CRITICAL SECURITY ISSUE: Returns data without authentication",
+                            f"Status: {response.status_code}, Data: {str(response_data)[:200]}",
+                            critical=True
+                        )
+                    else:
+                        self.log_test(
+                            f"Auth Security - {name}",
+                            True,
+                            "Returns 200 but no sensitive data (acceptable)",
+                            f"Response: {response_data}",
                             critical=False
                         )
-                else:
+                except json.JSONDecodeError:
                     self.log_test(
                         f"Auth Security - {name}",
                         False,
-                        f"Unexpected response status: {response.status_code}",
-                        f"Response: {response.text[:200]}",
+                        "Returns 200 with non-JSON response",
+                        f"Response text: {response.text[:200]}",
                         critical=False
                     )
-                    
-            except requests.exceptions.RequestException as e:
+            else:
                 self.log_test(
                     f"Auth Security - {name}",
                     False,
-                    "Request failed",
-                    str(e),
+                    f"Unexpected response status: {response.status_code}",
+                    f"Response: {response.text[:200]}",
                     critical=False
                 )
+                
+        except requests.exceptions.RequestException as e:
+            self.log_test(
+                f"Auth Security - {name}",
+                False,
+                "Request failed",
+                str(e),
+                critical=False
+            )
     
     def test_api_code_implementation(self):
         """Test the API code implementation for proper authentication patterns"""
         print("\n=== Testing API Code Implementation ===")
         
         try:
-            with open('/app/app/api/[[...path]]/route.js', 'r') as f:
+            with open(os.path.join(APP_DIR, 'app/api/[[...path]]/route.js'), 'r') as f:
                 api_content = f.read()
+            # The Clerk helper lives in the shared user resolver the routes import
+            with open(os.path.join(APP_DIR, 'lib/auth.js'), 'r') as f:
+                auth_content = f.read()
             
             # Test 1: Check for Clerk auth import
-            has_clerk_import = 'from \'@clerk/nextjs/server\'' in api_content and 'auth' in api_content
+            has_clerk_import = 'from \'@clerk/nextjs/server\'' in auth_content and 'auth' in auth_content
             self.log_test(
                 "Code Analysis - Clerk Import",
                 has_clerk_import,
@@ -176,7 +221,7 @@ class ClerkAuthAPITester:
             )
             
             # Test 2: Check for getAuthenticatedUser helper function
-            has_auth_helper = 'getAuthenticatedUser' in api_content and 'async function getAuthenticatedUser' in api_content
+            has_auth_helper = 'getAuthenticatedUser' in api_content and 'async function getAuthenticatedUser' in auth_content
             self.log_test(
                 "Code Analysis - Auth Helper Function",
                 has_auth_helper,
@@ -186,7 +231,7 @@ class ClerkAuthAPITester:
             )
             
             # Test 3: Check for auth() usage in helper
-            has_auth_call = 'auth()' in api_content and 'userId' in api_content
+            has_auth_call = 'auth()' in auth_content and 'userId' in auth_content
             self.log_test(
                 "Code Analysis - Auth Usage",
                 has_auth_call,
@@ -196,7 +241,7 @@ class ClerkAuthAPITester:
             )
             
             # Test 4: Check for user creation logic
-            has_user_creation = 'prisma.user.create' in api_content and 'clerkId: userId' in api_content
+            has_user_creation = 'prisma.user.create' in auth_content and 'clerkId: userId' in auth_content
             self.log_test(
                 "Code Analysis - User Creation",
                 has_user_creation,
@@ -237,7 +282,7 @@ class ClerkAuthAPITester:
             )
             
             # Test 8: Check specific endpoint implementations
-            endpoints_to_check = ['getAccounts', 'getCategories', 'getTransactions', 'getAnalytics', 'exportTransactions']
+            endpoints_to_check = ['getAccounts', 'getCategories', 'getTransactions', 'getAnalytics']
             missing_endpoints = []
             
             for endpoint in endpoints_to_check:
@@ -267,7 +312,7 @@ class ClerkAuthAPITester:
         print("\n=== Testing Data Isolation Patterns ===")
         
         try:
-            with open('/app/app/api/[[...path]]/route.js', 'r') as f:
+            with open(os.path.join(APP_DIR, 'app/api/[[...path]]/route.js'), 'r') as f:
                 api_content = f.read()
             
             # Test 1: All findMany queries should include userId filter
@@ -326,146 +371,238 @@ class ClerkAuthAPITester:
         """Test API response structure for consistency"""
         print("\n=== Testing API Response Structure ===")
         
-        # Test a few endpoints to check response structure
-        endpoints = [
-            ("GET", "/accounts", "Get Accounts"),
-            ("GET", "/categories", "Get Categories"),
-            ("GET", "/transactions", "Get Transactions")
-        ]
-        
-        for method, endpoint, name in endpoints:
-            try:
-                url = f"{API_BASE}{endpoint}"
-                response = self.session.get(url, timeout=15)
-                
-                # We expect 401, but let's check the response structure
-                if response.status_code == 401:
-                    try:
-                        response_data = response.json()
-                        
-                        # Check for consistent error response structure
-                        has_success_field = 'success' in response_data
-                        has_error_field = 'error' in response_data
-                        success_is_false = response_data.get('success') == False
-                        error_is_unauthorized = response_data.get('error') == 'Unauthorized'
-                        
-                        structure_correct = has_success_field and has_error_field and success_is_false and error_is_unauthorized
-                        
-                        self.log_test(
-                            f"Response Structure - {name}",
-                            structure_correct,
-                            "Correct error response structure" if structure_correct else "Incorrect error response structure",
-                            f"Response: {response_data}",
-                            critical=False
-                        )
-                        
-                    except json.JSONDecodeError:
-                        self.log_test(
-                            f"Response Structure - {name}",
-                            False,
-                            "Non-JSON error response",
-                            f"Response text: {response.text[:200]}",
-                            critical=False
-                        )
-                else:
+        for method, endpoint, name in RESPONSE_STRUCTURE_ENDPOINTS:
+            self.check_response_structure(method, endpoint, name)
+    
+    def check_response_structure(self, method, endpoint, name):
+        """Check the error response structure of a single endpoint"""
+        try:
+            url = f"{API_BASE}{endpoint}"
+            response = self.session.get(url, timeout=15)
+            
+            # We expect 401, but let's check the response structure
+            if response.status_code == 401:
+                try:
+                    response_data = response.json()
+                    
+                    # Check for consistent error response structure
+                    has_success_field = 'success' in response_data
+                    has_error_field = 'error' in response_data
+                    success_is_false = response_data.get('success') == False
+                    error_is_unauthorized = response_data.get('error') == 'Unauthorized'
+                    
+                    structure_correct = has_success_field and has_error_field and success_is_false and error_is_unauthorized
+                    
                     self.log_test(
                         f"Response Structure - {name}",
-                        False,
-                        f"Unexpected status code: {response.status_code}",
-                        f"Expected 401, got {response.status_code}",
+                        structure_correct,
+                        "Correct error response structure" if structure_correct else "Incorrect error response structure",
+                        f"Response: {response_data}",
                         critical=False
                     )
                     
-            except requests.exceptions.RequestException as e:
+                except json.JSONDecodeError:
+                    self.log_test(
+                        f"Response Structure - {name}",
+                        False,
+                        "Non-JSON error response",
+                        f"Response text: {response.text[:200]}",
+                        critical=False
+                    )
+            else:
                 self.log_test(
                     f"Response Structure - {name}",
                     False,
-                    "Request failed",
-                    str(e),
+                    f"Unexpected status code: {response.status_code}",
+                    f"Expected 401, got {response.status_code}",
                     critical=False
                 )
+                
+        except requests.exceptions.RequestException as e:
+            self.log_test(
+                f"Response Structure - {name}",
+                False,
+                "Request failed",
+                str(e),
+                critical=False
+            )
     
-    def run_all_tests(self):
-        """Run all authentication API tests"""
-        print("🔐 Starting Clerk Authentication API Testing Suite")
-        print("🎯 Focus: Authentication Security, User Context, Data Isolation")
-        print("=" * 80)
-        
-        # Test unauthenticated requests
-        self.test_unauthenticated_api_requests()
+    def test_user_cache_implementation(self):
+        """Check that every route resolves users through the shared, cached resolver"""
+        print("\n=== Testing Shared User Resolver ===")
         
-        # Test code implementation
-        self.test_api_code_implementation()
-        
-        # Test data isolation patterns
-        self.test_data_isolation_patterns()
-        
-        # Test response structure
-        self.test_api_response_structure()
-        
-        # Generate summary
-        passed, failed, critical = self.generate_summary()
-        return passed, failed, critical
+        try:
+            with open(os.path.join(APP_DIR, 'lib/auth.js'), 'r') as f:
+                auth_content = f.read()
+            
+            # No route keeps a private copy of the lookup
+            routes = []
+            for root, _, files in os.walk(os.path.join(APP_DIR, 'app/api')):
+                routes.extend(os.path.join(root, name) for name in files if name == 'route.js')
+            own_helpers, unshared = [], []
+            for path in routes:
+                with open(path, 'r') as f:
+                    content = f.read()
+                name = os.path.relpath(path, APP_DIR)
+                if 'function getAuthenticatedUser' in content:
+                    own_helpers.append(name)
+                elif 'getAuthenticatedUser' in content and "from '@/lib/auth'" not in content:
+                    unshared.append(name)
+            shared = bool(routes) and not own_helpers and not unshared
+            self.log_test(
+                "User Cache - Shared Resolver",
+                shared,
+                f"All {len(routes)} routes use lib/auth.js" if shared
+                else f"Routes with their own helper: {own_helpers}, not importing lib/auth: {unshared}",
+                critical=True
+            )
+            
+            # Keyed by Clerk ID, bounded, expiring, and dropped when a user row changes
+            keyed_by_clerk_id = re.search(r'getOrLoad\(`clerk:\$\{userId\}`', auth_content) is not None
+            has_ttl = 'LruCache' in auth_content and 'ttlMs' in auth_content and 'max:' in auth_content
+            invalidating = []
+            for route in ('app/api/users/route.js', 'app/api/accounts/default/route.js'):
+                with open(os.path.join(APP_DIR, route), 'r') as f:
+                    content = f.read()
+                if 'user.update' in content and 'invalidateUser(user.id)' not in content:
+                    invalidating.append(route)
+            success = keyed_by_clerk_id and has_ttl and not invalidating
+            self.log_test(
+                "User Cache - Keys, TTL and Invalidation",
+                success,
+                "LRU/TTL cache keyed by Clerk ID, invalidated on user updates" if success
+                else f"keyed by Clerk ID: {keyed_by_clerk_id}, LRU+TTL: {has_ttl}, updates without invalidation: {invalidating}",
+                critical=True
+            )
+        except Exception as e:
+            self.log_test("User Cache - Code Analysis", False, "Failed to analyze the user resolver", str(e), critical=True)
     
-    def generate_summary(self):
-        """Generate comprehensive test summary"""
-        print("\n" + "=" * 80)
-        print("🏁 CLERK AUTHENTICATION API TESTING SUMMARY")
-        print("=" * 80)
-        
-        total_tests = len(self.test_results)
-        passed_tests = len([r for r in self.test_results if r['success']])
-        failed_tests = total_tests - passed_tests
-        critical_failed = len(self.critical_issues)
-        
-        print(f"📊 Total Tests: {total_tests}")
-        print(f"✅ Passed: {passed_tests}")
-        print(f"❌ Failed: {failed_tests}")
-        print(f"🚨 Critical Issues: {critical_failed}")
-        print(f"📈 Success Rate: {(passed_tests/total_tests)*100:.1f}%")
-        
-        # Categorize results
-        categories = {
-            'Authentication Security': [],
-            'Code Implementation': [],
-            'Data Isolation': [],
-            'Response Structure': []
-        }
-        
-        for result in self.test_results:
-            test_name = result['test']
-            if 'Auth Security' in test_name:
-                categories['Authentication Security'].append(result)
-            elif 'Code Analysis' in test_name:
-                categories['Code Implementation'].append(result)
-            elif 'Data Isolation' in test_name:
-                categories['Data Isolation'].append(result)
-            elif 'Response Structure' in test_name:
-                categories['Response Structure'].append(result)
-        
-        # Print category summaries
-        for category, results in categories.items():
-            if results:
-                passed = len([r for r in results if r['success']])
-                total = len(results)
-                print(f"\n📋 {category}: {passed}/{total} passed")
-                
-                for result in results:
-                    if not result['success']:
-                        status = "🚨" if result.get('critical') else "⚠️"
-                        print(f"   {status} {result['test']}: {result['message']}")
+    def user_cache_stats(self):
+        """Hit/miss counters of the server's user cache"""
+        response = self.session.get(f"{API_BASE}/users", params={'cacheStats': 'true'}, timeout=15)
+        return response.json()['cache']
+    
+    def test_user_cache_behaviour(self):
+        """A burst is served from the cache, updates are visible at once, and the demo routes share the cached user"""
+        print("\n=== Testing User Cache Behaviour ===")
         
-        # Critical issues summary
-        if self.critical_issues:
-            print(f"\n🚨 CRITICAL ISSUES REQUIRING IMMEDIATE ATTENTION:")
-            for issue in self.critical_issues:
-                print(f"   🔴 {issue['test']}")
-                print(f"      Problem: {issue['message']}")
-                if issue['details']:
-                    print(f"      Details: {issue['details']}")
-                print()
+        try:
+            # A page load's burst of requests: every one must see the same user,
+            # loaded at most once (a miss only if the entry expired meanwhile)
+            before = self.user_cache_stats()
+            results = [None] * USER_CACHE_BURST
+            def fetch(index):
+                results[index] = self.session.get(f"{API_BASE}/users", timeout=15)
+            threads = [threading.Thread(target=fetch, args=(i,)) for i in range(USER_CACHE_BURST)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            after = self.user_cache_stats()
+            ids = {r.json()['data']['id'] for r in results if r is not None and r.status_code == 200}
+            ok_count = sum(1 for r in results if r is not None and r.status_code == 200)
+            self.log_test(
+                "User Cache - Concurrent Lookups",
+                ok_count == USER_CACHE_BURST and len(ids) == 1,
+                f"{USER_CACHE_BURST} concurrent lookups resolved one user" if len(ids) == 1
+                else f"{ok_count}/{USER_CACHE_BURST} succeeded, users {ids}"
+            )
+            
+            # The burst plus the second stats call, counted by the server
+            lookups = (after['hits'] + after['misses']) - (before['hits'] + before['misses'])
+            misses = after['misses'] - before['misses']
+            cached = lookups >= USER_CACHE_BURST + 1 and misses <= 1
+            self.log_test(
+                "User Cache - Hits",
+                cached,
+                f"{lookups} lookups, {misses} database load(s)" if cached
+                else f"Burst not served from the cache: {lookups} lookups, {misses} misses",
+                f"Before: {before}, after: {after}",
+                critical=True
+            )
+            if not ids:
+                return
+            original = next(r.json()['data'] for r in results if r is not None and r.status_code == 200)
+            
+            # An update must be visible on the very next request, not after the TTL
+            marker = f"CacheCheck{int(time.time())}"
+            self.session.put(f"{API_BASE}/users", json={'firstName': marker}, timeout=15)
+            after = self.session.get(f"{API_BASE}/users", timeout=15).json().get('data', {})
+            self.session.put(f"{API_BASE}/users", json={'firstName': original.get('firstName') or 'Demo'}, timeout=15)
+            self.log_test(
+                "User Cache - Invalidation",
+                after.get('firstName') == marker,
+                "Updated user visible immediately" if after.get('firstName') == marker
+                else f"Stale user after update: firstName {after.get('firstName')!r}, expected {marker!r}",
+                critical=True
+            )
+            
+            # With Clerk disabled, a fresh client on the demo routes gets the same cached user
+            anonymous = requests.Session()
+            failures = []
+            for endpoint in DEMO_USER_ENDPOINTS:
+                with anonymous.get(f"{API_BASE}{endpoint}", stream=True, timeout=60) as response:
+                    if response.status_code != 200:
+                        failures.append(f"{endpoint}: {response.status_code}")
+                    elif endpoint == '/users' and response.json()['data']['id'] not in ids:
+                        failures.append(f"{endpoint}: user {response.json()['data']['id']}")
+            self.log_test(
+                "User Cache - Demo Routes",
+                not failures,
+                "Demo-auth routes serve the cached demo user" if not failures
+                else f"Demo-auth routes disagree: {failures}",
+                critical=True
+            )
+        except Exception as e:
+            self.log_test("User Cache - Behaviour", False, "Request failed", str(e), critical=False)
+    
+    def test_user_cache_isolation(self):
+        """Two Clerk IDs resolve to different cached users, and invalidating one keeps the other"""
+        print("\n=== Testing User Cache Isolation ===")
         
-        # Final assessment
+        try:
+            result = subprocess.run(["node", "--input-type=module", "-e", USER_CACHE_ISOLATION_SCRIPT, APP_DIR],
+                                    capture_output=True, text=True, timeout=30)
+            if result.returncode != 0:
+                self.log_test("User Cache - Isolation", False, "Cache script failed", result.stderr[-500:], critical=True)
+                return
+            report = json.loads(result.stdout)
+            isolated = (report['distinct'] and report['burstLoads'] == 1 and report['burstUsers'] == 1
+                        and report['reloads'] == ['user_a'] and report['reloadedUsers'] == ['db-user_b', 'db-user_a'])
+            self.log_test(
+                "User Cache - Isolation",
+                isolated,
+                "Clerk IDs cached separately, one load per burst, invalidation scoped to one user" if isolated
+                else "Cached users are shared or invalidated across Clerk IDs",
+                json.dumps(report),
+                critical=True
+            )
+        except Exception as e:
+            self.log_test("User Cache - Isolation", False, "Failed to run the cache script", str(e), critical=True)
+    
+    def checks(self):
+        """Independent checks for a full authentication run"""
+        return [
+            # Test unauthenticated requests
+            *fan_out(self.check_unauthenticated_request, UNAUTHENTICATED_ENDPOINTS),
+            
+            # Test code implementation
+            self.test_api_code_implementation,
+            
+            # Test data isolation patterns
+            self.test_data_isolation_patterns,
+            
+            # Test response structure
+            *fan_out(self.check_response_structure, RESPONSE_STRUCTURE_ENDPOINTS),
+            
+            # Test the shared user resolver and its cache
+            self.test_user_cache_implementation,
+            self.test_user_cache_behaviour,
+            self.test_user_cache_isolation
+        ]
+    
+    def print_recommendations(self, passed, failed, critical_failed):
+        """Print the authentication implementation assessment"""
         print(f"\n💡 AUTHENTICATION IMPLEMENTATION ASSESSMENT:")
         
         if critical_failed == 0:
@@ -485,6 +622,8 @@ class ClerkAuthAPITester:
                     failed_categories.add('implementation')
                 elif 'Data Isolation' in issue['test']:
                     failed_categories.add('isolation')
+                elif 'User Cache' in issue['test']:
+                    failed_categories.add('cache')
             
             if 'security' in failed_categories:
                 print("      - Fix API endpoints that don't require authentication")
@@ -492,8 +631,8 @@ class ClerkAuthAPITester:
                 print("      - Complete Clerk authentication implementation in API routes")
             if 'isolation' in failed_categories:
                 print("      - Add proper user data isolation and ownership verification")
-        
-        return passed_tests, failed_tests, critical_failed
+            if 'cache' in failed_categories:
+                print("      - Resolve users through lib/auth.js and call invalidateUser after user updates")
 
 if __name__ == "__main__":
     tester = ClerkAuthAPITester()
@@ -502,10 +641,9 @@ if __name__ == "__main__":
     # Exit with appropriate code
     if critical > 0:
         print(f"\n🚨 CRITICAL AUTHENTICATION ISSUES FOUND: {critical}")
-        exit(2)  # Critical issues
     elif failed > 0:
         print(f"\n⚠️  MINOR ISSUES FOUND: {failed}")
-        exit(1)  # Minor issues
     else:
         print(f"\n🎉 ALL AUTHENTICATION TESTS PASSED!")
-        exit(0)  # Success
\ No newline at end of file
+    
+    exit(exit_code(failed, critical))
\ No newline at end of file
@@ -7,42 +7,48 @@ Focus: Authentication integration, database connectivity, and user context
 
 import requests
 import json
-import os
 import subprocess
 import sys
 from datetime import datetime, timedelta
 import uuid
 
-# Get base URL from environment
-BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://cashflow-182.preview.emergentagent.com')
-API_BASE = f"{BASE_URL}/api"
+from tests.base import BaseTester, exit_code
+from tests.client import API_BASE, BASE_URL
+from tests.runner import fan_out, sequence
 
-class Phase3BackendTester:
-    def __init__(self):
-        self.test_results = []
-        self.session = requests.Session()
-        self.critical_issues = []
-        
-    def log_test(self, test_name, success, message, details=None, critical=False):
-        """Log test results"""
-        result = {
-            'test': test_name,
-            'success': success,
-            'message': message,
-            'details': details,
-            'timestamp': datetime.now().isoformat(),
-            'critical': critical
-        }
-        self.test_results.append(result)
-        
-        if critical and not success:
-            self.critical_issues.append(result)
-            
-        status = "✅ PASS" if success else "❌ FAIL"
-        priority = " [CRITICAL]" if critical else ""
-        print(f"{status}{priority}: {test_name} - {message}")
-        if details and not success:
-            print(f"   Details: {details}")
+PUBLIC_ROUTES = [
+    ("/", "Root page"),
+    ("/sign-in", "Sign-in page"),
+    ("/sign-up", "Sign-up page")
+]
+
+PROTECTED_ROUTES = [
+    ("/dashboard", "Dashboard page"),
+    ("/transactions", "Transactions page"),
+    ("/accounts", "Accounts page")
+]
+
+AUTH_ENDPOINTS = [
+    ("GET", "/accounts", "Get Accounts"),
+    ("GET", "/categories", "Get Categories"), 
+    ("GET", "/transactions", "Get Transactions"),
+    ("GET", "/analytics", "Get Analytics"),
+    ("GET", "/export?format=csv", "Export CSV")
+]
+
+class Phase3BackendTester(BaseTester):
+    BANNER = [
+        "🚀 Starting Finance Wizard Backend Testing Suite - Phase 3",
+        "🎯 Focus: Clerk Authentication, Neon PostgreSQL, User Context"
+    ]
+    SUMMARY_TITLE = "PHASE 3 BACKEND TESTING SUMMARY"
+    SUMMARY_CATEGORIES = [
+        ('Environment', ['Environment']),
+        ('Database', ['Database']),
+        ('Authentication', ['Clerk', 'Auth']),
+        ('API', ['API']),
+        ('Data Integrity', ['Data'])
+    ]
     
     def test_environment_configuration(self):
         """Test that all required environment variables are configured"""
@@ -287,98 +293,94 @@ class Phase3BackendTester:
         print("\n=== Testing Clerk Authentication Middleware ===")
         
         # Test public routes (should be accessible)
-        public_routes = [
-            ("/", "Root page"),
-            ("/sign-in", "Sign-in page"),
-            ("/sign-up", "Sign-up page")
-        ]
+        for route, description in PUBLIC_ROUTES:
+            self.check_public_route(route, description)
         
-        for route, description in public_routes:
-            try:
-                url = f"{BASE_URL}{route}"
-                response = self.session.get(url, timeout=15, allow_redirects=False)
-                
-                if response.status_code in [200, 302]:
-                    self.log_test(
-                        f"Clerk Middleware - Public Route {route}",
-                        True,
-                        f"{description} accessible (Status: {response.status_code})",
-                        f"Response size: {len(response.content)} bytes",
-                        critical=True
-                    )
-                else:
-                    self.log_test(
-                        f"Clerk Middleware - Public Route {route}",
-                        False,
-                        f"{description} not accessible (Status: {response.status_code})",
-                        response.text[:200],
-                        critical=True
-                    )
-                    
-            except requests.exceptions.RequestException as e:
+        # Test protected routes (should redirect to sign-in)
+        for route, description in PROTECTED_ROUTES:
+            self.check_protected_route(route, description)
+    
+    def check_public_route(self, route, description):
+        """Check that a public page is reachable without signing in"""
+        try:
+            url = f"{BASE_URL}{route}"
+            response = self.session.get(url, timeout=15, allow_redirects=False)
+            
+            if response.status_code in [200, 302]:
+                self.log_test(
+                    f"Clerk Middleware - Public Route {route}",
+                    True,
+                    f"{description} accessible (Status: {response.status_code})",
+                    f"Response size: {len(response.content)} bytes",
+                    critical=True
+                )
+            else:
                 self.log_test(
                     f"Clerk Middleware - Public Route {route}",
                     False,
-                    f"{description} request failed",
-                    str(e),
+                    f"{description} not accessible (Status: {response.status_code})",
+                    response.text[:200],
                     critical=True
                 )
-        
-        # Test protected routes (should redirect to sign-in)
-        protected_routes = [
-            ("/dashboard", "Dashboard page"),
-            ("/transactions", "Transactions page"),
-            ("/accounts", "Accounts page")
-        ]
-        
-        for route, description in protected_routes:
-            try:
-                url = f"{BASE_URL}{route}"
-                response = self.session.get(url, timeout=15, allow_redirects=False)
                 
-                if response.status_code == 302:
-                    location = response.headers.get('location', '')
-                    if '/sign-in' in location:
-                        self.log_test(
-                            f"Clerk Middleware - Protected Route {route}",
-                            True,
-                            f"{description} correctly redirects to sign-in",
-                            f"Redirect location: {location}",
-                            critical=True
-                        )
-                    else:
-                        self.log_test(
-                            f"Clerk Middleware - Protected Route {route}",
-                            False,
-                            f"{description} redirects but not to sign-in",
-                            f"Redirect location: {location}",
-                            critical=True
-                        )
-                elif response.status_code == 200:
+        except requests.exceptions.RequestException as e:
+            self.log_test(
+                f"Clerk Middleware - Public Route {route}",
+                False,
+                f"{description} request failed",
+                str(e),
+                critical=True
+            )
+    
+    def check_protected_route(self, route, description):
+        """Check that a protected page redirects to sign-in"""
+        try:
+            url = f"{BASE_URL}{route}"
+            response = self.session.get(url, timeout=15, allow_redirects=False)
+            
+            if response.status_code == 302:
+                location = response.headers.get('location', '')
+                if '/sign-in' in location:
                     self.log_test(
                         f"Clerk Middleware - Protected Route {route}",
-                        False,
-                        f"{description} accessible without authentication (SECURITY ISSUE)",
-                        "This is a critical security vulnerability",
+                        True,
+                        f"{description} correctly redirects to sign-in",
+                        f"Redirect location: {location}",
                         critical=True
                     )
                 else:
                     self.log_test(
                         f"Clerk Middleware - Protected Route {route}",
                         False,
-                        f"{description} unexpected response (Status: {response.status_code})",
-                        response.text[:200],
+                        f"{description} redirects but not to sign-in",
+                        f"Redirect location: {location}",
                         critical=True
                     )
-                    
-            except requests.exceptions.RequestException as e:
+            elif response.status_code == 200:
                 self.log_test(
                     f"Clerk Middleware - Protected Route {route}",
                     False,
-                    f"{description} request failed",
-                    str(e),
+                    f"{description} accessible without authentication (SECURITY ISSUE)",
+                    "This is a critical security vulnerability",
+                    critical=True
+                )
+            else:
+                self.log_test(
+                    f"Clerk Middleware - Protected Route {route}",
+                    False,
+                    f"{description} unexpected response (Status: {response.status_code})",
+                    response.text[:200],
                     critical=True
                 )
+                
+        except requests.exceptions.RequestException as e:
+            self.log_test(
+                f"Clerk Middleware - Protected Route {route}",
+                False,
+                f"{description} request failed",
+                str(e),
+                critical=True
+            )
     
     def test_api_user_context_implementation(self):
         """Test if API routes properly implement user context and authentication"""
@@ -440,73 +442,69 @@ class Phase3BackendTester:
         """Test API endpoints without authentication (should require auth or return filtered data)"""
         print("\n=== Testing API Endpoints Authentication Requirements ===")
         
-        endpoints = [
-            ("GET", "/accounts", "Get Accounts"),
-            ("GET", "/categories", "Get Categories"), 
-            ("GET", "/transactions", "Get Transactions"),
-            ("GET", "/analytics", "Get Analytics"),
-            ("GET", "/export?format=csv", "Export CSV")
-        ]
-        
-        for method, endpoint, name in endpoints:
-            try:
-                url = f"{API_BASE}{endpoint}"
-                response = self.session.request(method, url, timeout=15)
-                
-                # Check response
-                if response.status_code == 401:
-                    self.log_test(
-                        f"API Auth Check - {name}",
-                        True,
-                        "Correctly requires authentication",
-                        f"Status: {response.status_code}",
-                        critical=True
-                    )
-                elif response.status_code == 200:
-                    try:
-                        data = response.json()
-                        if data.get('success') and data.get('data'):
-                            # This could be a problem - API should require auth or return empty data for unauthenticated users
-                            self.log_test(
-                                f"API Auth Check - {name}",
-                                False,
-                                "API returns data without authentication (POTENTIAL SECURITY ISSUE)",
-                                f"Status: {response.status_code}, Data returned: {len(str(data.get('data', [])))} chars",
-                                critical=True
-                            )
-                        else:
-                            self.log_test(
-                                f"API Auth Check - {name}",
-                                True,
-                                "API accessible but returns no data without authentication",
-                                f"Status: {response.status_code}, Response: {data}",
-                                critical=False
-                            )
-                    except json.JSONDecodeError:
+        for method, endpoint, name in AUTH_ENDPOINTS:
+            self.check_endpoint_without_auth(method, endpoint, name)
+    
+    def check_endpoint_without_auth(self, method, endpoint, name):
+        """Check a single API endpoint's response to an unauthenticated request"""
+        try:
+            url = f"{API_BASE}{endpoint}"
+            response = self.session.request(method, url, timeout=15)
+            
+            # Check response
+            if response.status_code == 401:
+                self.log_test(
+                    f"API Auth Check - {name}",
+                    True,
+                    "Correctly requires authentication",
+                    f"Status: {response.status_code}",
+                    critical=True
+                )
+            elif response.status_code == 200:
+                try:
+                    data = response.json()
+                    if data.get('success') and data.get('data'):
+                        # This could be a problem - API should require auth or return empty data for unauthenticated users
                         self.log_test(
                             f"API Auth Check - {name}",
                             False,
-                            "API returned non-JSON response",
-                            response.text[:200],
+                            "API returns data without authentication (POTENTIAL SECURITY ISSUE)",
+                            f"Status: {response.status_code}, Data returned: {len(str(data.get('data', [])))} chars",
+                            critical=True
+                        )
+                    else:
+                        self.log_test(
+                            f"API Auth Check - {name}",
+                            True,
+                            "API accessible but returns no data without authentication",
+                            f"Status: {response.status_code}, Response: {data}",
                             critical=False
                         )
-                else:
+                except json.JSONDecodeError:
                     self.log_test(
                         f"API Auth Check - {name}",
                         False,
-                        f"Unexpected response status: {response.status_code}",
+                        "API returned non-JSON response",
                         response.text[:200],
                         critical=False
                     )
-                    
-            except requests.exceptions.RequestException as e:
+            else:
                 self.log_test(
                     f"API Auth Check - {name}",
                     False,
-                    "Request failed",
-                    str(e),
+                    f"Unexpected response status: {response.status_code}",
+                    response.text[:200],
                     critical=False
                 )
+                
+        except requests.exceptions.RequestException as e:
+            self.log_test(
+                f"API Auth Check - {name}",
+                False,
+                "Request failed",
+                str(e),
+                critical=False
+            )
     
     def test_accounts_api_endpoints(self):
         """Test accounts API endpoints functionality (without authentication - testing implementation)"""
@@ -1027,99 +1025,34 @@ class Phase3BackendTester:
                 critical=True
             )
     
-    def run_all_tests(self):
-        """Run all Phase 3 backend tests"""
-        print("🚀 Starting Finance Wizard Backend Testing Suite - Phase 3")
-        print("🎯 Focus: Clerk Authentication, Neon PostgreSQL, User Context")
-        print("=" * 80)
-        
-        # Test environment configuration first
-        self.test_environment_configuration()
-        
-        # Test database connection and setup
-        self.test_database_connection()
-        self.test_database_seeding()
-        
-        # Test authentication and middleware
-        self.test_clerk_middleware()
-        
-        # Test API implementation
-        self.test_api_user_context_implementation()
-        self.test_api_endpoints_without_auth()
-        
-        # Test accounts API specifically
-        self.test_accounts_api_endpoints()
-        self.test_accounts_api_implementation_analysis()
-        
-        # Test data integrity
-        self.test_data_integrity_and_isolation()
-        
-        # Generate summary
-        passed, failed, critical = self.generate_summary()
-        return passed, failed, critical
+    def checks(self):
+        """Independent checks for a full Phase 3 run"""
+        return [
+            # Test environment configuration
+            self.test_environment_configuration,
+            
+            # Database setup must finish before the seeded data can be verified
+            sequence(
+                self.test_database_connection,
+                self.test_database_seeding,
+                self.test_data_integrity_and_isolation
+            ),
+            
+            # Test authentication and middleware
+            *fan_out(self.check_public_route, PUBLIC_ROUTES),
+            *fan_out(self.check_protected_route, PROTECTED_ROUTES),
+            
+            # Test API implementation
+            self.test_api_user_context_implementation,
+            *fan_out(self.check_endpoint_without_auth, AUTH_ENDPOINTS),
+            
+            # Test accounts API specifically
+            self.test_accounts_api_endpoints,
+            self.test_accounts_api_implementation_analysis
+        ]
     
-    def generate_summary(self):
-        """Generate comprehensive test summary"""
-        print("\n" + "=" * 80)
-        print("🏁 PHASE 3 BACKEND TESTING SUMMARY")
-        print("=" * 80)
-        
-        total_tests = len(self.test_results)
-        passed_tests = len([r for r in self.test_results if r['success']])
-        failed_tests = total_tests - passed_tests
-        critical_failed = len(self.critical_issues)
-        
-        print(f"📊 Total Tests: {total_tests}")
-        print(f"✅ Passed: {passed_tests}")
-        print(f"❌ Failed: {failed_tests}")
-        print(f"🚨 Critical Issues: {critical_failed}")
-        print(f"📈 Success Rate: {(passed_tests/total_tests)*100:.1f}%")
-        
-        # Categorize results
-        categories = {
-            'Environment': [],
-            'Database': [],
-            'Authentication': [],
-            'API': [],
-            'Data Integrity': []
-        }
-        
-        for result in self.test_results:
-            test_name = result['test']
-            if 'Environment' in test_name:
-                categories['Environment'].append(result)
-            elif 'Database' in test_name:
-                categories['Database'].append(result)
-            elif 'Clerk' in test_name or 'Auth' in test_name:
-                categories['Authentication'].append(result)
-            elif 'API' in test_name:
-                categories['API'].append(result)
-            elif 'Data' in test_name:
-                categories['Data Integrity'].append(result)
-        
-        # Print category summaries
-        for category, results in categories.items():
-            if results:
-                passed = len([r for r in results if r['success']])
-                total = len(results)
-                print(f"\n📋 {category}: {passed}/{total} passed")
-                
-                for result in results:
-                    if not result['success']:
-                        status = "🚨" if result.get('critical') else "⚠️"
-                        print(f"   {status} {result['test']}: {result['message']}")
-        
-        # Critical issues summary
-        if self.critical_issues:
-            print(f"\n🚨 CRITICAL ISSUES REQUIRING IMMEDIATE ATTENTION:")
-            for issue in self.critical_issues:
-                print(f"   🔴 {issue['test']}")
-                print(f"      Problem: {issue['message']}")
-                if issue['details']:
-                    print(f"      Details: {issue['details']}")
-                print()
-        
-        # Recommendations
+    def print_recommendations(self, passed, failed, critical_failed):
+        """Print Phase 3 recommendations and next steps"""
         print(f"\n💡 RECOMMENDATIONS:")
         
         if critical_failed == 0:
@@ -1155,8 +1088,6 @@ class Phase3BackendTester:
         else:
             print("   🔧 Fix critical backend issues first")
             print("   🔄 Re-run tests after fixes")
-        
-        return passed_tests, failed_tests, critical_failed
 
 if __name__ == "__main__":
     tester = Phase3BackendTester()
@@ -1166,12 +1097,11 @@ if __name__ == "__main__":
     if critical > 0:
         print(f"\n🚨 CRITICAL ISSUES FOUND: {critical}")
         print("Fix critical issues before proceeding to frontend testing.")
-        exit(2)  # Critical issues
     elif failed > 0:
         print(f"\n⚠️  MINOR ISSUES FOUND: {failed}")
         print("Consider fixing minor issues but can proceed with caution.")
-        exit(1)  # Minor issues
     else:
         print(f"\n🎉 ALL TESTS PASSED!")
         print("Backend is ready for frontend integration testing.")
-        exit(0)  # Success
\ No newline at end of file
+    
+    exit(exit_code(failed, critical))
\ No newline at end of file
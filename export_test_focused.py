@@ -4,201 +4,515 @@ Focused Export Functionality Test for Personal Finance Dashboard
 Tests only the /api/export endpoint with CSV and Excel formats
 """
 
-import requests
-import json
 import os
+import re
+import tempfile
+import time
+import zipfile
+import zlib
 from io import BytesIO, StringIO
 import csv
 import openpyxl
 
-# Get base URL from environment
-BASE_URL = "https://cashflow-182.preview.emergentagent.com"
-API_BASE = f"{BASE_URL}/api"
+from tests.base import BaseTester
+from tests.client import API_BASE, BASE_URL, iter_pages
+from tests.db import connect
 
-def test_export_functionality():
-    """Run focused export functionality tests"""
-    print("🚀 Testing Personal Finance Dashboard Export Functionality")
-    print(f"📍 API Base: {API_BASE}")
-    print("=" * 70)
-    
-    results = []
+# Ledger size the large export test is meant for (smaller datasets still run, with a note)
+LARGE_EXPORT_ROWS = int(os.getenv('LARGE_EXPORT_ROWS', '500000'))
+# Seconds to wait for a background export job to finish
+EXPORT_JOB_TIMEOUT = int(os.getenv('EXPORT_JOB_TIMEOUT', '600'))
+
+class ExportFunctionalityTester(BaseTester):
+    BANNER = [
+        "🚀 Testing Personal Finance Dashboard Export Functionality",
+        f"📍 API Base: {API_BASE}"
+    ]
+    SUMMARY_TITLE = "EXPORT FUNCTIONALITY TEST SUMMARY"
     
-    # Test 1: CSV Export
-    print("\n1️⃣ Testing CSV Export (GET /api/export?format=csv)")
-    try:
-        response = requests.get(f"{API_BASE}/export?format=csv", timeout=30)
-        
-        if response.status_code == 200:
-            content_type = response.headers.get('Content-Type', '')
-            content_disposition = response.headers.get('Content-Disposition', '')
-            
-            print(f"   ✅ Status: {response.status_code}")
-            print(f"   ✅ Content-Type: {content_type}")
-            print(f"   ✅ Content-Disposition: {content_disposition}")
+    def test_csv_export(self):
+        """Test CSV export (GET /api/export?format=csv)"""
+        print("\n1️⃣ Testing CSV Export (GET /api/export?format=csv)")
+        try:
+            response = self.session.get(f"{API_BASE}/export?format=csv", timeout=30)
             
-            # Verify CSV structure
-            csv_content = response.text
-            lines = csv_content.strip().split('\n')
-            
-            if len(lines) > 0:
-                headers = lines[0].split(',')
-                expected_headers = ['Date', 'Description', 'Amount', 'Category', 'Subcategory', 'Account', 'Type']
-                
-                print(f"   ✅ Headers: {headers}")
-                print(f"   ✅ Data rows: {len(lines) - 1}")
+            if response.status_code == 200:
+                content_type = response.headers.get('Content-Type', '')
+                content_disposition = response.headers.get('Content-Disposition', '')
                 
-                # Test CSV parsing
-                csv_reader = csv.DictReader(StringIO(csv_content))
-                rows = list(csv_reader)
-                print(f"   ✅ Parsed rows: {len(rows)}")
+                print(f"   ✅ Status: {response.status_code}")
+                print(f"   ✅ Content-Type: {content_type}")
+                print(f"   ✅ Content-Disposition: {content_disposition}")
                 
-                if len(rows) > 0:
-                    sample_row = rows[0]
-                    print(f"   ✅ Sample row: {dict(sample_row)}")
+                # Verify CSV structure
+                csv_content = response.text
+                lines = csv_content.strip().split('\n')
                 
-                results.append(("CSV Export", True, f"Successfully exported {len(rows)} transactions"))
+                if len(lines) > 0:
+                    headers = lines[0].split(',')
+                    expected_headers = ['Date', 'Description', 'Amount', 'Category', 'Subcategory', 'Account', 'Type']
+                    
+                    print(f"   ✅ Headers: {headers}")
+                    print(f"   ✅ Data rows: {len(lines) - 1}")
+                    
+                    # Test CSV parsing
+                    csv_reader = csv.DictReader(StringIO(csv_content))
+                    rows = list(csv_reader)
+                    print(f"   ✅ Parsed rows: {len(rows)}")
+                    
+                    if len(rows) > 0:
+                        sample_row = rows[0]
+                        print(f"   ✅ Sample row: {dict(sample_row)}")
+                    
+                    self.log_test("CSV Export", True, f"Successfully exported {len(rows)} transactions")
+                else:
+                    self.log_test("CSV Export", False, "Empty CSV content")
             else:
-                results.append(("CSV Export", False, "Empty CSV content"))
-        else:
-            results.append(("CSV Export", False, f"HTTP {response.status_code}: {response.text}"))
-    except Exception as e:
-        results.append(("CSV Export", False, f"Error: {e}"))
+                self.log_test("CSV Export", False, f"HTTP {response.status_code}: {response.text}")
+        except Exception as e:
+            self.log_test("CSV Export", False, f"Error: {e}")
     
-    # Test 2: Excel Export
-    print("\n2️⃣ Testing Excel Export (GET /api/export?format=xlsx)")
-    try:
-        response = requests.get(f"{API_BASE}/export?format=xlsx", timeout=30)
-        
-        if response.status_code == 200:
-            content_type = response.headers.get('Content-Type', '')
-            content_disposition = response.headers.get('Content-Disposition', '')
-            
-            print(f"   ✅ Status: {response.status_code}")
-            print(f"   ✅ Content-Type: {content_type}")
-            print(f"   ✅ Content-Disposition: {content_disposition}")
-            
-            # Verify Excel structure
-            excel_data = BytesIO(response.content)
-            workbook = openpyxl.load_workbook(excel_data)
+    def test_excel_export(self):
+        """Test Excel export (GET /api/export?format=xlsx)"""
+        print("\n2️⃣ Testing Excel Export (GET /api/export?format=xlsx)")
+        try:
+            response = self.session.get(f"{API_BASE}/export?format=xlsx", timeout=30)
             
-            print(f"   ✅ Worksheets: {workbook.sheetnames}")
-            
-            if 'Transactions' in workbook.sheetnames:
-                worksheet = workbook['Transactions']
+            if response.status_code == 200:
+                content_type = response.headers.get('Content-Type', '')
+                content_disposition = response.headers.get('Content-Disposition', '')
                 
-                # Get headers
-                headers = []
-                for cell in worksheet[1]:
-                    if cell.value:
-                        headers.append(cell.value)
+                print(f"   ✅ Status: {response.status_code}")
+                print(f"   ✅ Content-Type: {content_type}")
+                print(f"   ✅ Content-Disposition: {content_disposition}")
                 
-                data_rows = worksheet.max_row - 1
-                print(f"   ✅ Headers: {headers}")
-                print(f"   ✅ Data rows: {data_rows}")
+                # Verify Excel structure
+                excel_data = BytesIO(response.content)
+                workbook = openpyxl.load_workbook(excel_data)
                 
-                if data_rows > 0:
-                    # Sample first data row
-                    sample_row = []
-                    for cell in worksheet[2]:
-                        sample_row.append(cell.value)
-                    print(f"   ✅ Sample row: {sample_row}")
+                print(f"   ✅ Worksheets: {workbook.sheetnames}")
                 
-                results.append(("Excel Export", True, f"Successfully exported {data_rows} transactions"))
+                if 'Transactions' in workbook.sheetnames:
+                    worksheet = workbook['Transactions']
+                    
+                    # Get headers
+                    headers = []
+                    for cell in worksheet[1]:
+                        if cell.value:
+                            headers.append(cell.value)
+                    
+                    data_rows = worksheet.max_row - 1
+                    print(f"   ✅ Headers: {headers}")
+                    print(f"   ✅ Data rows: {data_rows}")
+                    
+                    if data_rows > 0:
+                        # Sample first data row
+                        sample_row = []
+                        for cell in worksheet[2]:
+                            sample_row.append(cell.value)
+                        print(f"   ✅ Sample row: {sample_row}")
+                    
+                    self.log_test("Excel Export", True, f"Successfully exported {data_rows} transactions")
+                else:
+                    self.log_test("Excel Export", False, "Transactions worksheet not found")
+                
+                workbook.close()
             else:
-                results.append(("Excel Export", False, "Transactions worksheet not found"))
-            
-            workbook.close()
-        else:
-            results.append(("Excel Export", False, f"HTTP {response.status_code}: {response.text}"))
-    except Exception as e:
-        results.append(("Excel Export", False, f"Error: {e}"))
+                self.log_test("Excel Export", False, f"HTTP {response.status_code}: {response.text}")
+        except Exception as e:
+            self.log_test("Excel Export", False, f"Error: {e}")
     
-    # Test 3: Default Format
-    print("\n3️⃣ Testing Default Format (GET /api/export)")
-    try:
-        response = requests.get(f"{API_BASE}/export", timeout=30)
-        
-        if response.status_code == 200:
-            content_type = response.headers.get('Content-Type', '')
-            print(f"   ✅ Status: {response.status_code}")
-            print(f"   ✅ Content-Type: {content_type}")
-            
-            if 'text/csv' in content_type:
-                # Compare with explicit CSV
-                csv_response = requests.get(f"{API_BASE}/export?format=csv", timeout=30)
-                if csv_response.status_code == 200 and response.text == csv_response.text:
-                    results.append(("Default Format", True, "Correctly defaults to CSV"))
-                    print("   ✅ Matches explicit CSV format")
+    def test_default_format(self):
+        """Test that GET /api/export defaults to CSV"""
+        print("\n3️⃣ Testing Default Format (GET /api/export)")
+        try:
+            response = self.session.get(f"{API_BASE}/export", timeout=30)
+            
+            if response.status_code == 200:
+                content_type = response.headers.get('Content-Type', '')
+                print(f"   ✅ Status: {response.status_code}")
+                print(f"   ✅ Content-Type: {content_type}")
+                
+                if 'text/csv' in content_type:
+                    # Compare with explicit CSV
+                    csv_response = self.session.get(f"{API_BASE}/export?format=csv", timeout=30)
+                    if csv_response.status_code == 200 and response.text == csv_response.text:
+                        self.log_test("Default Format", True, "Correctly defaults to CSV")
+                        print("   ✅ Matches explicit CSV format")
+                    else:
+                        self.log_test("Default Format", False, "Does not match explicit CSV")
                 else:
-                    results.append(("Default Format", False, "Does not match explicit CSV"))
+                    self.log_test("Default Format", False, f"Not CSV format: {content_type}")
             else:
-                results.append(("Default Format", False, f"Not CSV format: {content_type}"))
-        else:
-            results.append(("Default Format", False, f"HTTP {response.status_code}: {response.text}"))
-    except Exception as e:
-        results.append(("Default Format", False, f"Error: {e}"))
+                self.log_test("Default Format", False, f"HTTP {response.status_code}: {response.text}")
+        except Exception as e:
+            self.log_test("Default Format", False, f"Error: {e}")
     
-    # Test 4: Data Integrity
-    print("\n4️⃣ Testing Data Integrity")
-    try:
-        # Get transactions from API
-        transactions_response = requests.get(f"{API_BASE}/transactions?limit=1000", timeout=30)
-        
-        if transactions_response.status_code == 200:
-            transactions_data = transactions_response.json()
-            if transactions_data.get('success'):
-                api_transactions = transactions_data.get('data', {}).get('transactions', [])
-                print(f"   ✅ API transactions: {len(api_transactions)}")
-                
-                # Get CSV export
-                csv_response = requests.get(f"{API_BASE}/export?format=csv", timeout=30)
-                if csv_response.status_code == 200:
-                    csv_content = csv_response.text
-                    csv_lines = csv_content.strip().split('\n')
-                    csv_data_rows = len(csv_lines) - 1
-                    
-                    print(f"   ✅ Export rows: {csv_data_rows}")
-                    
-                    # Check required fields
-                    csv_reader = csv.DictReader(StringIO(csv_content))
-                    first_row = next(csv_reader)
-                    required_fields = ['Date', 'Description', 'Amount', 'Category', 'Account', 'Type']
-                    missing_fields = [field for field in required_fields if not first_row.get(field)]
-                    
-                    if not missing_fields and csv_data_rows >= len(api_transactions):
-                        results.append(("Data Integrity", True, f"All fields present, {csv_data_rows} rows exported"))
-                        print(f"   ✅ All required fields present: {required_fields}")
-                    else:
-                        results.append(("Data Integrity", False, f"Missing fields: {missing_fields} or insufficient rows"))
+    def test_data_integrity(self):
+        """Test that the CSV export covers every transaction with all fields"""
+        print("\n4️⃣ Testing Data Integrity")
+        try:
+            # Get every transaction from the API, following the pagination cursor
+            api_transactions = [row for page in iter_pages(self.session, '/transactions', limit=200) for row in page]
+            print(f"   ✅ API transactions: {len(api_transactions)}")
+            
+            # Get CSV export
+            csv_response = self.session.get(f"{API_BASE}/export?format=csv", timeout=30)
+            if csv_response.status_code == 200:
+                csv_content = csv_response.text
+                csv_lines = csv_content.strip().split('\n')
+                csv_data_rows = len(csv_lines) - 1
+                
+                print(f"   ✅ Export rows: {csv_data_rows}")
+                
+                # Check required fields
+                csv_reader = csv.DictReader(StringIO(csv_content))
+                first_row = next(csv_reader)
+                required_fields = ['Date', 'Description', 'Amount', 'Category', 'Account', 'Type']
+                missing_fields = [field for field in required_fields if not first_row.get(field)]
+                
+                if not missing_fields and csv_data_rows >= len(api_transactions):
+                    self.log_test("Data Integrity", True, f"All fields present, {csv_data_rows} rows exported")
+                    print(f"   ✅ All required fields present: {required_fields}")
                 else:
-                    results.append(("Data Integrity", False, "Could not get CSV for comparison"))
+                    self.log_test("Data Integrity", False, f"Missing fields: {missing_fields} or insufficient rows")
             else:
-                results.append(("Data Integrity", False, "Transactions API unsuccessful"))
-        else:
-            results.append(("Data Integrity", False, f"Could not get transactions: {transactions_response.status_code}"))
-    except Exception as e:
-        results.append(("Data Integrity", False, f"Error: {e}"))
+                self.log_test("Data Integrity", False, "Could not get CSV for comparison")
+        except Exception as e:
+            self.log_test("Data Integrity", False, f"Error: {e}")
     
-    # Summary
-    print("\n" + "=" * 70)
-    print("📊 EXPORT FUNCTIONALITY TEST SUMMARY")
-    print("=" * 70)
+    def count_transactions(self):
+        """Count the user's transactions straight from the database, independent of the API"""
+        user_id = self.session.get(f"{API_BASE}/users", timeout=30).json()['data']['id']
+        conn = connect()
+        try:
+            return conn.execute('SELECT COUNT(*) FROM "transactions" WHERE "userId" = ?', (user_id,)).fetchone()[0]
+        finally:
+            conn.close()
     
-    passed = sum(1 for _, success, _ in results if success)
-    total = len(results)
+    def test_large_excel_export(self):
+        """Download the XLSX export in chunks and read it back row by row"""
+        print("\n6️⃣ Testing Large Excel Export")
+        try:
+            with tempfile.NamedTemporaryFile(suffix='.xlsx') as download:
+                started = time.perf_counter()
+                with self.session.get(f"{API_BASE}/export?format=xlsx", stream=True, timeout=900) as response:
+                    if response.status_code != 200:
+                        self.log_test("Large Excel Export", False, f"Export failed: {response.status_code}")
+                        return
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        download.write(chunk)
+                download.flush()
+                elapsed = time.perf_counter() - started
+                size_mb = download.tell() / (1024 * 1024)
+                
+                # Read-only mode iterates rows without loading the sheet into memory
+                workbook = openpyxl.load_workbook(download.name, read_only=True)
+                worksheet = workbook['Transactions']
+                rows = worksheet.iter_rows(values_only=True)
+                headers = list(next(rows, []))
+                exported_rows = sum(1 for _ in rows)
+                workbook.close()
+                
+                # Column widths sit at the top of the sheet XML, which read-only mode does not parse
+                with zipfile.ZipFile(download.name) as archive, archive.open('xl/worksheets/sheet1.xml') as sheet:
+                    sheet_head = sheet.read(8192).decode('utf-8', 'replace')
+                widths = [float(width) for width in re.findall(r'<col [^>]*width="([\d.]+)"', sheet_head)]
+            
+            rate = exported_rows / elapsed if elapsed else 0
+            print(f"   ✅ Downloaded {size_mb:.1f} MB with {exported_rows} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+            if exported_rows < LARGE_EXPORT_ROWS:
+                print(f"   ⚠️ Only {exported_rows} rows; load {LARGE_EXPORT_ROWS}+ for a full-size run (python -m tests.ledger)")
+            
+            db_rows = self.count_transactions()
+            expected_headers = ['Date', 'Description', 'Amount', 'Category', 'Subcategory', 'Account', 'Type']
+            widths_ok = len(widths) == len(expected_headers) and all(width <= 52 for width in widths)
+            success = headers == expected_headers and exported_rows == db_rows and widths_ok
+            self.log_test(
+                "Large Excel Export",
+                success,
+                f"{exported_rows} rows exported and read back" if success
+                else f"Exported {exported_rows} rows, database has {db_rows}, headers {headers}, widths {widths}"
+            )
+        except Exception as e:
+            self.log_test("Large Excel Export", False, f"Error: {e}")
     
-    for test_name, success, message in results:
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status}: {test_name} - {message}")
+    def test_streaming_csv_row_count(self):
+        """Parse the CSV export incrementally as it streams and compare its row count with the database"""
+        print("\n5️⃣ Testing Streaming CSV Export")
+        try:
+            started = time.perf_counter()
+            with self.session.get(f"{API_BASE}/export?format=csv", stream=True, timeout=300) as response:
+                if response.status_code != 200:
+                    self.log_test("Streaming CSV Export", False, f"Export failed: {response.status_code}")
+                    return
+                
+                # csv.reader pulls one line at a time, so quoted fields spanning lines still parse
+                response.encoding = 'utf-8'
+                lines = response.iter_lines(chunk_size=64 * 1024, decode_unicode=True)
+                reader = csv.reader(lines)
+                headers = next(reader, None)
+                first_byte = time.perf_counter() - started
+                
+                exported_rows = 0
+                malformed_rows = 0
+                for row in reader:
+                    exported_rows += 1
+                    if len(row) != len(headers):
+                        malformed_rows += 1
+            elapsed = time.perf_counter() - started
+            print(f"   ✅ Streamed {exported_rows} rows, first row after {first_byte * 1000:.0f}ms, done in {elapsed:.2f}s")
+            
+            db_rows = self.count_transactions()
+            print(f"   ✅ Database transactions: {db_rows}")
+            
+            expected_headers = ['Date', 'Description', 'Amount', 'Category', 'Subcategory', 'Account', 'Type']
+            success = headers == expected_headers and malformed_rows == 0 and exported_rows == db_rows
+            self.log_test(
+                "Streaming CSV Export",
+                success,
+                f"{exported_rows} streamed rows match the database" if success
+                else f"Streamed {exported_rows} rows ({malformed_rows} malformed), database has {db_rows}, headers {headers}"
+            )
+        except Exception as e:
+            self.log_test("Streaming CSV Export", False, f"Error: {e}")
     
-    print(f"\n🎯 Results: {passed}/{total} tests passed ({(passed/total*100):.1f}%)")
+    def read_columnar_export(self, export_format):
+        """Download a parquet or arrow export and load it with pyarrow"""
+        import pyarrow.ipc
+        import pyarrow.parquet
+        
+        response = self.session.get(f"{API_BASE}/export?format={export_format}", timeout=300)
+        if response.status_code != 200:
+            raise RuntimeError(f"Export failed: {response.status_code}")
+        if export_format == 'parquet':
+            return pyarrow.parquet.read_table(pyarrow.BufferReader(response.content))
+        return pyarrow.ipc.open_stream(response.content).read_all()
+    
+    def test_columnar_export_round_trip(self):
+        """Check that the parquet and arrow exports carry the same rows as the CSV export"""
+        print("\n7️⃣ Testing Columnar Export Round Trip")
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.log_test("Columnar Export Round Trip", False, "pyarrow is not installed (pip install pyarrow)")
+            return
+        try:
+            csv_response = self.session.get(f"{API_BASE}/export?format=csv", timeout=300)
+            if csv_response.status_code != 200:
+                self.log_test("Columnar Export Round Trip", False, f"CSV export failed: {csv_response.status_code}")
+                return
+            csv_rows = list(csv.DictReader(StringIO(csv_response.text)))
+            
+            # Dates are left out: the CSV has them as server-locale display strings
+            def from_csv(row):
+                return (row['Description'], round(float(row['Amount']), 2), row['Category'],
+                        row['Subcategory'] or None, row['Account'], row['Type'])
+            expected = [from_csv(row) for row in csv_rows]
+            
+            problems = []
+            for export_format in ('parquet', 'arrow'):
+                table = self.read_columnar_export(export_format)
+                types = {field.name: str(field.type) for field in table.schema}
+                print(f"   ✅ {export_format}: {table.num_rows} rows, schema {types}")
+                
+                if not types.get('date', '').startswith('timestamp') or types.get('amount') != 'double':
+                    problems.append(f"{export_format} column types {types}")
+                if table.column('date').null_count:
+                    problems.append(f"{export_format} has null dates")
+                
+                columns = table.to_pydict()
+                actual = [
+                    (description, round(amount, 2), category, subcategory, account, kind)
+                    for description, amount, category, subcategory, account, kind in zip(
+                        columns['description'], columns['amount'], columns['category'],
+                        columns['subcategory'], columns['account'], columns['type'])
+                ]
+                # Both exports read newest first, so rows line up one to one
+                if actual != expected:
+                    mismatched = sum(1 for a, b in zip(actual, expected) if a != b)
+                    problems.append(f"{export_format} has {len(actual)} rows vs {len(expected)} in CSV, "
+                                    f"{mismatched} differ")
+            
+            self.log_test(
+                "Columnar Export Round Trip",
+                not problems,
+                f"parquet and arrow match {len(expected)} CSV rows" if not problems else '; '.join(problems)
+            )
+        except Exception as e:
+            self.log_test("Columnar Export Round Trip", False, f"Error: {e}")
     
-    if passed == total:
-        print("🎉 All export functionality tests PASSED!")
-        return True
-    else:
-        print("⚠️ Some export functionality tests FAILED!")
-        return False
+    def test_filtered_export(self):
+        """Check that export filters match GET /api/transactions with the same filters"""
+        print("\n8️⃣ Testing Filtered Export")
+        try:
+            first_page = next(iter_pages(self.session, '/transactions', limit=1), [])
+            if not first_page:
+                self.log_test("Filtered Export", False, "No transactions to filter")
+                return
+            newest = first_page[0]
+            
+            # The month of the newest transaction, plus its category and account on their own
+            month_start = newest['date'][:7] + '-01T00:00:00.000Z'
+            filter_sets = [
+                {'startDate': month_start, 'endDate': newest['date']},
+                {'categoryId': newest['categoryId']},
+                {'accountId': newest['accountId'], 'search': newest['description'][:4]},
+            ]
+            
+            problems = []
+            for filters in filter_sets:
+                api_rows = sum(len(page) for page in iter_pages(self.session, '/transactions', limit=200, **filters))
+                response = self.session.get(f"{API_BASE}/export", params={'format': 'csv', **filters}, timeout=300)
+                if response.status_code != 200:
+                    problems.append(f"{filters}: HTTP {response.status_code}")
+                    continue
+                export_rows = len(list(csv.DictReader(StringIO(response.text))))
+                print(f"   ✅ {filters}: {export_rows} exported, {api_rows} listed")
+                if export_rows != api_rows or export_rows == 0:
+                    problems.append(f"{filters}: exported {export_rows}, listed {api_rows}")
+            
+            invalid = self.session.get(f"{API_BASE}/export", params={'startDate': 'not-a-date'}, timeout=30)
+            if invalid.status_code != 400:
+                problems.append(f"invalid startDate returned {invalid.status_code}")
+            
+            self.log_test(
+                "Filtered Export",
+                not problems,
+                f"{len(filter_sets)} filter sets match the transactions listing" if not problems else '; '.join(problems)
+            )
+        except Exception as e:
+            self.log_test("Filtered Export", False, f"Error: {e}")
+    
+    def test_compressed_export(self):
+        """Check gzip and deflate CSV exports decode to the uncompressed body"""
+        print("\n9️⃣ Testing Compressed Export")
+        try:
+            plain = self.session.get(f"{API_BASE}/export?format=csv",
+                                     headers={'Accept-Encoding': 'identity'}, timeout=300)
+            if plain.status_code != 200 or plain.headers.get('Content-Encoding'):
+                self.log_test("Compressed Export", False,
+                              f"Identity export: HTTP {plain.status_code}, encoding {plain.headers.get('Content-Encoding')}")
+                return
+            
+            problems = []
+            for encoding in ('gzip', 'deflate'):
+                with self.session.get(f"{API_BASE}/export?format=csv", headers={'Accept-Encoding': encoding},
+                                      stream=True, timeout=300) as response:
+                    raw = response.raw.read(decode_content=False)
+                    served = response.headers.get('Content-Encoding')
+                decoded = zlib.decompress(raw, 16 + zlib.MAX_WBITS if encoding == 'gzip' else zlib.MAX_WBITS)
+                ratio = len(plain.content) / len(raw) if raw else 0
+                print(f"   ✅ {encoding}: {len(raw):,} bytes on the wire vs {len(plain.content):,} ({ratio:.1f}x)")
+                if served != encoding:
+                    problems.append(f"asked for {encoding}, got {served}")
+                elif decoded != plain.content:
+                    problems.append(f"{encoding} body does not decode to the CSV export")
+            
+            self.log_test(
+                "Compressed Export",
+                not problems,
+                "gzip and deflate bodies match the uncompressed CSV" if not problems else '; '.join(problems)
+            )
+        except Exception as e:
+            self.log_test("Compressed Export", False, f"Error: {e}")
+    
+    def test_export_job_lifecycle(self):
+        """Queue a background export, poll it to completion, then download it in two resumed halves"""
+        print("\n🔟 Testing Background Export Job")
+        try:
+            response = self.session.post(f"{API_BASE}/exports", json={'format': 'csv'}, timeout=30)
+            if response.status_code != 202:
+                self.log_test("Export Job Lifecycle", False, f"Enqueue failed: HTTP {response.status_code}: {response.text}")
+                return
+            job = response.json()['data']
+            print(f"   ✅ Queued job {job['id']} ({job['status']})")
+            
+            # Poll until the job finishes; progress must never go backwards
+            problems = []
+            deadline = time.monotonic() + EXPORT_JOB_TIMEOUT
+            last_progress = 0
+            while job['status'] in ('queued', 'running'):
+                if time.monotonic() > deadline:
+                    self.log_test("Export Job Lifecycle", False, f"Job still {job['status']} after {EXPORT_JOB_TIMEOUT}s")
+                    return
+                time.sleep(0.5)
+                job = self.session.get(f"{API_BASE}/exports/{job['id']}", timeout=30).json()['data']
+                if job['progress'] < last_progress:
+                    problems.append(f"progress went from {last_progress} to {job['progress']}")
+                last_progress = job['progress']
+            print(f"   ✅ Job {job['status']}: {job['rowsWritten']}/{job['totalRows']} rows, {job['bytes']} bytes")
+            if job['status'] != 'completed':
+                self.log_test("Export Job Lifecycle", False, f"Job {job['status']}: {job.get('error')}")
+                return
+            if job['rowsWritten'] != job['totalRows'] or job['progress'] != 1:
+                problems.append(f"finished at {job['rowsWritten']}/{job['totalRows']} rows, progress {job['progress']}")
+            
+            download_url = f"{BASE_URL}{job['downloadUrl']}"
+            identity = {'Accept-Encoding': 'identity'}
+            full = self.session.get(download_url, headers=identity, timeout=300)
+            size = len(full.content)
+            if full.status_code != 200 or full.headers.get('Accept-Ranges') != 'bytes' or size != job['bytes']:
+                problems.append(f"full download: HTTP {full.status_code}, {size} bytes, Accept-Ranges {full.headers.get('Accept-Ranges')}")
+            
+            # An interrupted download: take the first half, then resume from where it stopped
+            half = size // 2
+            first = self.session.get(download_url, headers={**identity, 'Range': f"bytes=0-{half - 1}"}, timeout=300)
+            resumed = self.session.get(download_url, timeout=300, headers={
+                **identity, 'Range': f"bytes={half}-", 'If-Range': full.headers.get('ETag', '')})
+            for part, expected_range in ((first, f"bytes 0-{half - 1}/{size}"), (resumed, f"bytes {half}-{size - 1}/{size}")):
+                if part.status_code != 206 or part.headers.get('Content-Range') != expected_range:
+                    problems.append(f"range request: HTTP {part.status_code}, Content-Range {part.headers.get('Content-Range')}, "
+                                    f"expected {expected_range}")
+            if first.content + resumed.content != full.content:
+                problems.append("resumed halves do not join into the full file")
+            print(f"   ✅ Downloaded {len(first.content)} + {len(resumed.content)} of {size} bytes")
+            
+            unsatisfiable = self.session.get(download_url, headers={**identity, 'Range': f"bytes={size}-"}, timeout=30)
+            if unsatisfiable.status_code != 416:
+                problems.append(f"range past the end returned {unsatisfiable.status_code}")
+            
+            exported_rows = len(list(csv.reader(StringIO(full.content.decode('utf-8'))))) - 1
+            if exported_rows != job['totalRows']:
+                problems.append(f"file has {exported_rows} rows, job counted {job['totalRows']}")
+            
+            self.log_test(
+                "Export Job Lifecycle",
+                not problems,
+                f"Job exported {exported_rows} rows and resumed download matches" if not problems else '; '.join(problems)
+            )
+        except Exception as e:
+            self.log_test("Export Job Lifecycle", False, f"Error: {e}")
+    
+    def checks(self):
+        """Independent checks for a full export run"""
+        return [
+            self.test_csv_export,
+            self.test_excel_export,
+            self.test_default_format,
+            self.test_data_integrity,
+            self.test_streaming_csv_row_count,
+            self.test_large_excel_export,
+            self.test_columnar_export_round_trip,
+            self.test_filtered_export,
+            self.test_compressed_export,
+            self.test_export_job_lifecycle
+        ]
+    
+    def print_recommendations(self, passed, failed, critical_failed):
+        """Print the export results line"""
+        total = passed + failed
+        print(f"\n🎯 Results: {passed}/{total} tests passed ({(passed/total*100) if total else 0:.1f}%)")
+        
+        if failed == 0:
+            print("🎉 All export functionality tests PASSED!")
+        else:
+            print("⚠️ Some export functionality tests FAILED!")
+
+def test_export_functionality():
+    """Run focused export functionality tests"""
+    _, failed, _ = ExportFunctionalityTester().run_all_tests()
+    return failed == 0
 
 if __name__ == "__main__":
     success = test_export_functionality()
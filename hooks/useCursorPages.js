@@ -0,0 +1,69 @@
+"use client";
+
+import { useState, useEffect, useCallback, useRef } from "react";
+
+// Fetch one page of a cursor-paginated API endpoint; nextCursor is null on the last page
+export async function fetchPage(url, { limit, cursor } = {}) {
+  const params = new URLSearchParams();
+  if (limit) params.set("limit", limit);
+  if (cursor) params.set("cursor", cursor);
+  const query = params.toString();
+  const separator = url.includes("?") ? "&" : "?";
+
+  const response = await fetch(query ? `${url}${separator}${query}` : url);
+  const page = await response.json();
+  if (!response.ok || !page.success) {
+    throw new Error(page.error || `Request failed with status ${response.status}`);
+  }
+  return { data: page.data, nextCursor: page.nextCursor };
+}
+
+// Rows of a cursor-paginated endpoint: the first page on mount, further pages
+// only when loadMore is called, so a long history is never fetched up front
+export function useCursorPages(url, { limit } = {}) {
+  const [rows, setRows] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Bumped by reload, so pages requested for the old list are dropped
+  const generation = useRef(0);
+
+  const reload = useCallback(async () => {
+    const current = ++generation.current;
+    try {
+      const page = await fetchPage(url, { limit });
+      if (current !== generation.current) return;
+      setRows(page.data);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error(`Failed to fetch ${url}:`, error);
+      if (current !== generation.current) return;
+      setRows([]);
+      setNextCursor(null);
+    } finally {
+      if (current === generation.current) setLoading(false);
+    }
+  }, [url, limit]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    const current = generation.current;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(url, { limit, cursor: nextCursor });
+      if (current !== generation.current) return;
+      setRows(prevRows => [...prevRows, ...page.data]);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error(`Failed to fetch more of ${url}:`, error);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [url, limit, nextCursor, loadingMore]);
+
+  useEffect(() => {
+    reload();
+  }, [reload]);
+
+  return { rows, hasMore: nextCursor !== null, loading, loadingMore, loadMore, reload };
+}
@@ -0,0 +1,93 @@
+import { auth } from '@clerk/nextjs/server'
+import { prisma } from '@/lib/prisma'
+import { LruCache } from '@/lib/cache'
+
+/**
+ * Shared user resolution for the API routes.
+ *
+ * Resolved users are cached in-process by Clerk ID, so the burst of API calls
+ * behind one page load costs one user lookup instead of one per call.
+ * Anything that changes a user row must call invalidateUser.
+ */
+
+// Long enough to cover a page load's requests, short enough that a change made
+// by another server process shows up quickly
+const USER_CACHE_TTL_MS = 60 * 1000
+const USER_CACHE_SIZE = 1000
+
+// Key for the development user returned while Clerk auth is disabled
+const DEMO_KEY = 'demo:first-user'
+
+const globalForAuth = globalThis
+const userCache = globalForAuth.userCache || new LruCache({ max: USER_CACHE_SIZE, ttlMs: USER_CACHE_TTL_MS })
+if (process.env.NODE_ENV !== 'production') globalForAuth.userCache = userCache
+
+/**
+ * Find or create the database user for a Clerk user ID
+ * @param {string} userId - Clerk user ID
+ * @returns {Promise<object>} - User row
+ */
+export const resolveUser = (userId) => userCache.getOrLoad(`clerk:${userId}`, async () => {
+  let user = await prisma.user.findUnique({
+    where: { clerkId: userId }
+  })
+
+  if (!user) {
+    // Create user if doesn't exist
+    user = await prisma.user.create({
+      data: {
+        clerkId: userId,
+        email: '', // Will be updated when user provides it
+      }
+    })
+  }
+
+  return user
+})
+
+/**
+ * The signed-in user, or null when the request is not authenticated
+ * @returns {Promise<object|null>} - User row
+ */
+export async function getAuthenticatedUser() {
+  const { userId } = auth()
+  if (!userId) {
+    return null
+  }
+  return resolveUser(userId)
+}
+
+/**
+ * Development stand-in for getAuthenticatedUser: the first user, or a demo user
+ * @returns {Promise<object>} - User row
+ */
+export const getDemoUser = () => userCache.getOrLoad(DEMO_KEY, async () => {
+  let user = await prisma.user.findFirst()
+
+  if (!user) {
+    // Create a demo user if none exists
+    user = await prisma.user.create({
+      data: {
+        clerkId: 'demo-user-001',
+        email: 'demo@example.com',
+      }
+    })
+  }
+
+  return user
+})
+
+/**
+ * Drop cached copies of a user after it changes
+ * @param {string} userId - Database user id
+ */
+export const invalidateUser = (userId) => {
+  // Pending lookups are dropped too, since they may have read the old row
+  userCache.deleteWhere(value => value instanceof Promise || value.id === userId)
+}
+
+/**
+ * Cache hit/miss counters, for diagnostics
+ * @returns {{ hits: number, misses: number, size: number }} - Counters
+ */
+export const userCacheStats = () => ({ hits: userCache.hits, misses: userCache.misses, size: userCache.size })
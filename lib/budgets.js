@@ -0,0 +1,53 @@
+import { Prisma } from '@prisma/client'
+import { prisma } from '@/lib/prisma'
+
+/**
+ * Budget progress, shared by the budgets listing and the dashboard.
+ */
+
+/**
+ * Spent per budget in one grouped query: expense transactions inside each
+ * budget's own period, restricted to its category when it has one
+ * @param {string} userId - Owner of the budgets
+ * @param {Array<string>} budgetIds - Budgets to total
+ * @returns {Promise<Map<string, number>>} - Budget id to amount spent; budgets with nothing spent are absent
+ */
+export async function spentByBudget(userId, budgetIds) {
+  const spent = new Map()
+  if (budgetIds.length === 0) {
+    return spent
+  }
+  const rows = await prisma.$queryRaw`
+    SELECT b."id" AS "budgetId", COALESCE(SUM(ABS(t."amount")), 0) AS "spent"
+    FROM "budgets" b
+    JOIN "transactions" t
+      ON t."userId" = b."userId"
+      AND t."date" >= b."startDate"
+      AND t."date" <= b."endDate"
+      AND (b."categoryId" IS NULL OR t."categoryId" = b."categoryId")
+    JOIN "categories" c ON c."id" = t."categoryId" AND c."type" = 'EXPENSE'
+    WHERE b."userId" = ${userId} AND b."id" IN (${Prisma.join(budgetIds)})
+    GROUP BY b."id"
+  `
+  rows.forEach(row => spent.set(row.budgetId, Number(row.spent)))
+  return spent
+}
+
+/**
+ * A budget with its spent, progress (capped at 100), remaining and status
+ * @param {object} budget - Row with amount and warningThreshold
+ * @param {number} spent - From spentByBudget
+ * @returns {object} - The budget plus progress fields
+ */
+export const withProgress = (budget, spent = 0) => {
+  const progress = budget.amount > 0 ? (spent / budget.amount) * 100 : 0
+  const remaining = Math.max(0, budget.amount - spent)
+
+  return {
+    ...budget,
+    spent,
+    progress: Math.min(100, progress),
+    remaining,
+    status: progress >= 100 ? 'exceeded' : progress >= budget.warningThreshold * 100 ? 'warning' : 'on-track'
+  }
+}
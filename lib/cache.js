@@ -0,0 +1,92 @@
+/**
+ * Small in-process LRU cache with a per-entry time to live.
+ *
+ * A Map keeps insertion order, so re-inserting on every hit makes the first
+ * key the least recently used one. Entries expire lazily on read.
+ */
+
+export class LruCache {
+  /**
+   * @param {{ max?: number, ttlMs?: number }} options - Entry limit and lifetime
+   */
+  constructor({ max = 1000, ttlMs = 60 * 1000 } = {}) {
+    this.max = max
+    this.ttlMs = ttlMs
+    this.entries = new Map()
+    this.hits = 0
+    this.misses = 0
+  }
+
+  get(key) {
+    const entry = this.entries.get(key)
+    if (!entry || entry.expiresAt <= Date.now()) {
+      if (entry) this.entries.delete(key)
+      this.misses++
+      return undefined
+    }
+    // Move to the most recently used end
+    this.entries.delete(key)
+    this.entries.set(key, entry)
+    this.hits++
+    return entry.value
+  }
+
+  set(key, value, ttlMs = this.ttlMs) {
+    this.entries.delete(key)
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs })
+    while (this.entries.size > this.max) {
+      this.entries.delete(this.entries.keys().next().value)
+    }
+    return value
+  }
+
+  delete(key) {
+    return this.entries.delete(key)
+  }
+
+  /**
+   * Drop every entry whose value matches
+   * @param {Function} predicate - Called with (value, key)
+   */
+  deleteWhere(predicate) {
+    for (const [key, { value }] of this.entries) {
+      if (predicate(value, key)) this.entries.delete(key)
+    }
+  }
+
+  clear() {
+    this.entries.clear()
+  }
+
+  get size() {
+    return this.entries.size
+  }
+
+  /**
+   * Cached value for a key, loading (once, even under concurrent calls) on a miss
+   * @param {string} key - Cache key
+   * @param {Function} load - Async loader; a null/undefined result is not cached
+   * @returns {Promise<*>} - Cached or freshly loaded value
+   */
+  async getOrLoad(key, load) {
+    const cached = this.get(key)
+    if (cached !== undefined) {
+      return cached
+    }
+    // The pending promise is cached so concurrent misses share one load
+    const pending = Promise.resolve().then(load)
+    this.set(key, pending)
+    try {
+      const value = await pending
+      if (value === null || value === undefined) {
+        this.delete(key)
+      } else if (this.entries.get(key)?.value === pending) {
+        this.set(key, value)
+      }
+      return value
+    } catch (error) {
+      if (this.entries.get(key)?.value === pending) this.delete(key)
+      throw error
+    }
+  }
+}
@@ -0,0 +1,97 @@
+/**
+ * Incremental CSV parsing for uploads.
+ *
+ * Records are yielded as soon as they are complete, so a large file is never
+ * held in memory as one string. Quoted fields may contain commas, doubled
+ * quotes and line breaks, and may be split across chunk boundaries.
+ */
+
+/**
+ * Parse a byte stream as CSV
+ * @param {ReadableStream<Uint8Array>} stream - Upload body
+ * @yields {{ line: number, fields: Array<string> }} - One record and the line it starts on
+ */
+export async function* parseCsvStream(stream) {
+  const decoder = new TextDecoder()
+  const reader = stream.getReader()
+
+  let field = ''
+  let fields = []
+  let inQuotes = false
+  let quotePending = false // saw a quote inside a quoted field; next char decides
+  let line = 1
+  let recordLine = 1
+  let sawData = false
+
+  const endRecord = () => {
+    fields.push(field)
+    const record = { line: recordLine, fields }
+    field = ''
+    fields = []
+    sawData = false
+    return record
+  }
+
+  try {
+    while (true) {
+      const { value, done } = await reader.read()
+      const text = done ? decoder.decode() : decoder.decode(value, { stream: true })
+      const records = []
+
+      for (let i = 0; i < text.length; i++) {
+        const char = text[i]
+
+        if (quotePending) {
+          quotePending = false
+          if (char === '"') {
+            field += '"'
+            continue
+          }
+          inQuotes = false
+        }
+
+        if (inQuotes) {
+          if (char === '"') {
+            quotePending = true
+          } else {
+            if (char === '\n') line++
+            field += char
+          }
+          continue
+        }
+
+        if (char === '"' && field === '') {
+          inQuotes = true
+          sawData = true
+        } else if (char === ',') {
+          fields.push(field)
+          field = ''
+          sawData = true
+        } else if (char === '\n') {
+          // Blank lines are skipped rather than yielded as empty records
+          if (sawData || field !== '') {
+            records.push(endRecord())
+          }
+          line++
+          recordLine = line
+        } else if (char !== '\r') {
+          field += char
+          sawData = true
+        }
+      }
+
+      for (const record of records) {
+        yield record
+      }
+
+      if (done) {
+        if (sawData || field !== '') {
+          yield endRecord()
+        }
+        return
+      }
+    }
+  } finally {
+    reader.releaseLock()
+  }
+}
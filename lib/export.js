@@ -0,0 +1,370 @@
+import { PassThrough, Readable } from 'node:stream'
+import ExcelJS from 'exceljs'
+import { Table, TimestampMillisecond, Float64, Utf8, RecordBatchStreamWriter, vectorFromArray } from 'apache-arrow'
+import { ParquetSchema, ParquetWriter } from '@dsnp/parquetjs'
+import { prisma } from '@/lib/prisma'
+import { TRANSACTION_ORDER, afterCursor } from '@/lib/pagination'
+
+/**
+ * Batched, streaming transaction export.
+ *
+ * Rows are read from the database in keyset-ordered batches and written out
+ * as they arrive, so memory stays bounded by the batch size however large
+ * the ledger is, and the first bytes go out before the last batch is read.
+ */
+
+export const EXPORT_BATCH_SIZE = 1000
+
+// XLSX column widths are estimated from the first batch instead of every row
+const MAX_COLUMN_WIDTH = 50
+
+export const EXPORT_HEADERS = ['Date', 'Description', 'Amount', 'Category', 'Subcategory', 'Account', 'Type']
+
+// Only the columns the export writes, instead of full relation rows
+const EXPORT_SELECT = {
+  id: true,
+  date: true,
+  description: true,
+  amount: true,
+  account: { select: { name: true } },
+  category: { select: { name: true, type: true } },
+  subcategory: { select: { name: true } }
+}
+
+/**
+ * Flatten a transaction into an export row keyed by EXPORT_HEADERS
+ * @param {object} t - Transaction selected with EXPORT_SELECT
+ * @returns {object} - Export row
+ */
+export const toExportRow = (t) => ({
+  Date: new Date(t.date).toLocaleDateString(),
+  Description: t.description,
+  Amount: t.amount,
+  Category: t.category.name,
+  Subcategory: t.subcategory?.name || '',
+  Account: t.account.name,
+  Type: t.category.type
+})
+
+/**
+ * Read a user's transactions batch by batch, newest first
+ * @param {object} where - Prisma filter, at least { userId }
+ * @param {number} batchSize - Rows per query
+ * @param {Function} toRow - Maps a selected transaction to an output row
+ * @param {Function} [onBatch] - Called with the row count once a batch has been consumed
+ * @yields {Array<object>} - Export rows
+ */
+export async function* exportBatches(where, batchSize = EXPORT_BATCH_SIZE, toRow = toExportRow, onBatch) {
+  let position = null
+
+  while (true) {
+    const transactions = await prisma.transaction.findMany({
+      where: position ? { AND: [where, afterCursor(position)] } : where,
+      select: EXPORT_SELECT,
+      orderBy: TRANSACTION_ORDER,
+      take: batchSize
+    })
+    if (transactions.length === 0) {
+      return
+    }
+
+    yield transactions.map(toRow)
+    onBatch?.(transactions.length)
+
+    if (transactions.length < batchSize) {
+      return
+    }
+    const last = transactions[transactions.length - 1]
+    position = { date: last.date, id: last.id }
+  }
+}
+
+/**
+ * Quote a CSV field when it contains a delimiter, quote or line break
+ * @param {*} value - Field value
+ * @returns {string} - CSV-safe field
+ */
+export const csvField = (value) => {
+  const text = value === null || value === undefined ? '' : String(value)
+  if (/[",\r\n]/.test(text)) {
+    return `"${text.replace(/"/g, '""')}"`
+  }
+  return text
+}
+
+const csvLine = (values) => values.map(csvField).join(',') + '\n'
+
+/**
+ * Stream a CSV export; each pull reads and encodes one batch
+ * @param {object} where - Prisma filter, at least { userId }
+ * @param {Function} [onBatch] - Progress callback, see exportBatches
+ * @returns {ReadableStream<Uint8Array>} - CSV body
+ */
+export const csvExportStream = (where, onBatch) => {
+  const encoder = new TextEncoder()
+  const batches = exportBatches(where, EXPORT_BATCH_SIZE, toExportRow, onBatch)
+
+  return new ReadableStream({
+    start(controller) {
+      controller.enqueue(encoder.encode(csvLine(EXPORT_HEADERS)))
+    },
+    async pull(controller) {
+      try {
+        const { value: rows, done } = await batches.next()
+        if (done) {
+          controller.close()
+          return
+        }
+        controller.enqueue(encoder.encode(rows.map(row => csvLine(EXPORT_HEADERS.map(header => row[header]))).join('')))
+      } catch (error) {
+        console.error('Error streaming export:', error)
+        controller.error(error)
+      }
+    },
+    async cancel() {
+      await batches.return()
+    }
+  })
+}
+
+/**
+ * Pick a response encoding from an Accept-Encoding header
+ * @param {string|null} header - Accept-Encoding value
+ * @returns {'gzip'|'deflate'|null} - Encoding to use, or null for identity
+ */
+export const negotiateEncoding = (header) => {
+  const accepted = new Map()
+  for (const part of (header || '').split(',')) {
+    const [name, ...params] = part.trim().toLowerCase().split(';')
+    const q = params.map(p => p.trim()).find(p => p.startsWith('q='))
+    accepted.set(name, q ? parseFloat(q.slice(2)) : 1)
+  }
+  return ['gzip', 'deflate'].find(name => accepted.get(name) > 0) || null
+}
+
+/**
+ * Compress a byte stream as it is read
+ * @param {ReadableStream<Uint8Array>} stream - Response body
+ * @param {'gzip'|'deflate'|null} encoding - From negotiateEncoding
+ * @returns {ReadableStream<Uint8Array>} - Encoded body (the input when encoding is null)
+ */
+export const compressStream = (stream, encoding) => (
+  encoding ? stream.pipeThrough(new CompressionStream(encoding)) : stream
+)
+
+/**
+ * Column widths (in characters) that fit a sample of export rows
+ * @param {Array<object>} sample - Export rows to measure
+ * @returns {Array<number>} - Width per EXPORT_HEADERS entry
+ */
+export const columnWidths = (sample) => EXPORT_HEADERS.map(header => {
+  let width = header.length
+  for (const row of sample) {
+    width = Math.max(width, String(row[header] ?? '').length)
+  }
+  return Math.min(width + 2, MAX_COLUMN_WIDTH)
+})
+
+// Resolves once the stream wants more data, or once it has gone away
+const drained = (stream) => new Promise(resolve => {
+  const done = () => {
+    stream.off('drain', done)
+    stream.off('close', done)
+    resolve()
+  }
+  stream.on('drain', done)
+  stream.on('close', done)
+})
+
+async function writeXlsx(where, output, onBatch) {
+  // Inline strings and no styles keep the writer from accumulating state per row
+  const workbook = new ExcelJS.stream.xlsx.WorkbookWriter({
+    stream: output,
+    useStyles: false,
+    useSharedStrings: false
+  })
+  const worksheet = workbook.addWorksheet('Transactions')
+  const setColumns = (sample) => {
+    const widths = columnWidths(sample)
+    worksheet.columns = EXPORT_HEADERS.map((header, i) => ({ header, key: header, width: widths[i] }))
+  }
+
+  let first = true
+  for await (const rows of exportBatches(where, EXPORT_BATCH_SIZE, toExportRow, onBatch)) {
+    if (first) {
+      setColumns(rows)
+      first = false
+    }
+    for (const row of rows) {
+      worksheet.addRow(row).commit()
+    }
+    // Wait for the client to catch up so unsent rows do not pile up in memory
+    if (output.writableNeedDrain) {
+      await drained(output)
+    }
+    if (output.destroyed) {
+      return
+    }
+  }
+  if (first) {
+    setColumns([])
+  }
+
+  worksheet.commit()
+  await workbook.commit()
+}
+
+/**
+ * Stream an XLSX export, committing rows to the zip as each batch is read
+ * @param {object} where - Prisma filter, at least { userId }
+ * @param {Function} [onBatch] - Progress callback, see exportBatches
+ * @returns {ReadableStream<Uint8Array>} - XLSX body
+ */
+export const xlsxExportStream = (where, onBatch) => {
+  const output = new PassThrough()
+  writeXlsx(where, output, onBatch).catch(error => {
+    console.error('Error streaming export:', error)
+    output.destroy(error)
+  })
+  return Readable.toWeb(output)
+}
+
+/*
+ * Columnar formats keep real types (timestamp date, float amount, nullable
+ * subcategory) instead of the display strings the CSV and XLSX exports use
+ */
+
+export const COLUMNAR_FIELDS = ['date', 'description', 'amount', 'category', 'subcategory', 'account', 'type']
+
+// Rows per Parquet row group; each group is compressed and flushed as a unit
+const PARQUET_ROW_GROUP_SIZE = 10000
+
+const toColumnarRow = (t) => ({
+  date: new Date(t.date),
+  description: t.description,
+  amount: t.amount,
+  category: t.category.name,
+  subcategory: t.subcategory?.name ?? null,
+  account: t.account.name,
+  type: t.category.type
+})
+
+const PARQUET_SCHEMA = new ParquetSchema({
+  date: { type: 'TIMESTAMP_MILLIS', compression: 'SNAPPY' },
+  description: { type: 'UTF8', compression: 'SNAPPY' },
+  amount: { type: 'DOUBLE', compression: 'SNAPPY' },
+  category: { type: 'UTF8', compression: 'SNAPPY' },
+  subcategory: { type: 'UTF8', optional: true, compression: 'SNAPPY' },
+  account: { type: 'UTF8', compression: 'SNAPPY' },
+  type: { type: 'UTF8', compression: 'SNAPPY' }
+})
+
+async function writeParquet(where, output, onBatch) {
+  const writer = await ParquetWriter.openStream(PARQUET_SCHEMA, output, { rowGroupSize: PARQUET_ROW_GROUP_SIZE })
+  for await (const rows of exportBatches(where, EXPORT_BATCH_SIZE, toColumnarRow, onBatch)) {
+    for (const row of rows) {
+      // parquetjs treats a null optional field as absent
+      await writer.appendRow(row.subcategory === null ? { ...row, subcategory: undefined } : row)
+    }
+    if (output.writableNeedDrain) {
+      await drained(output)
+    }
+    if (output.destroyed) {
+      return
+    }
+  }
+  await writer.close()
+}
+
+/**
+ * Stream a Parquet export, one compressed row group at a time
+ * @param {object} where - Prisma filter, at least { userId }
+ * @param {Function} [onBatch] - Progress callback, see exportBatches
+ * @returns {ReadableStream<Uint8Array>} - Parquet body
+ */
+export const parquetExportStream = (where, onBatch) => {
+  const output = new PassThrough()
+  writeParquet(where, output, onBatch).catch(error => {
+    console.error('Error streaming export:', error)
+    output.destroy(error)
+  })
+  return Readable.toWeb(output)
+}
+
+const ARROW_TYPES = {
+  date: () => new TimestampMillisecond(),
+  description: () => new Utf8(),
+  amount: () => new Float64(),
+  category: () => new Utf8(),
+  subcategory: () => new Utf8(),
+  account: () => new Utf8(),
+  type: () => new Utf8()
+}
+
+const arrowTable = (rows) => {
+  const columns = {}
+  for (const field of COLUMNAR_FIELDS) {
+    columns[field] = vectorFromArray(rows.map(row => row[field]), ARROW_TYPES[field]())
+  }
+  return new Table(columns)
+}
+
+async function writeArrow(where, output, onBatch) {
+  const writer = new RecordBatchStreamWriter()
+  // The writer queues encoded bytes; copy them to the response as they come
+  const pump = (async () => {
+    for await (const chunk of writer) {
+      if (!output.write(chunk)) {
+        await drained(output)
+      }
+    }
+  })()
+
+  let empty = true
+  for await (const rows of exportBatches(where, EXPORT_BATCH_SIZE, toColumnarRow, onBatch)) {
+    arrowTable(rows).batches.forEach(batch => writer.write(batch))
+    empty = false
+    if (output.writableNeedDrain) {
+      await drained(output)
+    }
+    if (output.destroyed) {
+      writer.abort()
+      return
+    }
+  }
+  if (empty) {
+    // A zero-row batch still carries the schema, so readers get typed, empty columns
+    arrowTable([]).batches.forEach(batch => writer.write(batch))
+  }
+  // Writes the end-of-stream marker and ends the byte queue
+  writer.close()
+  await pump
+  output.end()
+}
+
+/**
+ * Stream an Arrow IPC export, one record batch per database batch
+ * @param {object} where - Prisma filter, at least { userId }
+ * @param {Function} [onBatch] - Progress callback, see exportBatches
+ * @returns {ReadableStream<Uint8Array>} - Arrow IPC stream body
+ */
+export const arrowExportStream = (where, onBatch) => {
+  const output = new PassThrough()
+  writeArrow(where, output, onBatch).catch(error => {
+    console.error('Error streaming export:', error)
+    output.destroy(error)
+  })
+  return Readable.toWeb(output)
+}
+
+// Format name -> body stream, content type and file extension
+export const EXPORT_FORMATS = {
+  csv: { stream: csvExportStream, contentType: 'text/csv', extension: 'csv' },
+  xlsx: {
+    stream: xlsxExportStream,
+    contentType: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    extension: 'xlsx'
+  },
+  parquet: { stream: parquetExportStream, contentType: 'application/vnd.apache.parquet', extension: 'parquet' },
+  arrow: { stream: arrowExportStream, contentType: 'application/vnd.apache.arrow.stream', extension: 'arrows' }
+}
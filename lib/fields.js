@@ -0,0 +1,162 @@
+/**
+ * Sparse field selection for the list endpoints.
+ *
+ * `fields=id,amount,category.name` names the columns a caller wants and
+ * `include=category` adds a relation with all of its listed columns; both are
+ * turned into a Prisma `select`, so unused columns and joins are never read or
+ * serialized. Without either parameter an endpoint returns its usual shape.
+ */
+
+/**
+ * What a model exposes to `fields` and `include`
+ * @typedef {object} SelectionSpec
+ * @property {Array<string>} scalars - Selectable columns
+ * @property {Object<string, Array<string>>} relations - Relation name to its selectable columns
+ * @property {Object<string, Array<string>>} [computed] - Derived field to the columns it is computed from
+ * @property {Array<string>} [required] - Columns the endpoint itself needs, e.g. for the page cursor
+ */
+
+const ACCOUNT_SUMMARY = ['id', 'name', 'type', 'balance', 'isDefault']
+const CATEGORY_SUMMARY = ['id', 'name', 'type']
+
+/** @type {SelectionSpec} */
+export const TRANSACTION_SELECTION = {
+  scalars: ['id', 'amount', 'description', 'date', 'accountId', 'categoryId', 'subcategoryId', 'createdAt', 'updatedAt'],
+  relations: {
+    account: ACCOUNT_SUMMARY,
+    category: CATEGORY_SUMMARY,
+    subcategory: ['id', 'name', 'categoryId']
+  },
+  // Keyset pagination encodes the last row's (date, id)
+  required: ['id', 'date']
+}
+
+/** @type {SelectionSpec} */
+export const ACCOUNT_SELECTION = {
+  scalars: ['id', 'name', 'type', 'balance', 'openingBalance', 'isDefault', 'createdAt', 'updatedAt'],
+  relations: {
+    _count: ['transactions']
+  }
+}
+
+/** @type {SelectionSpec} */
+export const BUDGET_SELECTION = {
+  scalars: [
+    'id', 'name', 'amount', 'period', 'categoryId', 'startDate', 'endDate', 'isActive',
+    'emailNotifications', 'warningThreshold', 'lastNotificationSent', 'createdAt', 'updatedAt'
+  ],
+  relations: {
+    category: CATEGORY_SUMMARY
+  },
+  computed: {
+    spent: ['id'],
+    progress: ['id', 'amount'],
+    remaining: ['id', 'amount'],
+    status: ['id', 'amount', 'warningThreshold']
+  }
+}
+
+/** @type {SelectionSpec} */
+export const INVESTMENT_SELECTION = {
+  scalars: [
+    'id', 'symbol', 'name', 'type', 'quantity', 'purchasePrice', 'currentPrice',
+    'investedAmount', 'currentValue', 'createdAt', 'updatedAt'
+  ],
+  relations: {},
+  computed: {
+    profitLoss: ['currentValue', 'investedAmount'],
+    profitLossPercent: ['currentValue', 'investedAmount'],
+    dayChange: ['currentPrice', 'purchasePrice'],
+    dayChangePercent: ['currentPrice', 'purchasePrice'],
+    status: ['currentValue', 'investedAmount']
+  }
+}
+
+const parseList = (value) => (value || '').split(',').map(item => item.trim()).filter(Boolean)
+
+const columnsSelect = (columns) => Object.fromEntries(columns.map(column => [column, true]))
+
+const unknown = (kind, name, allowed) => `Unknown ${kind} '${name}'; expected one of: ${allowed.join(', ')}`
+
+/**
+ * Read `fields` and `include` from the query
+ * @param {URLSearchParams} searchParams - Request query
+ * @param {SelectionSpec} spec - What the endpoint exposes
+ * @returns {{ select: object|null, fields: Set<string>|null, error: string|null }} -
+ *   Prisma select (null for the endpoint's default shape), the top-level keys to
+ *   return (null for all of them), and a message for unknown names
+ */
+export const parseSelection = (searchParams, spec) => {
+  const fields = parseList(searchParams.get('fields'))
+  const include = parseList(searchParams.get('include'))
+  if (fields.length === 0 && include.length === 0) {
+    return { select: null, fields: null, error: null }
+  }
+
+  const computed = spec.computed || {}
+  const relationNames = Object.keys(spec.relations)
+  const select = {}
+  const returned = new Set(['id'])
+
+  for (const name of include) {
+    if (!spec.relations[name]) {
+      return { select: null, fields: null, error: unknown('relation', name, relationNames) }
+    }
+    select[name] = { select: columnsSelect(spec.relations[name]) }
+    returned.add(name)
+  }
+
+  if (fields.length === 0) {
+    // include= alone: every column plus the named relations
+    Object.assign(select, columnsSelect(spec.scalars))
+  }
+
+  for (const field of fields) {
+    const [name, column, ...rest] = field.split('.')
+    if (column !== undefined) {
+      // relation.column
+      const columns = spec.relations[name]
+      if (!columns) {
+        return { select: null, fields: null, error: unknown('relation', name, relationNames) }
+      }
+      if (!columns.includes(column) || rest.length > 0) {
+        return { select: null, fields: null, error: unknown('field', field, columns.map(c => `${name}.${c}`)) }
+      }
+      if (!include.includes(name)) {
+        select[name] = select[name] || { select: {} }
+        select[name].select[column] = true
+      }
+    } else if (spec.scalars.includes(name)) {
+      select[name] = true
+    } else if (computed[name]) {
+      Object.assign(select, columnsSelect(computed[name]))
+    } else {
+      return { select: null, fields: null, error: unknown('field', name, [...spec.scalars, ...Object.keys(computed)]) }
+    }
+    returned.add(name)
+  }
+
+  // Always read the id, and whatever the endpoint needs to build its response
+  Object.assign(select, columnsSelect(['id', ...(spec.required || [])]))
+
+  return { select, fields: fields.length > 0 ? returned : null, error: null }
+}
+
+/**
+ * Whether the response should carry a (possibly computed) field
+ * @param {{ fields: Set<string>|null }} selection - From parseSelection
+ * @param {string} name - Field name
+ * @returns {boolean}
+ */
+export const wantsField = (selection, name) => !selection.fields || selection.fields.has(name)
+
+/**
+ * Drop the columns that were only read to compute or paginate
+ * @param {Array<object>} rows - Rows shaped by the select
+ * @param {{ fields: Set<string>|null }} selection - From parseSelection
+ * @returns {Array<object>} - Rows with just the requested keys
+ */
+export const pickFields = (rows, selection) => {
+  if (!selection.fields) return rows
+  return rows.map(row => Object.fromEntries(Object.entries(row).filter(([key]) => selection.fields.has(key))))
+}
@@ -0,0 +1,75 @@
+import { Prisma } from '@prisma/client'
+
+/**
+ * Transaction filters shared by the listing and export endpoints.
+ *
+ * Query parameters are turned into a Prisma `where` clause so the database
+ * does the filtering, using the (userId, ..., date, id) indexes.
+ */
+
+/**
+ * Build the `where` clause for a user's transactions from query parameters
+ * @param {string} userId - Owner of the transactions
+ * @param {URLSearchParams} searchParams - search, categoryId, subcategoryId, accountId, startDate, endDate
+ * @returns {object} - Prisma filter
+ */
+export const transactionWhere = (userId, searchParams) => {
+  const where = { userId }
+
+  const search = searchParams.get('search')
+  if (search) {
+    // SQLite's LIKE is already case-insensitive for ASCII; `mode` is not supported there
+    where.description = { contains: search }
+  }
+
+  for (const field of ['categoryId', 'subcategoryId', 'accountId']) {
+    const value = searchParams.get(field)
+    if (value) {
+      where[field] = value
+    }
+  }
+
+  const startDate = searchParams.get('startDate')
+  const endDate = searchParams.get('endDate')
+  if (startDate || endDate) {
+    where.date = {}
+    if (startDate) where.date.gte = new Date(startDate)
+    if (endDate) where.date.lte = new Date(endDate)
+  }
+
+  return where
+}
+
+/**
+ * Reject unparseable dates before they reach the query
+ * @param {URLSearchParams} searchParams - Request query
+ * @returns {string|null} - Error message, or null if the filters are valid
+ */
+export const invalidFilter = (searchParams) => {
+  for (const field of ['startDate', 'endDate']) {
+    const value = searchParams.get(field)
+    if (value && Number.isNaN(new Date(value).getTime())) {
+      return `Invalid ${field}`
+    }
+  }
+  return null
+}
+
+/**
+ * The same filter as SQL conditions on the transactions alias `t`, for raw
+ * queries; the description search is left to the caller
+ * @param {object} where - Result of transactionWhere()
+ * @returns {Array<Prisma.Sql>} - Conditions to AND together
+ */
+export const transactionWhereSql = (where) => {
+  const conditions = [Prisma.sql`t."userId" = ${where.userId}`]
+  for (const field of ['categoryId', 'subcategoryId', 'accountId']) {
+    if (where[field]) {
+      conditions.push(Prisma.sql`t.${Prisma.raw(`"${field}"`)} = ${where[field]}`)
+    }
+  }
+  // Prisma stores DateTime as epoch milliseconds on SQLite
+  if (where.date?.gte) conditions.push(Prisma.sql`t."date" >= ${where.date.gte.getTime()}`)
+  if (where.date?.lte) conditions.push(Prisma.sql`t."date" <= ${where.date.lte.getTime()}`)
+  return conditions
+}
@@ -0,0 +1,349 @@
+import { createHash } from 'node:crypto'
+import { prisma } from '@/lib/prisma'
+import { parseCsvStream } from '@/lib/csv'
+import { monthKey } from '@/lib/rollups'
+
+/**
+ * Bulk transaction import from bank statement CSVs.
+ *
+ * The upload is parsed record by record; account and category names resolve
+ * through maps loaded once per import, and valid rows are written with
+ * createMany in batches. Each batch commits in its own short database
+ * transaction together with its balance and monthly rollup changes, so SQLite
+ * is never locked for the length of an upload. Each row carries a fingerprint
+ * and a batch is checked against the unique fingerprint index in one query,
+ * so rows already imported (from an overlapping statement, or by an earlier
+ * attempt at the same upload that failed part way) are skipped.
+ */
+
+export const IMPORT_BATCH_SIZE = 1000
+export const MAX_REPORTED_ERRORS = 500
+
+/**
+ * An import that cannot start (bad or empty file), as opposed to bad rows
+ */
+export class ImportError extends Error {}
+
+// Accepted header names per field, compared case-insensitively
+const COLUMN_ALIASES = {
+  date: ['date', 'transaction date', 'posting date', 'value date'],
+  description: ['description', 'transaction description', 'narration', 'details', 'memo'],
+  amount: ['amount', 'transaction amount'],
+  debit: ['debit', 'debit amount', 'withdrawal', 'withdrawal amount'],
+  credit: ['credit', 'credit amount', 'deposit', 'deposit amount'],
+  account: ['account', 'account name'],
+  category: ['category'],
+  subcategory: ['subcategory'],
+  type: ['type', 'transaction type']
+}
+
+const FALLBACK_CATEGORIES = {
+  INCOME: 'Uncategorized Income',
+  EXPENSE: 'Uncategorized Expense'
+}
+
+const TYPE_ALIASES = {
+  income: 'INCOME',
+  credit: 'INCOME',
+  cr: 'INCOME',
+  expense: 'EXPENSE',
+  debit: 'EXPENSE',
+  dr: 'EXPENSE'
+}
+
+/**
+ * Map header cells to field positions
+ * @param {Array<string>} headers - Header record
+ * @returns {object} - Field name to column index
+ */
+export const mapColumns = (headers) => {
+  const normalized = headers.map(header => header.trim().toLowerCase())
+  const columns = {}
+  for (const [field, aliases] of Object.entries(COLUMN_ALIASES)) {
+    const index = normalized.findIndex(header => aliases.includes(header))
+    if (index !== -1) {
+      columns[field] = index
+    }
+  }
+  return columns
+}
+
+const parseAmount = (value) => {
+  const cleaned = (value || '').replace(/[^0-9.\-()]/g, '')
+  if (!cleaned) return null
+  // Accounting negatives: (125.50)
+  const negative = cleaned.startsWith('(') && cleaned.endsWith(')')
+  const amount = parseFloat(cleaned.replace(/[()]/g, ''))
+  if (!Number.isFinite(amount)) return NaN
+  return negative ? -amount : amount
+}
+
+/**
+ * Parse a statement date as UTC midnight
+ * @param {string} value - YYYY-MM-DD, or MM/DD/YYYY (DD/MM/YYYY with dayFirst)
+ * @param {boolean} dayFirst - Read slashed dates as day/month
+ * @returns {Date|null} - Date, or null if unparseable
+ */
+export const parseDate = (value, dayFirst = false) => {
+  const text = (value || '').trim()
+  let year, month, day
+  let match = text.match(/^(\d{4})-(\d{1,2})-(\d{1,2})/)
+  if (match) {
+    [, year, month, day] = match.map(Number)
+  } else if ((match = text.match(/^(\d{1,2})[/.-](\d{1,2})[/.-](\d{2,4})$/))) {
+    const [, first, second, rawYear] = match.map(Number)
+    year = rawYear < 100 ? 2000 + rawYear : rawYear
+    month = dayFirst ? second : first
+    day = dayFirst ? first : second
+  } else {
+    return null
+  }
+  const date = new Date(Date.UTC(year, month - 1, day))
+  // Reject rollover dates such as 02/30
+  return date.getUTCMonth() === month - 1 && date.getUTCDate() === day ? date : null
+}
+
+/**
+ * Natural key of an imported row
+ * @param {object} row - accountId, date, signed amount and description
+ * @param {number} occurrence - How many identical rows came before it in the file
+ * @returns {string} - Hex SHA-256 digest
+ */
+export const transactionFingerprint = ({ accountId, date, amount, description }, occurrence = 0) => {
+  // Identical rows in one statement (two coffees on the same day) are distinct
+  // transactions; the occurrence keeps them apart and stays stable on re-import
+  const normalized = description.trim().toLowerCase().replace(/\s+/g, ' ')
+  return createHash('sha256')
+    .update([accountId, date.toISOString().slice(0, 10), amount.toFixed(2), normalized, occurrence].join('|'))
+    .digest('hex')
+}
+
+const byName = (rows) => new Map(rows.map(row => [row.name.trim().toLowerCase(), row]))
+
+/**
+ * Name lookups for one import, loaded with one query per table
+ */
+class ImportLookups {
+  constructor(userId) {
+    this.userId = userId
+  }
+
+  async load() {
+    const [accounts, categories, user] = await Promise.all([
+      prisma.account.findMany({ where: { userId: this.userId }, select: { id: true, name: true, isDefault: true } }),
+      prisma.category.findMany({
+        where: { userId: this.userId },
+        select: { id: true, name: true, type: true, subcategories: { select: { id: true, name: true } } }
+      }),
+      prisma.user.findUnique({ where: { id: this.userId }, select: { defaultAccountId: true } })
+    ])
+    this.accounts = byName(accounts)
+    this.accountIds = new Set(accounts.map(account => account.id))
+    this.categories = byName(categories)
+    this.subcategories = new Map(categories.map(category => [category.id, byName(category.subcategories)]))
+    this.defaultAccountId = user?.defaultAccountId || accounts.find(account => account.isDefault)?.id || accounts[0]?.id
+    return this
+  }
+
+  account(name, fallbackId) {
+    if (name) {
+      return this.accounts.get(name.trim().toLowerCase())?.id
+    }
+    return fallbackId && this.accountIds.has(fallbackId) ? fallbackId : this.defaultAccountId
+  }
+
+  category(name) {
+    return this.categories.get(name.trim().toLowerCase())
+  }
+
+  subcategory(categoryId, name) {
+    return this.subcategories.get(categoryId)?.get(name.trim().toLowerCase())?.id
+  }
+
+  // Rows without a category column go to a per-type catch-all, created on first use
+  async fallbackCategory(type) {
+    const name = FALLBACK_CATEGORIES[type]
+    let category = this.category(name)
+    if (!category) {
+      category = await prisma.category.create({ data: { name, type, userId: this.userId } })
+      this.categories.set(name.toLowerCase(), category)
+      this.subcategories.set(category.id, new Map())
+    }
+    return category
+  }
+}
+
+/**
+ * Turn one CSV record into transaction data, or throw with a row-level message
+ */
+async function toTransaction(fields, columns, lookups, options) {
+  const cell = (field) => (columns[field] === undefined ? '' : (fields[columns[field]] || '').trim())
+
+  const date = parseDate(cell('date'), options.dayFirst)
+  if (!date) throw new Error(`Invalid date "${cell('date')}"`)
+
+  const description = cell('description')
+  if (!description) throw new Error('Missing description')
+
+  // Signed amount column, or separate debit/credit columns
+  let amount = parseAmount(cell('amount'))
+  if (amount === null) {
+    const debit = parseAmount(cell('debit'))
+    const credit = parseAmount(cell('credit'))
+    amount = debit ? -Math.abs(debit) : credit ? Math.abs(credit) : null
+  }
+  if (amount === null || Number.isNaN(amount) || amount === 0) throw new Error(`Invalid amount "${cell('amount') || cell('debit') || cell('credit')}"`)
+
+  const typeText = cell('type').toLowerCase()
+  if (typeText && !TYPE_ALIASES[typeText]) throw new Error(`Unknown type "${cell('type')}"`)
+  const type = TYPE_ALIASES[typeText] || (amount < 0 ? 'EXPENSE' : 'INCOME')
+
+  const accountId = lookups.account(cell('account'), options.accountId)
+  if (!accountId) throw new Error(cell('account') ? `Unknown account "${cell('account')}"` : 'No account given and no default account')
+
+  let category
+  if (cell('category')) {
+    category = lookups.category(cell('category'))
+    if (!category) throw new Error(`Unknown category "${cell('category')}"`)
+  } else {
+    category = await lookups.fallbackCategory(type)
+  }
+
+  let subcategoryId = null
+  if (cell('subcategory')) {
+    subcategoryId = lookups.subcategory(category.id, cell('subcategory'))
+    if (!subcategoryId) throw new Error(`Unknown subcategory "${cell('subcategory')}" in "${category.name}"`)
+  }
+
+  return {
+    amount, // signed as in the statement; stored as its absolute value
+    description,
+    date,
+    accountId,
+    categoryId: category.id,
+    categoryType: category.type,
+    subcategoryId
+  }
+}
+
+/**
+ * Fallback account and date order, from form fields or the query string
+ * @param {URL} url - Request URL
+ * @param {FormData} [form] - Multipart form, for uploads
+ * @returns {{ accountId?: string, dayFirst: boolean }} - importCsv options
+ */
+export const importOptions = (url, form) => {
+  const value = (name) => form?.get(name) || url.searchParams.get(name) || undefined
+  return {
+    accountId: value('accountId'),
+    dayFirst: value('dateFormat') === 'DD/MM/YYYY'
+  }
+}
+
+/**
+ * Write one batch with its balance and rollup changes, skipping rows already imported
+ * @returns {Promise<number>} - Rows written
+ */
+const writeBatch = (userId, batch) => prisma.$transaction(async (tx) => {
+  // One indexed lookup per batch for rows a previous import already wrote
+  const existing = await tx.transaction.findMany({
+    where: { fingerprint: { in: batch.map(row => row.fingerprint) } },
+    select: { fingerprint: true }
+  })
+  const seen = new Set(existing.map(row => row.fingerprint))
+  const fresh = batch.filter(row => !seen.has(row.fingerprint))
+  if (fresh.length === 0) return 0
+
+  await tx.transaction.createMany({ data: fresh.map(({ categoryType, ...data }) => data) })
+
+  // Balance and rollup changes are summed per account/bucket, then applied once each
+  const balanceChanges = new Map()
+  const rollups = new Map()
+  for (const { amount, date, accountId, categoryId, categoryType } of fresh) {
+    const change = categoryType === 'INCOME' ? amount : -amount
+    balanceChanges.set(accountId, (balanceChanges.get(accountId) || 0) + change)
+    const key = `${monthKey(date)}|${categoryId}|${accountId}`
+    const bucket = rollups.get(key) || { total: 0, count: 0 }
+    bucket.total += amount
+    bucket.count++
+    rollups.set(key, bucket)
+  }
+  for (const [accountId, change] of balanceChanges) {
+    await tx.account.update({
+      where: { id: accountId },
+      data: { balance: { increment: change } }
+    })
+  }
+  for (const [key, { total, count }] of rollups) {
+    const [month, categoryId, accountId] = key.split('|')
+    await tx.monthlyRollup.upsert({
+      where: { userId_month_categoryId_accountId: { userId, month, categoryId, accountId } },
+      create: { userId, month, categoryId, accountId, total, count },
+      update: { total: { increment: total }, count: { increment: count } }
+    })
+  }
+  return fresh.length
+})
+
+/**
+ * Import a CSV statement for a user
+ * @param {string} userId - Owner of the new transactions
+ * @param {ReadableStream<Uint8Array>} stream - CSV body
+ * @param {{ accountId?: string, dayFirst?: boolean }} options - Fallback account, date order
+ * @returns {Promise<object>} - Row counts and per-row errors
+ */
+export async function importCsv(userId, stream, options = {}) {
+  const lookups = await new ImportLookups(userId).load()
+  const result = { totalRows: 0, imported: 0, skipped: 0, failed: 0, errors: [] }
+  const occurrences = new Map()
+  let columns = null
+  let batch = []
+
+  const flush = async () => {
+    if (batch.length === 0) return
+    const imported = await writeBatch(userId, batch)
+    result.imported += imported
+    result.skipped += batch.length - imported
+    batch = []
+  }
+
+  for await (const { line, fields } of parseCsvStream(stream)) {
+    if (!columns) {
+      columns = mapColumns(fields)
+      if (columns.date === undefined || columns.description === undefined ||
+          (columns.amount === undefined && columns.debit === undefined && columns.credit === undefined)) {
+        throw new ImportError('CSV needs date, description and amount (or debit/credit) columns')
+      }
+      continue
+    }
+
+    result.totalRows++
+    try {
+      const row = await toTransaction(fields, columns, lookups, options)
+      const key = transactionFingerprint(row)
+      const occurrence = occurrences.get(key) || 0
+      occurrences.set(key, occurrence + 1)
+      batch.push({
+        ...row,
+        amount: Math.abs(row.amount),
+        fingerprint: occurrence ? transactionFingerprint(row, occurrence) : key,
+        userId
+      })
+    } catch (error) {
+      result.failed++
+      if (result.errors.length < MAX_REPORTED_ERRORS) {
+        result.errors.push({ row: line, error: error.message })
+      }
+    }
+
+    if (batch.length >= IMPORT_BATCH_SIZE) {
+      await flush()
+    }
+  }
+  await flush()
+
+  if (!columns) {
+    throw new ImportError('CSV file is empty')
+  }
+  return result
+}
@@ -0,0 +1,221 @@
+import { randomUUID } from 'node:crypto'
+import { createWriteStream } from 'node:fs'
+import { mkdir, readFile, readdir, rename, rm, stat, writeFile } from 'node:fs/promises'
+import path from 'node:path'
+import { Readable } from 'node:stream'
+import { pipeline } from 'node:stream/promises'
+import { prisma } from '@/lib/prisma'
+import { EXPORT_FORMATS } from '@/lib/export'
+
+/**
+ * Background export jobs.
+ *
+ * A job streams an export to a file under EXPORT_DIR instead of into the
+ * request that asked for it. Its state lives in a JSON file next to the
+ * export, so it can be polled cheaply and a finished file stays downloadable
+ * (with Range support) across server restarts. Jobs themselves run inside
+ * the server process; one that was in flight during a restart reports failed.
+ */
+
+export const EXPORT_DIR = process.env.EXPORT_DIR || path.join(process.cwd(), '.exports')
+// Exports running at once; later jobs wait in the queue
+const MAX_RUNNING_JOBS = 2
+// Finished files are removed after a day
+const JOB_TTL_MS = 24 * 60 * 60 * 1000
+// Expired jobs are swept at most once an hour, by the next job created
+const SWEEP_INTERVAL_MS = 60 * 60 * 1000
+// At most one status write per second while rows are being written
+const STATUS_INTERVAL_MS = 1000
+
+const JOB_ID = /^[0-9a-f-]{36}$/
+
+const statusPath = (id) => path.join(EXPORT_DIR, `${id}.json`)
+const filePath = (job) => path.join(EXPORT_DIR, `${job.id}.${EXPORT_FORMATS[job.format].extension}`)
+
+// One queue per process, kept across hot reloads like the Prisma client
+const globalForJobs = globalThis
+const queue = globalForJobs.exportJobQueue || { waiting: [], running: 0, active: new Set(), lastSweep: 0 }
+if (process.env.NODE_ENV !== 'production') globalForJobs.exportJobQueue = queue
+
+async function saveJob(job) {
+  job.updatedAt = new Date().toISOString()
+  // Write then rename, so a poll never reads a half-written status file
+  const temp = `${statusPath(job.id)}.tmp`
+  await writeFile(temp, JSON.stringify(job))
+  await rename(temp, statusPath(job.id))
+}
+
+/**
+ * Read a job's status
+ * @param {string} id - Job id
+ * @param {string} userId - Only the owner may see a job
+ * @returns {Promise<object|null>} - Job, or null if unknown or not the user's
+ */
+export async function getJob(id, userId) {
+  if (!JOB_ID.test(id)) return null
+  try {
+    const job = JSON.parse(await readFile(statusPath(id), 'utf8'))
+    if (job.userId !== userId) return null
+    if ((job.status === 'queued' || job.status === 'running') && !queue.active.has(id)) {
+      return { ...job, status: 'failed', error: 'Interrupted by a server restart' }
+    }
+    return job
+  } catch (error) {
+    if (error.code === 'ENOENT') return null
+    throw error
+  }
+}
+
+/**
+ * Path and size of a completed job's file
+ * @param {object} job - From getJob, with status 'completed'
+ * @returns {Promise<{ path: string, size: number }>} - File to serve
+ */
+export async function jobFile(job) {
+  const file = filePath(job)
+  const { size } = await stat(file)
+  return { path: file, size }
+}
+
+async function runJob(job) {
+  const { stream } = EXPORT_FORMATS[job.format]
+  const target = filePath(job)
+  const partial = `${target}.part`
+  let lastSaved = 0
+  // Progress saves are chained so they never race each other or the final save
+  let saving = Promise.resolve()
+
+  try {
+    job.status = 'running'
+    job.startedAt = new Date().toISOString()
+    job.totalRows = await prisma.transaction.count({ where: job.where })
+    await saveJob(job)
+
+    const onBatch = (rows) => {
+      job.rowsWritten += rows
+      job.progress = job.totalRows ? Math.min(job.rowsWritten / job.totalRows, 1) : 1
+      if (Date.now() - lastSaved >= STATUS_INTERVAL_MS) {
+        lastSaved = Date.now()
+        saving = saving.then(() => saveJob(job)).catch(error => console.error('Error saving export job status:', error))
+      }
+    }
+    // The file stream writes each chunk as it arrives and applies backpressure
+    await pipeline(Readable.fromWeb(stream(job.where, onBatch)), createWriteStream(partial))
+    await rename(partial, target)
+
+    job.status = 'completed'
+    job.progress = 1
+    job.bytes = (await stat(target)).size
+    job.completedAt = new Date().toISOString()
+  } catch (error) {
+    console.error('Error running export job:', error)
+    await rm(partial, { force: true })
+    job.status = 'failed'
+    job.error = error.message
+  }
+  await saving
+  await saveJob(job)
+}
+
+function startNext() {
+  while (queue.running < MAX_RUNNING_JOBS && queue.waiting.length > 0) {
+    const job = queue.waiting.shift()
+    queue.running++
+    runJob(job).finally(() => {
+      queue.running--
+      queue.active.delete(job.id)
+      startNext()
+    })
+  }
+}
+
+async function removeExpired() {
+  // Cleanup is opportunistic: a new job sweeps every user's expired exports,
+  // but at most once per interval rather than on every enqueue
+  if (Date.now() - queue.lastSweep < SWEEP_INTERVAL_MS) return
+  queue.lastSweep = Date.now()
+
+  const cutoff = Date.now() - JOB_TTL_MS
+  for (const name of await readdir(EXPORT_DIR)) {
+    if (!name.endsWith('.json')) continue
+    const id = name.slice(0, -'.json'.length)
+    if (queue.active.has(id)) continue
+    try {
+      // saveJob rewrites the status file on every change, so its mtime is the
+      // job's last update and only expired files need to be read at all
+      if ((await stat(statusPath(id))).mtimeMs >= cutoff) continue
+      const job = JSON.parse(await readFile(statusPath(id), 'utf8'))
+      await rm(filePath(job), { force: true })
+      await rm(statusPath(id), { force: true })
+    } catch (error) {
+      // Another sweep or request got there first
+      if (error.code !== 'ENOENT') throw error
+    }
+  }
+}
+
+/**
+ * Queue an export and return its initial status
+ * @param {string} userId - Owner of the export
+ * @param {string} format - A key of EXPORT_FORMATS
+ * @param {object} where - Prisma filter, at least { userId }
+ * @returns {Promise<object>} - Queued job
+ */
+export async function createJob(userId, format, where) {
+  await mkdir(EXPORT_DIR, { recursive: true })
+  await removeExpired()
+
+  const job = {
+    id: randomUUID(),
+    userId,
+    format,
+    where,
+    status: 'queued',
+    totalRows: null,
+    rowsWritten: 0,
+    progress: 0,
+    bytes: null,
+    error: null,
+    createdAt: new Date().toISOString()
+  }
+  await saveJob(job)
+  queue.active.add(job.id)
+  queue.waiting.push(job)
+  startNext()
+  return job
+}
+
+/**
+ * Public view of a job, without the internal filter
+ * @param {object} job - Stored job
+ * @returns {object} - Status payload for the API
+ */
+export const jobStatus = ({ where, userId, ...job }) => ({
+  ...job,
+  downloadUrl: job.status === 'completed' ? `/api/exports/${job.id}/download` : null
+})
+
+/**
+ * Parse a single-range `Range: bytes=` header
+ * @param {string|null} header - Range request header
+ * @param {number} size - File size in bytes
+ * @returns {{ start: number, end: number }|null|false} - Inclusive range, null for the whole file, false if unsatisfiable
+ */
+export const parseRange = (header, size) => {
+  if (!header) return null
+  const match = header.match(/^bytes=(\d*)-(\d*)$/)
+  // Multiple ranges and other units are answered with the whole file
+  if (!match || (match[1] === '' && match[2] === '')) return null
+
+  let start, end
+  if (match[1] === '') {
+    // Suffix range: the last N bytes
+    start = Math.max(size - Number(match[2]), 0)
+    end = size - 1
+  } else {
+    start = Number(match[1])
+    end = match[2] === '' ? size - 1 : Math.min(Number(match[2]), size - 1)
+  }
+  if (start >= size || start > end) return false
+  return { start, end }
+}
@@ -0,0 +1,162 @@
+import { prisma } from '@/lib/prisma'
+import { addToRollup, removeFromRollup } from '@/lib/rollups'
+
+/**
+ * Transaction writes that keep the ledger consistent.
+ *
+ * A transaction row, its monthly rollup bucket and its account's balance
+ * change together in one prisma.$transaction, so a crash or a concurrent
+ * request can never leave Account.balance out of step with the rows. Each
+ * write starts with the row change itself, so SQLite takes the write lock
+ * before anything else is read.
+ */
+
+export const TRANSACTION_INCLUDE = { account: true, category: true, subcategory: true }
+
+/**
+ * Thrown when a transaction changed between being read and being updated
+ */
+export class LedgerConflictError extends Error {
+  constructor(message = 'Transaction was changed by another request; reload and try again') {
+    super(message)
+    this.name = 'LedgerConflictError'
+  }
+}
+
+/**
+ * Effect of a transaction on its account's balance
+ * @param {string} categoryType - INCOME or EXPENSE
+ * @param {number} amount - Stored (positive) amount
+ * @returns {number} - Balance increment
+ */
+export const balanceChange = (categoryType, amount) => (categoryType === 'INCOME' ? amount : -amount)
+
+const incrementBalance = (tx, accountId, change) => tx.account.update({
+  where: { id: accountId },
+  data: { balance: { increment: change } }
+})
+
+const rowData = ({ amount, description, date, accountId, categoryId, subcategoryId }) => ({
+  amount: parseFloat(amount),
+  description,
+  date: new Date(date),
+  accountId,
+  categoryId,
+  subcategoryId: subcategoryId || null
+})
+
+/**
+ * Look up the account and category a write refers to, checking both belong to the user
+ * @param {string} userId - Owner
+ * @param {string} accountId - Account id from the request
+ * @param {string} categoryId - Category id from the request
+ * @returns {Promise<[object|null, object|null]>} - Account and category, null where not the user's
+ */
+export const findAccountAndCategory = (userId, accountId, categoryId) => Promise.all([
+  prisma.account.findFirst({ where: { id: accountId, userId } }),
+  prisma.category.findFirst({ where: { id: categoryId, userId } })
+])
+
+/**
+ * Create a transaction, count it in the rollup and apply it to the balance
+ * @param {string} userId - Owner
+ * @param {object} fields - amount, description, date, accountId, categoryId, subcategoryId
+ * @param {object} category - The transaction's category (for the balance sign)
+ * @returns {Promise<object>} - Created row with account, category and subcategory
+ */
+export const createLedgerTransaction = (userId, fields, category) => prisma.$transaction(async (tx) => {
+  const created = await tx.transaction.create({
+    data: { ...rowData(fields), userId },
+    include: TRANSACTION_INCLUDE
+  })
+  await addToRollup(tx, created)
+  await incrementBalance(tx, created.accountId, balanceChange(category.type, created.amount))
+  return created
+})
+
+/**
+ * Replace a transaction's fields, moving it between rollup buckets and balances
+ * @param {object} existing - The row as read by the caller, with its category
+ * @param {object} fields - New amount, description, date, accountId, categoryId, subcategoryId
+ * @param {object} category - The new category
+ * @returns {Promise<object>} - Updated row with account, category and subcategory
+ * @throws {LedgerConflictError} - If the row's ledger fields changed since `existing` was read
+ */
+export const updateLedgerTransaction = (existing, fields, category) => prisma.$transaction(async (tx) => {
+  // Only update the row as it was read; otherwise the reversal below would be wrong
+  const { count } = await tx.transaction.updateMany({
+    where: {
+      id: existing.id,
+      userId: existing.userId,
+      amount: existing.amount,
+      date: existing.date,
+      accountId: existing.accountId,
+      categoryId: existing.categoryId
+    },
+    data: rowData(fields)
+  })
+  if (count === 0) {
+    throw new LedgerConflictError()
+  }
+  const updated = await tx.transaction.findUnique({ where: { id: existing.id }, include: TRANSACTION_INCLUDE })
+
+  await removeFromRollup(tx, existing)
+  await addToRollup(tx, updated)
+
+  const reversal = -balanceChange(existing.category.type, existing.amount)
+  const change = balanceChange(category.type, updated.amount)
+  if (existing.accountId === updated.accountId) {
+    if (reversal + change !== 0) await incrementBalance(tx, updated.accountId, reversal + change)
+  } else {
+    await incrementBalance(tx, existing.accountId, reversal)
+    await incrementBalance(tx, updated.accountId, change)
+  }
+  return updated
+})
+
+/**
+ * Delete a user's transaction, taking it out of the rollup and the balance
+ * @param {string} userId - Owner
+ * @param {string} id - Transaction id
+ * @returns {Promise<object|null>} - Deleted row, or null if the user has no such transaction
+ */
+export const deleteLedgerTransaction = async (userId, id) => {
+  try {
+    return await prisma.$transaction(async (tx) => {
+      // The deleted row as stored, whatever concurrent edits came before
+      const deleted = await tx.transaction.delete({
+        where: { id, userId },
+        include: { category: true }
+      })
+      await removeFromRollup(tx, deleted)
+      await incrementBalance(tx, deleted.accountId, -balanceChange(deleted.category.type, deleted.amount))
+      return deleted
+    })
+  } catch (error) {
+    // P2025: no row matched the where clause
+    if (error.code === 'P2025') return null
+    throw error
+  }
+}
+
+/**
+ * Update an account; a balance typed in by the user moves its opening balance by
+ * the same amount, so the balance still reconciles with the transactions (a null,
+ * not yet baselined opening balance stays null)
+ * @param {string} userId - Owner
+ * @param {string} id - Account id
+ * @param {object} fields - name, type and optionally balance
+ * @returns {Promise<object>} - Updated account
+ * @throws {Error} - Prisma error P2025 if the user has no such account
+ */
+export const updateLedgerAccount = (userId, id, { name, type, balance }) => prisma.$transaction(async (tx) => {
+  // Written first so the balance read below cannot be overtaken by a transaction write
+  const account = await tx.account.update({ where: { id, userId }, data: { name, type } })
+  if (balance === undefined) return account
+
+  const newBalance = parseFloat(balance)
+  return tx.account.update({
+    where: { id },
+    data: { balance: newBalance, openingBalance: { increment: newBalance - account.balance } }
+  })
+})
@@ -0,0 +1,76 @@
+/**
+ * Keyset (cursor) pagination for transaction listings.
+ *
+ * Pages are ordered by (date desc, id desc); the cursor encodes the last row's
+ * date and id so the next page starts right after it no matter how deep the
+ * user has scrolled, instead of skipping over OFFSET rows.
+ */
+
+export const DEFAULT_PAGE_SIZE = 50
+export const MAX_PAGE_SIZE = 200
+
+export const TRANSACTION_ORDER = [{ date: 'desc' }, { id: 'desc' }]
+
+/**
+ * Read the requested page size, clamped to 1..MAX_PAGE_SIZE
+ * @param {string|null} value - The raw `limit` query parameter
+ * @returns {number} - Page size to use
+ */
+export const parsePageSize = (value) => {
+  const limit = parseInt(value, 10)
+  if (!Number.isFinite(limit) || limit < 1) {
+    return DEFAULT_PAGE_SIZE
+  }
+  return Math.min(limit, MAX_PAGE_SIZE)
+}
+
+/**
+ * Encode the position after a row as an opaque cursor
+ * @param {{ date: Date, id: string }} row - Last row of the page
+ * @returns {string} - URL-safe cursor
+ */
+export const encodeCursor = (row) => {
+  const payload = JSON.stringify([new Date(row.date).getTime(), row.id])
+  return Buffer.from(payload).toString('base64url')
+}
+
+/**
+ * Decode a cursor produced by encodeCursor
+ * @param {string} cursor - Cursor from a previous response
+ * @returns {{ date: Date, id: string }|null} - Position, or null if the cursor is malformed
+ */
+export const decodeCursor = (cursor) => {
+  try {
+    const [time, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'))
+    if (!Number.isFinite(time) || typeof id !== 'string' || !id) {
+      return null
+    }
+    return { date: new Date(time), id }
+  } catch {
+    return null
+  }
+}
+
+/**
+ * Prisma filter for rows that sort strictly after the cursor position
+ * @param {{ date: Date, id: string }} position - Decoded cursor
+ * @returns {object} - Prisma where clause
+ */
+export const afterCursor = (position) => ({
+  OR: [
+    { date: { lt: position.date } },
+    { date: position.date, id: { lt: position.id } }
+  ]
+})
+
+/**
+ * Trim a `take: limit + 1` result to one page and work out the next cursor
+ * @param {Array} rows - Rows fetched with one extra to detect a further page
+ * @param {number} limit - Page size
+ * @returns {{ data: Array, nextCursor: string|null }}
+ */
+export const toPage = (rows, limit) => {
+  const hasMore = rows.length > limit
+  const data = hasMore ? rows.slice(0, limit) : rows
+  return { data, nextCursor: hasMore ? encodeCursor(data[data.length - 1]) : null }
+}
@@ -0,0 +1,120 @@
+import { Prisma } from '@prisma/client'
+import { prisma } from '@/lib/prisma'
+
+/**
+ * Balance reconciliation.
+ *
+ * An account's balance should always equal its openingBalance plus the signed
+ * sum of its transactions (INCOME adds, everything else subtracts). The
+ * expected balance of every account comes from one grouped query, and only
+ * the accounts that drifted are returned, so a pass over hundreds of
+ * thousands of accounts holds just the discrepancies in memory.
+ *
+ * Corrections are applied as increments rather than overwrites: ledger writes
+ * move a balance and its transactions together, so the drift measured here
+ * stays correct even if transactions are written while the pass runs.
+ *
+ * Accounts created before openingBalance existed have it null. Their drift is
+ * unknown rather than zero, so they are left out of the check and nothing is
+ * corrected until `python -m tests.reconcile baseline` has recorded them.
+ */
+
+// Float sums can differ in the last digits depending on summation order
+export const BALANCE_TOLERANCE = 0.005
+
+// Accounts per UPDATE statement; 3 bound values each, well under SQLite's limit
+const CORRECTION_BATCH_SIZE = 500
+
+/**
+ * A correction refused because some accounts have no opening balance yet
+ */
+export class ReconcileError extends Error {}
+
+/**
+ * Accounts whose stored balance differs from opening balance plus transactions
+ * @param {string} [userId] - Limit to one user's accounts; all accounts when omitted
+ * @returns {Promise<{ accounts: number, unbaselined: number, discrepancies: Array<{ id: string, userId: string, name: string, balance: number, expected: number, difference: number }> }>}
+ */
+export async function findBalanceDrift(userId) {
+  const transactionFilter = userId ? Prisma.sql`WHERE t."userId" = ${userId}` : Prisma.empty
+  const accountFilter = userId ? Prisma.sql`AND a."userId" = ${userId}` : Prisma.empty
+  const expected = Prisma.sql`a."openingBalance" + COALESCE(s."net", 0)`
+
+  const scope = userId ? { userId } : {}
+  const [rows, accounts, unbaselined] = await Promise.all([
+    prisma.$queryRaw`
+      SELECT a."id", a."userId", a."name", a."balance", ${expected} AS "expected"
+      FROM "accounts" a
+      LEFT JOIN (
+        SELECT t."accountId", SUM(CASE WHEN c."type" = 'INCOME' THEN t."amount" ELSE -t."amount" END) AS "net"
+        FROM "transactions" t
+        JOIN "categories" c ON c."id" = t."categoryId"
+        ${transactionFilter}
+        GROUP BY t."accountId"
+      ) s ON s."accountId" = a."id"
+      WHERE a."openingBalance" IS NOT NULL AND ABS(a."balance" - (${expected})) > ${BALANCE_TOLERANCE} ${accountFilter}
+      ORDER BY a."userId", a."id"
+    `,
+    prisma.account.count({ where: scope }),
+    prisma.account.count({ where: { ...scope, openingBalance: null } })
+  ])
+
+  return {
+    accounts,
+    unbaselined,
+    discrepancies: rows.map(row => {
+      const expectedBalance = Number(row.expected)
+      return {
+        id: row.id,
+        userId: row.userId,
+        name: row.name,
+        balance: row.balance,
+        expected: expectedBalance,
+        difference: row.balance - expectedBalance
+      }
+    })
+  }
+}
+
+/**
+ * Move each drifted balance back to its expected value, in batched UPDATEs
+ * inside one database transaction
+ * @param {Array<{ id: string, difference: number }>} discrepancies - From findBalanceDrift
+ * @returns {Promise<number>} - Number of accounts corrected
+ */
+export async function correctBalances(discrepancies) {
+  if (discrepancies.length === 0) return 0
+
+  // Prisma stores DateTime as epoch milliseconds in SQLite
+  const now = Date.now()
+  const statements = []
+  for (let start = 0; start < discrepancies.length; start += CORRECTION_BATCH_SIZE) {
+    const batch = discrepancies.slice(start, start + CORRECTION_BATCH_SIZE)
+    const cases = Prisma.join(batch.map(row => Prisma.sql`WHEN ${row.id} THEN ${-row.difference}`), ' ')
+    statements.push(prisma.$executeRaw`
+      UPDATE "accounts"
+      SET "balance" = "balance" + CASE "id" ${cases} END, "updatedAt" = ${now}
+      WHERE "id" IN (${Prisma.join(batch.map(row => row.id))})
+    `)
+  }
+
+  const counts = await prisma.$transaction(statements)
+  return counts.reduce((sum, count) => sum + count, 0)
+}
+
+/**
+ * Check every balance (or one user's) against the transactions, optionally fixing the drift
+ * @param {object} [options]
+ * @param {string} [options.userId] - Limit to one user's accounts
+ * @param {boolean} [options.apply=false] - Correct the balances that drifted
+ * @returns {Promise<{ accounts: number, unbaselined: number, discrepancies: Array<object>, corrected: number }>}
+ * @throws {ReconcileError} - If apply is set and some accounts have no opening balance yet
+ */
+export async function reconcileBalances({ userId, apply = false } = {}) {
+  const { accounts, unbaselined, discrepancies } = await findBalanceDrift(userId)
+  if (apply && unbaselined > 0) {
+    throw new ReconcileError(`${unbaselined} accounts have no opening balance yet; run \`python -m tests.reconcile baseline\` before correcting balances`)
+  }
+  const corrected = apply ? await correctBalances(discrepancies) : 0
+  return { accounts, unbaselined, discrepancies, corrected }
+}
@@ -0,0 +1,114 @@
+import { Prisma } from '@prisma/client'
+import { prisma } from '@/lib/prisma'
+import { LruCache } from '@/lib/cache'
+import { transactionWhereSql } from '@/lib/filters'
+
+/**
+ * Income/expense reports computed in the database.
+ *
+ * A report is a time series bucketed by day, week, month, quarter or year plus
+ * a per-category breakdown, each one grouped query, so its size depends on the
+ * number of buckets and categories rather than on the number of transactions.
+ * Results are cached briefly per user; every write that changes a user's
+ * transactions or categories must call invalidateReports.
+ */
+
+// Buckets are in UTC, like the monthly rollup; weeks start on Monday
+const SECONDS = 't."date" / 1000, \'unixepoch\''
+const BUCKET_SQL = {
+  day: `strftime('%Y-%m-%d', ${SECONDS})`,
+  week: `date(${SECONDS}, 'weekday 0', '-6 days')`,
+  month: `strftime('%Y-%m', ${SECONDS})`,
+  quarter: `strftime('%Y', ${SECONDS}) || '-Q' || ((CAST(strftime('%m', ${SECONDS}) AS INTEGER) + 2) / 3)`,
+  year: `strftime('%Y', ${SECONDS})`
+}
+
+export const REPORT_BUCKETS = Object.keys(BUCKET_SQL)
+export const DEFAULT_BUCKET = 'month'
+
+// Long enough to absorb a page's repeated loads and filter toggling
+const REPORT_CACHE_TTL_MS = 30 * 1000
+const REPORT_CACHE_SIZE = 500
+
+const globalForReports = globalThis
+const reportCache = globalForReports.reportCache || new LruCache({ max: REPORT_CACHE_SIZE, ttlMs: REPORT_CACHE_TTL_MS })
+if (process.env.NODE_ENV !== 'production') globalForReports.reportCache = reportCache
+
+async function loadReport(where, bucket) {
+  const conditions = Prisma.join(transactionWhereSql(where), ' AND ')
+  const [series, categories] = await Promise.all([
+    prisma.$queryRaw`
+      SELECT ${Prisma.raw(BUCKET_SQL[bucket])} AS "period",
+        SUM(CASE WHEN c."type" = 'INCOME' THEN t."amount" ELSE 0 END) AS "income",
+        SUM(CASE WHEN c."type" = 'INCOME' THEN 0 ELSE t."amount" END) AS "expense",
+        COUNT(*) AS "count"
+      FROM "transactions" t
+      JOIN "categories" c ON c."id" = t."categoryId"
+      WHERE ${conditions}
+      GROUP BY "period"
+      ORDER BY "period"
+    `,
+    prisma.$queryRaw`
+      SELECT c."id", c."name", c."type", SUM(t."amount") AS "totalAmount", COUNT(*) AS "transactionCount"
+      FROM "transactions" t
+      JOIN "categories" c ON c."id" = t."categoryId"
+      WHERE ${conditions}
+      GROUP BY c."id"
+      ORDER BY "totalAmount" DESC
+    `
+  ])
+
+  // COUNT(*) comes back from $queryRaw as a BigInt
+  const breakdown = categories.map(row => ({
+    id: row.id,
+    name: row.name,
+    type: row.type,
+    totalAmount: Number(row.totalAmount),
+    transactionCount: Number(row.transactionCount)
+  }))
+  const transactionCount = breakdown.reduce((sum, row) => sum + row.transactionCount, 0)
+  const totalIncome = breakdown.filter(row => row.type === 'INCOME').reduce((sum, row) => sum + row.totalAmount, 0)
+  const totalExpense = breakdown.filter(row => row.type !== 'INCOME').reduce((sum, row) => sum + row.totalAmount, 0)
+
+  return {
+    bucket,
+    totals: {
+      totalIncome,
+      totalExpense,
+      netSavings: totalIncome - totalExpense,
+      transactionCount,
+      avgTransactionSize: transactionCount > 0 ? (totalIncome + totalExpense) / transactionCount : 0
+    },
+    series: series.map(row => {
+      const income = Number(row.income)
+      const expense = Number(row.expense)
+      return { period: row.period, income, expense, net: income - expense, count: Number(row.count) }
+    }),
+    categories: breakdown.map(row => ({
+      ...row,
+      avgAmount: row.transactionCount > 0 ? row.totalAmount / row.transactionCount : 0,
+      percentage: transactionCount > 0 ? (row.transactionCount / transactionCount) * 100 : 0
+    }))
+  }
+}
+
+/**
+ * A user's report, from the cache when the same one was built recently
+ * @param {object} where - transactionWhere() filter; its description search is ignored
+ * @param {string} bucket - One of REPORT_BUCKETS
+ * @returns {Promise<{ bucket: string, totals: object, series: Array<object>, categories: Array<object> }>}
+ */
+export const getReport = (where, bucket) => {
+  const { userId, categoryId = '', subcategoryId = '', accountId = '' } = where
+  const range = [where.date?.gte?.getTime() ?? '', where.date?.lte?.getTime() ?? '']
+  const key = [userId, bucket, categoryId, subcategoryId, accountId, ...range].join('|')
+  return reportCache.getOrLoad(key, () => loadReport(where, bucket))
+}
+
+/**
+ * Drop a user's cached reports after their data changes
+ * @param {string} userId - Database user id
+ */
+export const invalidateReports = (userId) => {
+  reportCache.deleteWhere((value, key) => key.startsWith(`${userId}|`))
+}
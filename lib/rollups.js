@@ -0,0 +1,65 @@
+/**
+ * Incremental maintenance of the MonthlyRollup table.
+ *
+ * Every transaction write calls these helpers with the Prisma transaction
+ * client (`tx`) of the same prisma.$transaction, so the rollup can never
+ * drift from the rows it summarizes. `python -m tests.rollups` rebuilds and
+ * verifies the table from scratch.
+ */
+
+/**
+ * Month bucket of a transaction date
+ * @param {Date|string} date - Transaction date
+ * @returns {string} - YYYY-MM in UTC
+ */
+export const monthKey = (date) => new Date(date).toISOString().slice(0, 7)
+
+/**
+ * Date range of the rollup month containing a date
+ * @param {Date|string} date - Any date in the month
+ * @returns {{ gte: Date, lt: Date }} - Start of the UTC month up to the start of the next
+ */
+export const monthRange = (date) => {
+  const day = new Date(date)
+  return {
+    gte: new Date(Date.UTC(day.getUTCFullYear(), day.getUTCMonth(), 1)),
+    lt: new Date(Date.UTC(day.getUTCFullYear(), day.getUTCMonth() + 1, 1))
+  }
+}
+
+const rollupKey = (transaction) => ({
+  userId: transaction.userId,
+  month: monthKey(transaction.date),
+  categoryId: transaction.categoryId,
+  accountId: transaction.accountId
+})
+
+/**
+ * Add a transaction to its month/category/account bucket
+ * @param {object} tx - Prisma transaction client
+ * @param {object} transaction - Row with userId, date, categoryId, accountId and amount
+ */
+export const addToRollup = async (tx, transaction) => {
+  const key = rollupKey(transaction)
+  await tx.monthlyRollup.upsert({
+    where: { userId_month_categoryId_accountId: key },
+    create: { ...key, total: transaction.amount, count: 1 },
+    update: { total: { increment: transaction.amount }, count: { increment: 1 } }
+  })
+}
+
+/**
+ * Take a transaction back out of its bucket, dropping the bucket once empty
+ * @param {object} tx - Prisma transaction client
+ * @param {object} transaction - Row as it was stored before the update or delete
+ */
+export const removeFromRollup = async (tx, transaction) => {
+  const key = rollupKey(transaction)
+  await tx.monthlyRollup.updateMany({
+    where: key,
+    data: { total: { decrement: transaction.amount }, count: { decrement: 1 } }
+  })
+  await tx.monthlyRollup.deleteMany({
+    where: { ...key, count: { lte: 0 } }
+  })
+}
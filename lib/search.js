@@ -0,0 +1,171 @@
+import { Prisma } from '@prisma/client'
+import { prisma } from '@/lib/prisma'
+import { transactionWhereSql } from '@/lib/filters'
+
+/**
+ * Full-text search over transaction descriptions.
+ *
+ * An FTS5 table with the trigram tokenizer indexes every description; it is
+ * an external-content table over "transactions", kept in sync by triggers,
+ * so it stores only the index. A trigram match is a case-insensitive
+ * substring match - the same results as `contains` - answered from the index
+ * and ranked with bm25. Prisma has no notion of virtual tables, so the index
+ * is created here on first use (and again if `prisma db push` dropped it).
+ *
+ * The index is keyed on the implicit rowid of "transactions", whose primary
+ * key is text. A table rebuild (`prisma db push` redefining the table copies
+ * its rows with fresh rowids) can renumber rows under the index. Each process
+ * therefore probes the newest rows against the index on first use, and runs
+ * an FTS5 'rebuild' if they no longer line up; `python -m tests.search_bench`
+ * runs the same probe.
+ *
+ * Ranked searches are answered by the index: the query starts from
+ * "transactions_fts" (CROSS JOIN fixes the order for SQLite's planner), so
+ * MATCH runs once rather than once per ledger row. Date-ordered searches walk
+ * the user's (userId, date, id, description) index newest first with LIKE and
+ * stop after one page, never touching the table; a single index lookup first
+ * answers terms no description contains, which would otherwise scan every row.
+ */
+
+// Trigrams need at least three characters; shorter searches use LIKE
+export const SEARCH_MIN_LENGTH = 3
+
+// Kept in step with tests/search_bench.py
+const SEARCH_INDEX_SQL = [
+  `CREATE VIRTUAL TABLE IF NOT EXISTS "transactions_fts" USING fts5(
+    "description", content='transactions', content_rowid='rowid', tokenize='trigram'
+  )`,
+  `CREATE TRIGGER IF NOT EXISTS "transactions_fts_insert" AFTER INSERT ON "transactions" BEGIN
+    INSERT INTO "transactions_fts"(rowid, "description") VALUES (new.rowid, new."description");
+  END`,
+  `CREATE TRIGGER IF NOT EXISTS "transactions_fts_delete" AFTER DELETE ON "transactions" BEGIN
+    INSERT INTO "transactions_fts"("transactions_fts", rowid, "description") VALUES ('delete', old.rowid, old."description");
+  END`,
+  `CREATE TRIGGER IF NOT EXISTS "transactions_fts_update" AFTER UPDATE OF "description" ON "transactions" BEGIN
+    INSERT INTO "transactions_fts"("transactions_fts", rowid, "description") VALUES ('delete', old.rowid, old."description");
+    INSERT INTO "transactions_fts"(rowid, "description") VALUES (new.rowid, new."description");
+  END`
+]
+
+// Newest rows that must be found in the index under their own rowid; any
+// misses mean the rowids moved and the index needs a rebuild
+const SEARCH_SYNC_SQL = `
+  SELECT COUNT(*) AS "missing" FROM (
+    SELECT rowid, "description" FROM "transactions"
+    WHERE length(trim("description")) >= ${SEARCH_MIN_LENGTH}
+    ORDER BY rowid DESC LIMIT 8
+  ) p
+  WHERE NOT EXISTS (
+    SELECT 1 FROM "transactions_fts"
+    WHERE "transactions_fts" MATCH '"' || replace(trim(p."description"), '"', '""') || '"'
+      AND "transactions_fts".rowid = p.rowid
+  )
+`
+
+const globalForSearch = globalThis
+
+async function createSearchIndex() {
+  const existing = await prisma.$queryRaw`
+    SELECT "name" FROM "sqlite_master" WHERE "type" = 'table' AND "name" = 'transactions_fts'
+  `
+  await prisma.$transaction(SEARCH_INDEX_SQL.map(sql => prisma.$executeRawUnsafe(sql)))
+  // A new index starts empty; fill it from the rows already there
+  let rebuild = existing.length === 0
+  if (!rebuild) {
+    const [{ missing }] = await prisma.$queryRawUnsafe(SEARCH_SYNC_SQL)
+    rebuild = Number(missing) > 0
+    if (rebuild) console.warn('Search index is out of step with transaction rowids; rebuilding')
+  }
+  if (rebuild) {
+    await prisma.$executeRawUnsafe(`INSERT INTO "transactions_fts"("transactions_fts") VALUES ('rebuild')`)
+  }
+}
+
+/**
+ * Create the search index and its triggers once per process
+ * @returns {Promise<void>}
+ */
+export const ensureSearchIndex = () => {
+  if (!globalForSearch.searchIndexReady) {
+    globalForSearch.searchIndexReady = createSearchIndex().catch(error => {
+      globalForSearch.searchIndexReady = null
+      throw error
+    })
+  }
+  return globalForSearch.searchIndexReady
+}
+
+/**
+ * Quote user input as one FTS5 phrase, i.e. a literal substring
+ * @param {string} search - Raw search text
+ * @returns {string} - MATCH expression
+ */
+export const searchPhrase = (search) => `"${search.trim().replace(/"/g, '""')}"`
+
+/**
+ * Whether a search is long enough for the index
+ * @param {string|null} search - Raw search text
+ * @returns {boolean}
+ */
+export const usesSearchIndex = (search) => Boolean(search) && search.trim().length >= SEARCH_MIN_LENGTH
+
+// Whether any description at all contains the search. Trigram matching folds
+// case at least as widely as LIKE, so no match here means no LIKE match either
+async function anyMatch(search) {
+  const rows = await prisma.$queryRaw`
+    SELECT rowid FROM "transactions_fts" WHERE "transactions_fts" MATCH ${searchPhrase(search)} LIMIT 1
+  `
+  return rows.length > 0
+}
+
+async function queryMatches(where, search, { limit, position, relevance }) {
+  const conditions = transactionWhereSql(where)
+
+  if (relevance) {
+    const rows = await prisma.$queryRaw`
+      SELECT t."id" FROM "transactions_fts"
+      CROSS JOIN "transactions" t ON t.rowid = "transactions_fts".rowid
+      WHERE "transactions_fts" MATCH ${searchPhrase(search)} AND ${Prisma.join(conditions, ' AND ')}
+      ORDER BY "transactions_fts".rank, t."date" DESC, t."id" DESC
+      LIMIT ${limit}
+    `
+    return rows.map(row => row.id)
+  }
+
+  if (!(await anyMatch(search))) return []
+  if (position) {
+    const date = position.date.getTime()
+    // The bare upper bound lets SQLite seek straight to the position
+    conditions.push(Prisma.sql`t."date" <= ${date}`)
+    conditions.push(Prisma.sql`(t."date" < ${date} OR (t."date" = ${date} AND t."id" < ${position.id}))`)
+  }
+  const rows = await prisma.$queryRaw`
+    SELECT t."id" FROM "transactions" t
+    WHERE ${Prisma.join(conditions, ' AND ')}
+      AND t."description" LIKE ${`%${search.trim().replace(/[\\%_]/g, '\\$&')}%`} ESCAPE '\\'
+    ORDER BY t."date" DESC, t."id" DESC
+    LIMIT ${limit}
+  `
+  return rows.map(row => row.id)
+}
+
+/**
+ * Ids of a user's transactions whose description contains `search`
+ * @param {object} where - transactionWhere() filter; its description filter is ignored
+ * @param {string} search - At least SEARCH_MIN_LENGTH characters
+ * @param {{ limit: number, position?: object, relevance?: boolean }} options -
+ *   Rows to return, keyset position (date order only), bm25 ordering instead of newest first
+ * @returns {Promise<Array<string>>} - Matching ids in result order
+ */
+export async function searchTransactionIds(where, search, options) {
+  await ensureSearchIndex()
+  try {
+    return await queryMatches(where, search, options)
+  } catch (error) {
+    // The table can disappear under a running server, e.g. after `prisma db push`
+    if (!String(error.message).includes('no such table: transactions_fts')) throw error
+    globalForSearch.searchIndexReady = null
+    await ensureSearchIndex()
+    return queryMatches(where, search, options)
+  }
+}
@@ -224,6 +224,19 @@ async function main() {
     })
   }
 
+  // The balances above are today's; back the sample transactions out of the
+  // opening balances so the accounts reconcile (see lib/reconcile.js)
+  const incomeCategoryIds = [salaryCategory.id, freelanceCategory.id]
+  for (const account of [bankAccount, wallet, creditCard]) {
+    const activity = transactions
+      .filter(transaction => transaction.accountId === account.id)
+      .reduce((sum, transaction) => sum + (incomeCategoryIds.includes(transaction.categoryId) ? transaction.amount : -transaction.amount), 0)
+    await prisma.account.update({
+      where: { id: account.id },
+      data: { openingBalance: account.balance - activity }
+    })
+  }
+
   console.log('Seed completed successfully!')
 }
 
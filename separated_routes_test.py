@@ -7,132 +7,149 @@ Focus: Individual route testing, authentication, and user creation
 
 import requests
 import json
-import os
 import subprocess
 import sys
 from datetime import datetime, timedelta
 import uuid
 
-# Get base URL from environment
-BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://cashflow-182.preview.emergentagent.com')
-API_BASE = f"{BASE_URL}/api"
+from tests.base import BaseTester, exit_code
+from tests.client import API_BASE, iter_pages
+from tests.runner import fan_out
 
-class SeparatedRoutesBackendTester:
-    def __init__(self):
-        self.test_results = []
-        self.session = requests.Session()
-        self.critical_issues = []
-        
-    def log_test(self, test_name, success, message, details=None, critical=False):
-        """Log test results"""
-        result = {
-            'test': test_name,
-            'success': success,
-            'message': message,
-            'details': details,
-            'timestamp': datetime.now().isoformat(),
-            'critical': critical
-        }
-        self.test_results.append(result)
-        
-        if critical and not success:
-            self.critical_issues.append(result)
-            
-        status = "✅ PASS" if success else "❌ FAIL"
-        priority = " [CRITICAL]" if critical else ""
-        print(f"{status}{priority}: {test_name} - {message}")
-        if details and not success:
-            print(f"   Details: {details}")
+# Test the specific separated routes mentioned in the review request
+SEPARATED_ROUTES = [
+    ("GET", "/accounts", "Get Accounts"),
+    ("GET", "/categories", "Get Categories"), 
+    ("GET", "/transactions", "Get Transactions"),
+    ("GET", "/analytics", "Get Analytics")
+]
+
+# Page sizes used to walk GET /api/transactions; results must match a walk at the cap
+PAGE_WALK_SIZES = [5, 37]
+MAX_PAGE_SIZE = 200
+
+# /api/reports buckets and how to label a UTC datetime with each
+REPORT_BUCKETS = {
+    "day": lambda d: d.strftime('%Y-%m-%d'),
+    "week": lambda d: (d - timedelta(days=d.weekday())).strftime('%Y-%m-%d'),
+    "month": lambda d: d.strftime('%Y-%m'),
+    "quarter": lambda d: f"{d.year}-Q{(d.month + 2) // 3}",
+    "year": lambda d: str(d.year)
+}
+
+# (endpoint, fields) for sparse field selection; rows must match the full listing
+SPARSE_FIELD_CASES = [
+    ("/transactions", "amount,categoryId,category.name"),
+    ("/accounts", "name,balance"),
+    ("/budgets", "name,progress"),
+    ("/investments", "symbol,profitLoss")
+]
+
+class SeparatedRoutesBackendTester(BaseTester):
+    BANNER = [
+        "🚀 Starting Finance Wizard Separated API Routes Testing Suite",
+        "🎯 Focus: Separated Routes, Authentication, User Creation Flow"
+    ]
+    SUMMARY_TITLE = "SEPARATED API ROUTES TESTING SUMMARY"
+    SUMMARY_CATEGORIES = [
+        ('Authentication', ['Auth']),
+        ('User Creation', ['User Creation']),
+        ('Data Integration', ['Data Integration']),
+        ('Response Format', ['Response Format']),
+        ('Route Separation', ['Separated Routes']),
+        ('Pagination', ['Pagination']),
+        ('Field Selection', ['Field Selection']),
+        ('Category Stats', ['Category Stats']),
+        ('Reports', ['Reports']),
+        ('Dashboard', ['Dashboard']),
+        ('Reconciliation', ['Reconciliation'])
+    ]
     
     def test_separated_api_routes_authentication(self):
         """Test that all separated API routes require authentication"""
         print("\n=== Testing Separated API Routes Authentication ===")
         
-        # Test the specific separated routes mentioned in the review request
-        routes = [
-            ("GET", "/accounts", "Get Accounts"),
-            ("GET", "/categories", "Get Categories"), 
-            ("GET", "/transactions", "Get Transactions"),
-            ("GET", "/analytics", "Get Analytics")
-        ]
-        
-        for method, endpoint, name in routes:
-            try:
-                url = f"{API_BASE}{endpoint}"
-                response = self.session.request(method, url, timeout=15)
-                
-                # Check response
-                if response.status_code == 401:
-                    try:
-                        data = response.json()
-                        if data.get('success') == False and 'Unauthorized' in data.get('error', ''):
-                            self.log_test(
-                                f"Separated Route Auth - {name}",
-                                True,
-                                "Correctly requires authentication with proper JSON response format",
-                                f"Status: {response.status_code}, Response: {data}",
-                                critical=True
-                            )
-                        else:
-                            self.log_test(
-                                f"Separated Route Auth - {name}",
-                                False,
-                                "Returns 401 but with incorrect response format",
-                                f"Expected: {{success: false, error: 'Unauthorized'}}, Got: {data}",
-                                critical=True
-                            )
-                    except json.JSONDecodeError:
+        for method, endpoint, name in SEPARATED_ROUTES:
+            self.check_separated_route_authentication(method, endpoint, name)
+    
+    def check_separated_route_authentication(self, method, endpoint, name):
+        """Check that a single separated route requires authentication"""
+        try:
+            url = f"{API_BASE}{endpoint}"
+            response = self.session.request(method, url, timeout=15)
+            
+            # Check response
+            if response.status_code == 401:
+                try:
+                    data = response.json()
+                    if data.get('success') == False and 'Unauthorized' in data.get('error', ''):
+                        self.log_test(
+                            f"Separated Route Auth - {name}",
+                            True,
+                            "Correctly requires authentication with proper JSON response format",
+                            f"Status: {response.status_code}, Response: {data}",
+                            critical=True
+                        )
+                    else:
                         self.log_test(
                             f"Separated Route Auth - {name}",
                             False,
-                            "Returns 401 but response is not valid JSON",
-                            response.text[:200],
+                            "Returns 401 but with incorrect response format",
+                            f"Expected: {{success: false, error: 'Unauthorized'}}, Got: {data}",
                             critical=True
                         )
-                elif response.status_code == 200:
-                    try:
-                        data = response.json()
-                        if data.get('success') and data.get('data'):
-                            self.log_test(
-                                f"Separated Route Auth - {name}",
-                                False,
-                                "SECURITY ISSUE: API returns data without authentication",
-                                f"Status: {response.status_code}, Data returned: {len(str(data.get('data', [])))} chars",
-                                critical=True
-                            )
-                        else:
-                            self.log_test(
-                                f"Separated Route Auth - {name}",
-                                True,
-                                "API accessible but returns no data without authentication",
-                                f"Status: {response.status_code}, Response: {data}",
-                                critical=False
-                            )
-                    except json.JSONDecodeError:
+                except json.JSONDecodeError:
+                    self.log_test(
+                        f"Separated Route Auth - {name}",
+                        False,
+                        "Returns 401 but response is not valid JSON",
+                        response.text[:200],
+                        critical=True
+                    )
+            elif response.status_code == 200:
+                try:
+                    data = response.json()
+                    if data.get('success') and data.get('data'):
                         self.log_test(
                             f"Separated Route Auth - {name}",
                             False,
-                            "API returned non-JSON response",
-                            response.text[:200],
+                            "SECURITY ISSUE: API returns data without authentication",
+                            f"Status: {response.status_code}, Data returned: {len(str(data.get('data', [])))} chars",
+                            critical=True
+                        )
+                    else:
+                        self.log_test(
+                            f"Separated Route Auth - {name}",
+                            True,
+                            "API accessible but returns no data without authentication",
+                            f"Status: {response.status_code}, Response: {data}",
                             critical=False
                         )
-                else:
+                except json.JSONDecodeError:
                     self.log_test(
                         f"Separated Route Auth - {name}",
                         False,
-                        f"Unexpected response status: {response.status_code}",
+                        "API returned non-JSON response",
                         response.text[:200],
-                        critical=True
+                        critical=False
                     )
-                    
-            except requests.exceptions.RequestException as e:
+            else:
                 self.log_test(
                     f"Separated Route Auth - {name}",
                     False,
-                    "Request failed",
-                    str(e),
+                    f"Unexpected response status: {response.status_code}",
+                    response.text[:200],
                     critical=True
                 )
+                
+        except requests.exceptions.RequestException as e:
+            self.log_test(
+                f"Separated Route Auth - {name}",
+                False,
+                "Request failed",
+                str(e),
+                critical=True
+            )
     
     def test_user_creation_flow(self):
         """Test the getAuthenticatedUser() helper function and user creation flow"""
@@ -616,93 +633,345 @@ class SeparatedRoutesBackendTester:
                 critical=True
             )
     
-    def run_all_tests(self):
-        """Run all separated routes backend tests"""
-        print("🚀 Starting Finance Wizard Separated API Routes Testing Suite")
-        print("🎯 Focus: Separated Routes, Authentication, User Creation Flow")
-        print("=" * 80)
-        
-        # Test separated API routes authentication
-        self.test_separated_api_routes_authentication()
-        
-        # Test user creation flow
-        self.test_user_creation_flow()
-        
-        # Test data integration
-        self.test_data_integration_and_demo_data()
-        
-        # Test API response format
-        self.test_api_response_format()
-        
-        # Test separated routes functionality
-        self.test_separated_routes_functionality()
-        
-        # Generate summary
-        passed, failed, critical = self.generate_summary()
-        return passed, failed, critical
+    def check_transactions_page_walk(self, limit):
+        """Walk GET /api/transactions page by page and compare with a walk at the page-size cap"""
+        try:
+            reference = [row for page in iter_pages(self.session, '/transactions', limit=MAX_PAGE_SIZE) for row in page]
+            pages = list(iter_pages(self.session, '/transactions', limit=limit))
+            rows = [row for page in pages for row in page]
+            ids = [row['id'] for row in rows]
+            
+            oversized = [len(page) for page in pages if len(page) > limit]
+            duplicates = len(ids) - len(set(ids))
+            missing = {row['id'] for row in reference} - set(ids)
+            # Rows must come back in (date desc, id desc) order across page boundaries
+            keys = [(row['date'], row['id']) for row in rows]
+            ordered = all(a >= b for a, b in zip(keys, keys[1:]))
+            
+            success = not oversized and not duplicates and not missing and ordered and len(rows) == len(reference)
+            self.log_test(
+                f"Pagination - Page Walk (limit={limit})",
+                success,
+                f"{len(pages)} pages returned all {len(rows)} transactions exactly once" if success else "Page walk missed, duplicated or misordered transactions",
+                f"Pages: {len(pages)}, Rows: {len(rows)}, Reference: {len(reference)}, Duplicates: {duplicates}, "
+                f"Missing: {len(missing)}, Oversized pages: {oversized}, Ordered: {ordered}",
+                critical=True
+            )
+        except Exception as e:
+            self.log_test(
+                f"Pagination - Page Walk (limit={limit})",
+                False,
+                "Failed to walk transaction pages",
+                str(e),
+                critical=True
+            )
     
-    def generate_summary(self):
-        """Generate comprehensive test summary"""
-        print("\n" + "=" * 80)
-        print("🏁 SEPARATED API ROUTES TESTING SUMMARY")
-        print("=" * 80)
-        
-        total_tests = len(self.test_results)
-        passed_tests = len([r for r in self.test_results if r['success']])
-        failed_tests = total_tests - passed_tests
-        critical_failed = len(self.critical_issues)
-        
-        print(f"📊 Total Tests: {total_tests}")
-        print(f"✅ Passed: {passed_tests}")
-        print(f"❌ Failed: {failed_tests}")
-        print(f"🚨 Critical Issues: {critical_failed}")
-        print(f"📈 Success Rate: {(passed_tests/total_tests)*100:.1f}%")
-        
-        # Categorize results
-        categories = {
-            'Authentication': [],
-            'User Creation': [],
-            'Data Integration': [],
-            'Response Format': [],
-            'Route Separation': []
-        }
-        
-        for result in self.test_results:
-            test_name = result['test']
-            if 'Auth' in test_name:
-                categories['Authentication'].append(result)
-            elif 'User Creation' in test_name:
-                categories['User Creation'].append(result)
-            elif 'Data Integration' in test_name:
-                categories['Data Integration'].append(result)
-            elif 'Response Format' in test_name:
-                categories['Response Format'].append(result)
-            elif 'Separated Routes' in test_name:
-                categories['Route Separation'].append(result)
-        
-        # Print category summaries
-        for category, results in categories.items():
-            if results:
-                passed = len([r for r in results if r['success']])
-                total = len(results)
-                print(f"\n📋 {category}: {passed}/{total} passed")
-                
-                for result in results:
-                    if not result['success']:
-                        status = "🚨" if result.get('critical') else "⚠️"
-                        print(f"   {status} {result['test']}: {result['message']}")
-        
-        # Critical issues summary
-        if self.critical_issues:
-            print(f"\n🚨 CRITICAL ISSUES REQUIRING IMMEDIATE ATTENTION:")
-            for issue in self.critical_issues:
-                print(f"   🔴 {issue['test']}")
-                print(f"      Problem: {issue['message']}")
-                if issue['details']:
-                    print(f"      Details: {issue['details']}")
-                print()
-        
-        # Recommendations
+    def check_transactions_page_size_cap(self):
+        """Check that oversized and missing limits are clamped and a nextCursor is returned"""
+        try:
+            response = self.session.get(f"{API_BASE}/transactions", params={'limit': 100000}, timeout=30)
+            data = response.json() if response.status_code == 200 else {}
+            rows = data.get('data', [])
+            capped = data.get('success') is True and isinstance(rows, list) and len(rows) <= MAX_PAGE_SIZE and 'nextCursor' in data
+            
+            self.log_test(
+                "Pagination - Page Size Cap",
+                capped,
+                f"limit=100000 returned {len(rows)} rows (cap {MAX_PAGE_SIZE})" if capped else "Page size is not capped or nextCursor is missing",
+                f"Status: {response.status_code}, Keys: {list(data.keys())}",
+                critical=True
+            )
+        except Exception as e:
+            self.log_test("Pagination - Page Size Cap", False, "Failed to check page size cap", str(e), critical=True)
+    
+    def check_transactions_invalid_cursor(self):
+        """Check that a malformed cursor is rejected instead of silently restarting the walk"""
+        try:
+            response = self.session.get(f"{API_BASE}/transactions", params={'cursor': 'not-a-cursor'}, timeout=15)
+            rejected = response.status_code == 400 and response.json().get('success') is False
+            
+            self.log_test(
+                "Pagination - Invalid Cursor",
+                rejected,
+                "Malformed cursor rejected with 400" if rejected else f"Malformed cursor returned {response.status_code}",
+                response.text[:200]
+            )
+        except Exception as e:
+            self.log_test("Pagination - Invalid Cursor", False, "Failed to check invalid cursor handling", str(e))
+    
+    def check_sparse_fields(self, endpoint, fields):
+        """Check that ?fields= returns only the named keys, with the same values as the full listing"""
+        name = f"Field Selection - {endpoint}"
+        try:
+            params = {'limit': MAX_PAGE_SIZE} if endpoint == '/transactions' else {}
+            full = self.session.get(f"{API_BASE}{endpoint}", params=params, timeout=30)
+            sparse = self.session.get(f"{API_BASE}{endpoint}", params={**params, 'fields': fields}, timeout=30)
+            full_rows = {row['id']: row for row in full.json().get('data', [])}
+            sparse_rows = sparse.json().get('data', []) if sparse.status_code == 200 else None
+            
+            requested = [field.split('.') for field in fields.split(',')]
+            allowed = {'id'} | {parts[0] for parts in requested}
+            problems = []
+            for row in sparse_rows or []:
+                extra = set(row) - allowed
+                if extra:
+                    problems.append(f"{row.get('id')}: unexpected {sorted(extra)}")
+                reference = full_rows.get(row.get('id'))
+                if reference is None:
+                    problems.append(f"{row.get('id')}: not in full listing")
+                    continue
+                for parts in requested:
+                    value, expected = row.get(parts[0]), reference.get(parts[0])
+                    if len(parts) == 2:
+                        value, expected = (value or {}).get(parts[1]), (expected or {}).get(parts[1])
+                    if value != expected:
+                        problems.append(f"{row['id']}: {'.'.join(parts)} {value!r} != {expected!r}")
+            
+            success = sparse_rows is not None and len(sparse_rows) == len(full_rows) and not problems
+            self.log_test(
+                name,
+                success,
+                f"fields={fields} returned {len(sparse_rows)} rows, {len(sparse.content)} vs {len(full.content)} bytes"
+                if success else f"fields={fields} did not match the full listing",
+                f"Status: {sparse.status_code}, Rows: {len(sparse_rows or [])}/{len(full_rows)}, Problems: {problems[:5]}",
+                critical=True
+            )
+        except Exception as e:
+            self.log_test(name, False, "Failed to check sparse field selection", str(e), critical=True)
+    
+    def check_unknown_field_rejected(self):
+        """Check that an unknown field or relation is a 400, not silently ignored"""
+        try:
+            statuses = [
+                self.session.get(f"{API_BASE}/transactions", params=params, timeout=15).status_code
+                for params in ({'fields': 'amount,notAColumn'}, {'include': 'user'}, {'fields': 'category.userId'})
+            ]
+            rejected = all(status == 400 for status in statuses)
+            
+            self.log_test(
+                "Field Selection - Unknown Field",
+                rejected,
+                "Unknown fields and relations rejected with 400" if rejected else "Unknown fields were not rejected",
+                f"Statuses: {statuses}"
+            )
+        except Exception as e:
+            self.log_test("Field Selection - Unknown Field", False, "Failed to check unknown field handling", str(e))
+    
+    def check_category_stats(self):
+        """Check that /categories?stats=true matches counts and totals summed from the ledger"""
+        try:
+            response = self.session.get(f"{API_BASE}/categories", params={'stats': 'true'}, timeout=30)
+            categories = response.json().get('data', []) if response.status_code == 200 else []
+            
+            expected = {}
+            for page in iter_pages(self.session, '/transactions', limit=MAX_PAGE_SIZE, fields='categoryId,subcategoryId,amount'):
+                for row in page:
+                    keys = [row['categoryId']] + ([f"{row['categoryId']}/{row['subcategoryId']}"] if row.get('subcategoryId') else [])
+                    for key in keys:
+                        count, total = expected.get(key, (0, 0.0))
+                        expected[key] = (count + 1, total + row['amount'])
+            
+            mismatches = []
+            for category in categories:
+                entries = [(category['id'], category)] + [(f"{category['id']}/{sub['id']}", sub) for sub in category.get('subcategories', [])]
+                for key, entry in entries:
+                    count, total = expected.get(key, (0, 0.0))
+                    if entry.get('transactionCount') != count or abs((entry.get('totalAmount') or 0) - total) > 0.01:
+                        mismatches.append(f"{key}: {entry.get('transactionCount')}/{entry.get('totalAmount')} != {count}/{round(total, 2)}")
+            
+            success = response.status_code == 200 and bool(categories) and not mismatches
+            self.log_test(
+                "Category Stats - Grouped Totals",
+                success,
+                f"{len(categories)} categories match the ledger ({len(response.content)} bytes)" if success else "Category stats disagree with the ledger",
+                f"Status: {response.status_code}, Categories: {len(categories)}, Mismatches: {mismatches[:5]}",
+                critical=True
+            )
+        except Exception as e:
+            self.log_test("Category Stats - Grouped Totals", False, "Failed to check category stats", str(e), critical=True)
+    
+    def check_report_buckets(self, bucket):
+        """Check that /reports?bucket= matches the ledger bucketed here, period by period"""
+        name = f"Reports - {bucket.title()} Buckets"
+        try:
+            response = self.session.get(f"{API_BASE}/reports", params={'bucket': bucket}, timeout=60)
+            report = response.json().get('data') or {}
+            
+            label = REPORT_BUCKETS[bucket]
+            expected = {}
+            for page in iter_pages(self.session, '/transactions', limit=MAX_PAGE_SIZE, fields='date,amount,category.type'):
+                for row in page:
+                    period = label(datetime.fromisoformat(row['date'].replace('Z', '+00:00')))
+                    income, expense, count = expected.get(period, (0.0, 0.0, 0))
+                    if row['category']['type'] == 'INCOME':
+                        income += row['amount']
+                    else:
+                        expense += row['amount']
+                    expected[period] = (income, expense, count + 1)
+            
+            series = {point['period']: point for point in report.get('series', [])}
+            mismatches = [
+                period for period, (income, expense, count) in expected.items()
+                if period not in series or series[period]['count'] != count
+                or abs(series[period]['income'] - income) > 0.01 or abs(series[period]['expense'] - expense) > 0.01
+            ] + [period for period in series if period not in expected]
+            totals = report.get('totals', {})
+            totals_match = totals.get('transactionCount') == sum(count for _, _, count in expected.values())
+            
+            success = response.status_code == 200 and not mismatches and totals_match
+            self.log_test(
+                name,
+                success,
+                f"{len(series)} periods match the ledger ({len(response.content)} bytes)" if success else "Report disagrees with the ledger",
+                f"Status: {response.status_code}, Periods: {len(series)}/{len(expected)}, Mismatched: {sorted(mismatches)[:5]}, "
+                f"Totals match: {totals_match}",
+                critical=True
+            )
+        except Exception as e:
+            self.log_test(name, False, "Failed to check report buckets", str(e), critical=True)
+    
+    def check_report_invalid_bucket(self):
+        """Check that an unknown bucket is rejected"""
+        try:
+            response = self.session.get(f"{API_BASE}/reports", params={'bucket': 'fortnight'}, timeout=15)
+            rejected = response.status_code == 400 and response.json().get('success') is False
+            self.log_test(
+                "Reports - Invalid Bucket",
+                rejected,
+                "Unknown bucket rejected with 400" if rejected else f"Unknown bucket returned {response.status_code}",
+                response.text[:200]
+            )
+        except Exception as e:
+            self.log_test("Reports - Invalid Bucket", False, "Failed to check invalid bucket handling", str(e))
+    
+    def check_dashboard_matches_endpoints(self):
+        """Check that /dashboard agrees with the separate endpoints it replaces"""
+        try:
+            response = self.session.get(f"{API_BASE}/dashboard", params={'recent': 5}, timeout=30)
+            dashboard = response.json().get('data') or {}
+            analytics = self.session.get(f"{API_BASE}/analytics", timeout=30).json().get('data') or {}
+            recent = self.session.get(f"{API_BASE}/transactions", params={'limit': 5}, timeout=30).json().get('data') or []
+            accounts = self.session.get(f"{API_BASE}/accounts", timeout=30).json().get('data') or []
+            budgets = self.session.get(f"{API_BASE}/budgets", params={'active': 'true'}, timeout=30).json().get('data') or []
+            
+            summary = dashboard.get('summary', {})
+            problems = [
+                f"summary.{key}: {summary.get(key)} != {analytics.get(key)}"
+                for key in ('totalIncome', 'totalExpense', 'netSavings', 'transactionCount', 'accountsTotal')
+                if abs((summary.get(key) or 0) - (analytics.get(key) or 0)) > 0.01
+            ]
+            if [t['id'] for t in dashboard.get('recentTransactions', [])] != [t['id'] for t in recent]:
+                problems.append("recent transactions differ from /transactions?limit=5")
+            if {a['id']: a['balance'] for a in dashboard.get('accounts', [])} != {a['id']: a['balance'] for a in accounts}:
+                problems.append("account balances differ from /accounts")
+            if {b['id']: round(b['spent'], 2) for b in dashboard.get('budgets', [])} != {b['id']: round(b['spent'], 2) for b in budgets}:
+                problems.append("budget spending differs from /budgets?active=true")
+            monthly = dashboard.get('monthly', [])
+            if not monthly or abs(monthly[-1]['income'] - (summary.get('totalIncome') or 0)) > 0.01:
+                problems.append("current month of the chart does not match the summary")
+            
+            success = response.status_code == 200 and not problems
+            self.log_test(
+                "Dashboard - Composite Response",
+                success,
+                f"One request replaced four ({len(response.content)} bytes)" if success else "Dashboard disagrees with the individual endpoints",
+                f"Status: {response.status_code}, Problems: {problems}",
+                critical=True
+            )
+        except Exception as e:
+            self.log_test("Dashboard - Composite Response", False, "Failed to check the dashboard endpoint", str(e), critical=True)
+    
+    def check_reconcile_tracks_writes(self):
+        """Check that a scratch account stays reconciled through a transaction and a manual balance edit"""
+        account_id = None
+        try:
+            categories = self.session.get(f"{API_BASE}/categories", timeout=30).json().get('data') or []
+            income = next(category for category in categories if category['type'] == 'INCOME')
+            account = self.session.post(f"{API_BASE}/accounts", json={'name': 'Reconcile check', 'type': 'BANK', 'balance': 100}, timeout=30).json()['data']
+            account_id = account['id']
+            self.session.post(f"{API_BASE}/transactions", json={
+                'amount': 50, 'description': 'Reconcile check', 'date': datetime.now().isoformat(),
+                'accountId': account_id, 'categoryId': income['id']
+            }, timeout=30)
+            # Typing in a new balance moves the opening balance, not the drift
+            self.session.put(f"{API_BASE}/accounts", json={'id': account_id, 'name': 'Reconcile check', 'type': 'BANK', 'balance': 500}, timeout=30)
+            
+            response = self.session.get(f"{API_BASE}/accounts/reconcile", timeout=60)
+            report = response.json().get('data') or {}
+            accounts = self.session.get(f"{API_BASE}/accounts", params={'fields': 'id,balance,openingBalance'}, timeout=30).json().get('data') or []
+            scratch = next((a for a in accounts if a['id'] == account_id), {})
+            
+            problems = []
+            if any(row['id'] == account_id for row in report.get('discrepancies', [])):
+                problems.append("scratch account reported as drifted")
+            if report.get('accounts') != len(accounts):
+                problems.append(f"checked {report.get('accounts')} accounts, /accounts has {len(accounts)}")
+            if abs((scratch.get('balance') or 0) - 500) > 0.01 or abs((scratch.get('openingBalance') or 0) - 450) > 0.01:
+                problems.append(f"balance/openingBalance {scratch.get('balance')}/{scratch.get('openingBalance')} != 500/450")
+            if report.get('corrected') != 0:
+                problems.append("GET corrected balances")
+            
+            success = response.status_code == 200 and not problems
+            self.log_test(
+                "Reconciliation - Balance Drift",
+                success,
+                f"{report.get('accounts')} accounts checked, {len(report.get('discrepancies', []))} drifted" if success else "Reconciliation report is wrong",
+                f"Status: {response.status_code}, Problems: {problems}",
+                critical=True
+            )
+        except Exception as e:
+            self.log_test("Reconciliation - Balance Drift", False, "Failed to check balance reconciliation", str(e), critical=True)
+        finally:
+            if account_id:
+                self.session.delete(f"{API_BASE}/accounts", params={'id': account_id}, timeout=30)
+    
+    def checks(self):
+        """Independent checks for a full separated routes run"""
+        return [
+            # Test separated API routes authentication
+            *fan_out(self.check_separated_route_authentication, SEPARATED_ROUTES),
+            
+            # Test user creation flow
+            self.test_user_creation_flow,
+            
+            # Test data integration
+            self.test_data_integration_and_demo_data,
+            
+            # Test API response format
+            self.test_api_response_format,
+            
+            # Test separated routes functionality
+            self.test_separated_routes_functionality,
+            
+            # Test cursor pagination of GET /api/transactions
+            *fan_out(self.check_transactions_page_walk, PAGE_WALK_SIZES),
+            self.check_transactions_page_size_cap,
+            self.check_transactions_invalid_cursor,
+            
+            # Test sparse fields= selection on the list endpoints
+            *fan_out(self.check_sparse_fields, SPARSE_FIELD_CASES),
+            self.check_unknown_field_rejected,
+            
+            # Test server-side category usage statistics
+            self.check_category_stats,
+            
+            # Test SQL-bucketed reports
+            *fan_out(self.check_report_buckets, list(REPORT_BUCKETS)),
+            self.check_report_invalid_bucket,
+            
+            # Test the composite dashboard endpoint
+            self.check_dashboard_matches_endpoints
+        ]
+    
+    def write_checks(self):
+        """Checks that write transactions, kept out of the read checks' way"""
+        return [
+            # Test balance reconciliation against the ledger
+            self.check_reconcile_tracks_writes
+        ]
+    
+    def print_recommendations(self, passed, failed, critical_failed):
+        """Print recommendations and next steps for the separated routes"""
         print(f"\n💡 RECOMMENDATIONS:")
         
         if critical_failed == 0:
@@ -727,6 +996,18 @@ class SeparatedRoutesBackendTester:
                     failed_categories.add('format')
                 elif 'Separated Routes' in issue['test']:
                     failed_categories.add('routes')
+                elif 'Pagination' in issue['test']:
+                    failed_categories.add('pagination')
+                elif 'Field Selection' in issue['test']:
+                    failed_categories.add('fields')
+                elif 'Category Stats' in issue['test']:
+                    failed_categories.add('category stats')
+                elif 'Reports' in issue['test']:
+                    failed_categories.add('reports')
+                elif 'Dashboard' in issue['test']:
+                    failed_categories.add('dashboard')
+                elif 'Reconciliation' in issue['test']:
+                    failed_categories.add('reconciliation')
             
             if 'auth' in failed_categories:
                 print("      - Fix authentication issues in separated routes")
@@ -738,6 +1019,18 @@ class SeparatedRoutesBackendTester:
                 print("      - Standardize API response format across all routes")
             if 'routes' in failed_categories:
                 print("      - Complete route separation implementation")
+            if 'pagination' in failed_categories:
+                print("      - Fix keyset pagination of GET /api/transactions (cursor, ordering, page-size cap)")
+            if 'fields' in failed_categories:
+                print("      - Fix fields=/include= selection on the list endpoints (lib/fields.js)")
+            if 'category stats' in failed_categories:
+                print("      - Fix the grouped transactionCount/totalAmount in GET /api/categories?stats=true")
+            if 'reports' in failed_categories:
+                print("      - Fix the bucketed series in GET /api/reports (lib/reports.js)")
+            if 'dashboard' in failed_categories:
+                print("      - Fix GET /api/dashboard so it matches analytics, transactions, accounts and budgets")
+            if 'reconciliation' in failed_categories:
+                print("      - Fix openingBalance bookkeeping or the drift query in lib/reconcile.js")
         
         print(f"\n📝 Next Steps:")
         if critical_failed == 0:
@@ -747,8 +1040,6 @@ class SeparatedRoutesBackendTester:
         else:
             print("   🔧 Fix critical separated routes issues first")
             print("   🔄 Re-run tests after fixes")
-        
-        return passed_tests, failed_tests, critical_failed
 
 if __name__ == "__main__":
     tester = SeparatedRoutesBackendTester()
@@ -758,12 +1049,11 @@ if __name__ == "__main__":
     if critical > 0:
         print(f"\n🚨 CRITICAL ISSUES FOUND: {critical}")
         print("Fix critical issues before proceeding to frontend testing.")
-        exit(2)  # Critical issues
     elif failed > 0:
         print(f"\n⚠️  MINOR ISSUES FOUND: {failed}")
         print("Consider fixing minor issues but can proceed with caution.")
-        exit(1)  # Minor issues
     else:
         print(f"\n🎉 ALL TESTS PASSED!")
         print("Separated API routes are ready for frontend integration testing.")
-        exit(0)  # Success
\ No newline at end of file
+    
+    exit(exit_code(failed, critical))
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+Finance Wizard API test tooling
+Shared pooled client, result recorder, reporter and concurrent runner for the
+test suites. Suites and helpers are imported on first use, so a targeted run
+only loads (and connects) what it needs.
+"""
+
+import importlib
+
+# Suite name -> (module, tester class); the suite scripts live at the repo root
+SUITES = {
+    'backend': ('backend_test', 'Phase3BackendTester'),
+    'separated': ('separated_routes_test', 'SeparatedRoutesBackendTester'),
+    'auth': ('auth_api_test', 'ClerkAuthAPITester'),
+    'frontend': ('frontend_api_integration_test', 'FrontendAPIIntegrationTester'),
+    'export': ('export_test_focused', 'ExportFunctionalityTester'),
+}
+
+# Public helpers and the submodule that provides them
+_LAZY_ATTRS = {
+    'BaseTester': 'tests.base',
+    'ResultRecorder': 'tests.recorder',
+    'Reporter': 'tests.reporter',
+    'AsyncCheckRunner': 'tests.runner',
+    'get_session': 'tests.client',
+}
+
+
+def load_suite(name):
+    """Import a suite module on demand and return its tester class"""
+    try:
+        module_name, class_name = SUITES[name]
+    except KeyError:
+        raise ValueError(f"Unknown test suite '{name}'. Available: {', '.join(SUITES)}") from None
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    raise AttributeError(f"module 'tests' has no attribute '{name}'")
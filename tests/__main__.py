@@ -0,0 +1,50 @@
+"""
+Run Finance Wizard API test suites from one entry point
+
+    python -m tests                    # every suite
+    python -m tests auth frontend      # only the named suites
+    python -m tests --concurrency 16   # more checks in flight
+
+Only the requested suites are imported, and they share one pooled session.
+"""
+
+import argparse
+import sys
+
+from tests import SUITES, load_suite
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests', description='Run Finance Wizard API test suites')
+    parser.add_argument('suites', nargs='*', metavar='suite',
+                        help=f"suites to run (default: all) - {', '.join(SUITES)}")
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help='maximum checks in flight per suite (default: TEST_CONCURRENCY or 8)')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+
+    from tests.base import exit_code
+    from tests.client import close_session, get_session
+
+    # Size the shared session's pool for --concurrency before any suite takes it
+    get_session(pool_size=args.concurrency)
+
+    totals = {'failed': 0, 'critical': 0}
+    try:
+        for name in args.suites or list(SUITES):
+            tester = load_suite(name)()
+            _, failed, critical = tester.run_all_tests(args.concurrency)
+            totals['failed'] += failed
+            totals['critical'] += critical
+    finally:
+        close_session()
+
+    print(f"\n📦 Suites run: {', '.join(args.suites or SUITES)}")
+    print(f"❌ Failed: {totals['failed']}  🚨 Critical: {totals['critical']}")
+    return exit_code(totals['failed'], totals['critical'])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
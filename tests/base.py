@@ -0,0 +1,79 @@
+"""
+Base class for the Finance Wizard API test suites
+Wires a suite to the shared pooled client, result recorder, reporter and
+concurrent runner so each suite only defines its checks
+"""
+
+from tests.client import get_session
+from tests.recorder import ResultRecorder
+from tests.reporter import Reporter
+from tests.runner import AsyncCheckRunner
+
+
+class BaseTester:
+    # Start-of-run banner lines, summary heading and [(category, [test name markers])]
+    # breakdown, set by each suite
+    BANNER = []
+    SUMMARY_TITLE = "TESTING SUMMARY"
+    SUMMARY_CATEGORIES = []
+
+    def __init__(self, session=None):
+        self.session = session or get_session()
+        self.recorder = ResultRecorder()
+        self.reporter = Reporter(self.SUMMARY_TITLE, self.SUMMARY_CATEGORIES)
+
+    @property
+    def test_results(self):
+        return self.recorder.test_results
+
+    @property
+    def critical_issues(self):
+        return self.recorder.critical_issues
+
+    def log_test(self, test_name, success, message, details=None, critical=False):
+        """Log test results"""
+        return self.recorder.log_test(test_name, success, message, details, critical)
+
+    def checks(self):
+        """Independent checks for a full run, in report order"""
+        raise NotImplementedError
+
+    def write_checks(self):
+        """Checks that change shared data, run after every check in checks() has finished"""
+        return []
+
+    def run_checks(self, concurrency=None):
+        """Run the suite's checks through the concurrent runner, then its write checks"""
+        runner = AsyncCheckRunner(self.log_test, concurrency)
+        timings = runner.run(self.checks())
+        write_checks = self.write_checks()
+        if write_checks:
+            timings += runner.run(write_checks)
+        return timings
+
+    def print_recommendations(self, passed, failed, critical):
+        """Suite-specific advice printed after the summary"""
+
+    def generate_summary(self):
+        """Generate comprehensive test summary"""
+        passed, failed, critical = self.reporter.print_summary(self.recorder)
+        self.print_recommendations(passed, failed, critical)
+        return passed, failed, critical
+
+    def run_all_tests(self, concurrency=None):
+        """Run every check and print the summary"""
+        for line in self.BANNER:
+            print(line)
+        print("=" * 80)
+
+        self.run_checks(concurrency)
+        return self.generate_summary()
+
+
+def exit_code(failed, critical):
+    """Exit status shared by the suites: 2 for critical issues, 1 for minor ones"""
+    if critical > 0:
+        return 2
+    if failed > 0:
+        return 1
+    return 0
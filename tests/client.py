@@ -0,0 +1,74 @@
+"""
+Pooled HTTP client shared by the Finance Wizard API test suites
+One requests.Session per process, created on first use and sized for the
+concurrent runner so parallel checks reuse keep-alive connections
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from tests.runner import DEFAULT_CONCURRENCY
+
+# Get base URL from environment
+BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://cashflow-182.preview.emergentagent.com')
+API_BASE = f"{BASE_URL}/api"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_size=None):
+    """Create a session whose connection pool can serve every concurrent check"""
+    pool_size = max(pool_size or DEFAULT_CONCURRENCY, 10)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session(pool_size=None):
+    """Return the process-wide pooled session, creating it on first use
+
+    pool_size only applies to that first call, so a runner with more checks
+    in flight than DEFAULT_CONCURRENCY should ask for the session first.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session(pool_size)
+    return _session
+
+
+def close_session():
+    """Close the shared session and its pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def iter_pages(session, path, limit=None, timeout=30, max_pages=10000, **params):
+    """Yield each page's rows from a cursor-paginated endpoint, following nextCursor to the end"""
+    cursor = None
+    for _ in range(max_pages):
+        query = dict(params)
+        if limit:
+            query['limit'] = limit
+        if cursor:
+            query['cursor'] = cursor
+        response = session.get(f"{API_BASE}{path}", params=query, timeout=timeout)
+        response.raise_for_status()
+        body = response.json()
+        if not body.get('success'):
+            raise ValueError(f"{path} returned an error: {body.get('error')}")
+        yield body['data']
+        cursor = body.get('nextCursor')
+        if not cursor:
+            return
+    raise RuntimeError(f"{path} still had a nextCursor after {max_pages} pages")
@@ -0,0 +1,23 @@
+"""
+Direct SQLite access to the Prisma development database for test tooling
+"""
+
+import os
+import sqlite3
+
+# Prisma's datasource is "file:./dev.db", relative to prisma/schema.prisma
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.getenv('DATABASE_PATH', os.path.join(REPO_ROOT, 'prisma', 'dev.db'))
+
+
+def connect(path=None):
+    """Open the development database; fails instead of creating an empty file"""
+    path = path or DEFAULT_DB_PATH
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"SQLite database not found: {path}")
+    return sqlite3.connect(path)
+
+
+def table_counts(conn, tables=('users', 'accounts', 'categories', 'subcategories', 'transactions', 'budgets')):
+    """Row count per table, so results can be tied to the dataset size"""
+    return {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
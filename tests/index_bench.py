@@ -0,0 +1,192 @@
+"""
+Index benchmark for the hot transaction queries
+Runs the SQL behind GET /api/transactions, /api/budgets and /api/analytics
+against a copy of the SQLite database twice: once without the Transaction
+indexes from prisma/schema.prisma and once with them. Captures EXPLAIN QUERY
+PLAN and latency percentiles for each query and writes them to a JSON report
+
+    python -m tests.ledger --transactions 1000000
+    python -m tests.index_bench --runs 50
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from tests.db import connect
+from tests.stats import summarize_latencies
+
+# Must match the @@index list on the Transaction model (Prisma's default names)
+INDEXES = {
+    'transactions_userId_date_id_description_idx': '("userId", "date", "id", "description")',
+    'transactions_userId_categoryId_date_id_idx': '("userId", "categoryId", "date", "id")',
+    'transactions_userId_accountId_date_id_idx': '("userId", "accountId", "date", "id")',
+    'transactions_userId_subcategoryId_date_id_idx': '("userId", "subcategoryId", "date", "id")',
+}
+
+PAGE = 51  # default page size + 1, as the transactions route fetches it
+ORDER = 'ORDER BY "date" DESC, "id" DESC'
+COLUMNS = '"id", "amount", "description", "date", "accountId", "categoryId", "subcategoryId"'
+
+# (name, SQL) - the query shapes Prisma generates for the API routes
+QUERIES = [
+    ('transactions: first page',
+     f'SELECT {COLUMNS} FROM "transactions" WHERE "userId" = :user {ORDER} LIMIT {PAGE}'),
+    ('transactions: deep keyset page',
+     f'SELECT {COLUMNS} FROM "transactions" WHERE "userId" = :user '
+     f'AND ("date" < :cursor_date OR ("date" = :cursor_date AND "id" < :cursor_id)) {ORDER} LIMIT {PAGE}'),
+    ('transactions: by category',
+     f'SELECT {COLUMNS} FROM "transactions" WHERE "userId" = :user AND "categoryId" = :category {ORDER} LIMIT {PAGE}'),
+    ('transactions: by account',
+     f'SELECT {COLUMNS} FROM "transactions" WHERE "userId" = :user AND "accountId" = :account {ORDER} LIMIT {PAGE}'),
+    ('transactions: by subcategory',
+     f'SELECT {COLUMNS} FROM "transactions" WHERE "userId" = :user AND "subcategoryId" = :subcategory {ORDER} LIMIT {PAGE}'),
+    ('transactions: date range',
+     f'SELECT {COLUMNS} FROM "transactions" WHERE "userId" = :user '
+     f'AND "date" >= :start AND "date" <= :end {ORDER} LIMIT {PAGE}'),
+    ('budgets: category spend in period',
+     'SELECT SUM("amount") FROM "transactions" WHERE "userId" = :user AND "categoryId" = :category '
+     'AND "date" >= :start AND "date" <= :end'),
+    ('totals by category in period',
+     'SELECT "categoryId", SUM("amount"), COUNT(*) FROM "transactions" WHERE "userId" = :user '
+     'AND "date" >= :start AND "date" <= :end GROUP BY "categoryId"'),
+]
+
+
+def sample_parameters(conn, user_id=None):
+    """Pick the busiest user (or the given one) and real ids and dates from their ledger"""
+    if not user_id:
+        row = conn.execute('SELECT "userId" FROM "transactions" GROUP BY "userId" ORDER BY COUNT(*) DESC LIMIT 1').fetchone()
+        if not row:
+            raise ValueError('No transactions to benchmark; generate some with python -m tests.ledger')
+        user_id = row[0]
+
+    def one(sql):
+        return conn.execute(sql, (user_id,)).fetchone()
+
+    newest, = one('SELECT MAX("date") FROM "transactions" WHERE "userId" = ?')
+    count, = one('SELECT COUNT(*) FROM "transactions" WHERE "userId" = ?')
+    # A cursor halfway through the ledger stands in for a deep page
+    cursor_date, cursor_id = conn.execute(
+        f'SELECT "date", "id" FROM "transactions" WHERE "userId" = ? {ORDER} LIMIT 1 OFFSET ?',
+        (user_id, count // 2)).fetchone()
+    category, = one('SELECT "categoryId" FROM "transactions" WHERE "userId" = ? GROUP BY "categoryId" ORDER BY COUNT(*) DESC LIMIT 1')
+    account, = one('SELECT "accountId" FROM "transactions" WHERE "userId" = ? GROUP BY "accountId" ORDER BY COUNT(*) DESC LIMIT 1')
+    subcategory = one('SELECT "subcategoryId" FROM "transactions" WHERE "userId" = ? AND "subcategoryId" IS NOT NULL LIMIT 1')
+
+    return {
+        'user': user_id,
+        'user_transactions': count,
+        'cursor_date': cursor_date,
+        'cursor_id': cursor_id,
+        'category': category,
+        'account': account,
+        'subcategory': subcategory[0] if subcategory else None,
+        # The most recent 30 days, like the current-month dashboard queries
+        'start': newest - 30 * 86400000,
+        'end': newest,
+    }
+
+
+def set_indexes(conn, enabled):
+    with conn:
+        for name, columns in INDEXES.items():
+            if enabled:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "transactions"{columns}')
+            else:
+                conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+def measure(conn, sql, params, runs):
+    """Query plan and latency of one query"""
+    plan = [row[-1] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+    conn.execute(sql, params).fetchall()  # warm the page cache
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append(time.perf_counter() - started)
+    return {'plan': plan, 'latency': summarize_latencies(timings)}
+
+
+def run(conn, params, runs):
+    results = []
+    for label, enabled in (('before', False), ('after', True)):
+        set_indexes(conn, enabled)
+        print(f"\n{'📉' if not enabled else '📈'} {label.title()}: Transaction indexes {'created' if enabled else 'dropped'}")
+        for name, sql in QUERIES:
+            result = measure(conn, sql, params, runs)
+            results.append({'query': name, 'indexes': label, **result})
+            print(f"   {name:<40} p50 {result['latency']['p50_ms']:>9}ms  p95 {result['latency']['p95_ms']:>9}ms  "
+                  f"{' | '.join(result['plan'])}")
+    return results
+
+
+def print_comparison(results):
+    print("\n📊 p50 speedup with indexes:")
+    by_query = {}
+    for result in results:
+        by_query.setdefault(result['query'], {})[result['indexes']] = result['latency']['p50_ms']
+    for name, latency in by_query.items():
+        before, after = latency['before'], latency['after']
+        speedup = f"{before / after:,.1f}x" if after else 'n/a'
+        print(f"   {name:<40} {before:>9}ms -> {after:>9}ms  ({speedup})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.index_bench', description='Measure the Transaction indexes on SQLite')
+    parser.add_argument('--db', default=None, help='SQLite database to copy (default: prisma/dev.db)')
+    parser.add_argument('--user', default=None, help='user id to query as (default: the one with most transactions)')
+    parser.add_argument('--runs', type=int, default=20, help='timed runs per query (default: %(default)s)')
+    parser.add_argument('--in-place', action='store_true',
+                        help='benchmark the database itself instead of a copy; leaves the indexes created')
+    parser.add_argument('--output', default='index_bench.json', help='JSON report path (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    source = connect(args.db)
+    source_path = source.execute('PRAGMA database_list').fetchone()[2]
+    source.close()
+
+    workdir = None
+    path = source_path
+    if not args.in_place:
+        # Dropping indexes must not touch the real database
+        workdir = tempfile.mkdtemp(prefix='index-bench-')
+        path = os.path.join(workdir, 'bench.db')
+        shutil.copyfile(source_path, path)
+
+    conn = connect(path)
+    try:
+        params = sample_parameters(conn, args.user)
+        print("🚀 Transaction Index Benchmark")
+        print(f"📍 Database: {source_path}{'' if args.in_place else ' (copy)'}")
+        print(f"👤 User {params['user']} with {params['user_transactions']:,} transactions")
+        print("=" * 80)
+
+        results = run(conn, params, args.runs)
+        print_comparison(results)
+
+        report = {
+            'database': source_path,
+            'total_transactions': conn.execute('SELECT COUNT(*) FROM "transactions"').fetchone()[0],
+            'parameters': params,
+            'runs': args.runs,
+            'indexes': INDEXES,
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {args.output}")
+    finally:
+        conn.close()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Synthetic large-ledger generator for scale testing
+Writes users, accounts, categories, subcategories and millions of
+transactions straight into the Prisma SQLite database with batched inserts
+inside a single transaction. The same seed always produces the same ledger.
+
+    python -m tests.ledger --transactions 1000000
+    python -m tests.ledger --users 50 --transactions 5000000 --db /tmp/scale.db
+
+Generated users get clerkIds starting with "synthetic_<seed>_"; re-running
+with the same seed replaces that data, --purge removes it.
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from tests.db import connect, table_counts
+from tests.rollups import backfill
+
+DEFAULT_SEED = 42
+DEFAULT_BATCH_SIZE = 10000
+
+# (name, type, [subcategories], (min amount, max amount), merchants)
+CATEGORIES = [
+    ('Salary', 'INCOME', [], (2500, 9000), ['Monthly Salary', 'Payroll Deposit', 'Annual Bonus']),
+    ('Freelance', 'INCOME', ['Consulting', 'Design'], (150, 2500), ['Client Payment', 'Upwork Payout', 'Invoice Settlement']),
+    ('Interest', 'INCOME', [], (1, 120), ['Savings Interest', 'FD Interest']),
+    ('Food & Dining', 'EXPENSE', ['Restaurants', 'Groceries', 'Coffee'], (3, 180),
+     ['Whole Foods', 'Restaurant Dinner', 'Coffee Shop', 'Pizza Place', 'Farmers Market', 'Bakery']),
+    ('Transportation', 'EXPENSE', ['Gas', 'Public Transport', 'Ride Share'], (2, 90),
+     ['Gas Station Fill-up', 'Metro Card', 'Uber Trip', 'Parking Fee', 'Toll Charge']),
+    ('Shopping', 'EXPENSE', ['Clothing', 'Electronics', 'Home'], (5, 600),
+     ['Online Shopping - Amazon', 'Clothing Store', 'Electronics Store', 'Home Goods']),
+    ('Utilities', 'EXPENSE', ['Electricity', 'Internet', 'Water'], (20, 250),
+     ['Electricity Bill', 'Internet Bill', 'Water Bill', 'Mobile Recharge']),
+    ('Entertainment', 'EXPENSE', ['Streaming', 'Movies'], (5, 120), ['Netflix', 'Movie Tickets', 'Concert', 'Spotify']),
+    ('Health', 'EXPENSE', ['Pharmacy', 'Doctor'], (10, 400), ['Pharmacy', 'Doctor Visit', 'Gym Membership']),
+    ('Travel', 'EXPENSE', ['Flights', 'Hotels'], (50, 1500), ['Flight Booking', 'Hotel Stay', 'Train Ticket']),
+]
+
+ACCOUNTS = [('Checking', 'BANK', 5000), ('Savings', 'BANK', 20000), ('Cash Wallet', 'WALLET', 300), ('Credit Card', 'CREDIT_CARD', 0)]
+
+# Share of transactions drawn from income categories; the rest are expenses
+INCOME_SHARE = 0.08
+
+
+def synthetic_prefix(seed):
+    return f"synthetic_{seed}_"
+
+
+def make_id(kind, seed, index):
+    """Deterministic cuid-shaped id: unique per kind, seed and index"""
+    return f"c{kind}{seed:x}z{index:010x}"
+
+
+def purge(conn, seed):
+    """Delete everything owned by the synthetic users of a seed"""
+    pattern = synthetic_prefix(seed) + '%'
+    users = "SELECT id FROM users WHERE clerkId LIKE ?"
+    conn.execute(f'UPDATE users SET defaultAccountId = NULL WHERE id IN ({users})', (pattern,))
+    conn.execute(f'DELETE FROM transactions WHERE userId IN ({users})', (pattern,))
+    conn.execute(f'DELETE FROM budgets WHERE userId IN ({users})', (pattern,))
+    conn.execute(f'DELETE FROM subcategories WHERE categoryId IN (SELECT id FROM categories WHERE userId IN ({users}))', (pattern,))
+    conn.execute(f'DELETE FROM categories WHERE userId IN ({users})', (pattern,))
+    conn.execute(f'DELETE FROM accounts WHERE userId IN ({users})', (pattern,))
+    return conn.execute('DELETE FROM users WHERE clerkId LIKE ?', (pattern,)).rowcount
+
+
+class LedgerGenerator:
+    def __init__(self, conn, seed=DEFAULT_SEED, users=10, months=24, batch_size=DEFAULT_BATCH_SIZE):
+        self.conn = conn
+        self.seed = seed
+        self.users = users
+        self.months = months
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        # Fixed "now" so the same seed yields the same dates on any day
+        self.end = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.start = self.end - timedelta(days=30 * months)
+        self.now_ms = int(self.end.timestamp() * 1000)
+
+    def create_reference_data(self):
+        """Insert users, accounts, categories and subcategories; return per-user lookup tables"""
+        ledgers = []
+        user_rows, category_rows, subcategory_rows = [], [], []
+        account_index = category_index = subcategory_index = 0
+
+        for u in range(self.users):
+            user_id = make_id('u', self.seed, u)
+            ledger = {'user_id': user_id, 'accounts': [], 'income': [], 'expense': []}
+
+            for name, account_type, opening in ACCOUNTS:
+                account_id = make_id('a', self.seed, account_index)
+                account_index += 1
+                ledger['accounts'].append([account_id, account_type, opening, 0.0])
+
+            for name, category_type, subcategories, amount_range, merchants in CATEGORIES:
+                category_id = make_id('c', self.seed, category_index)
+                category_index += 1
+                category_rows.append((category_id, name, category_type, user_id, self.now_ms, self.now_ms))
+                subcategory_ids = []
+                for subcategory in subcategories:
+                    subcategory_id = make_id('s', self.seed, subcategory_index)
+                    subcategory_index += 1
+                    subcategory_ids.append(subcategory_id)
+                    subcategory_rows.append((subcategory_id, subcategory, category_id, self.now_ms, self.now_ms))
+                bucket = ledger['income'] if category_type == 'INCOME' else ledger['expense']
+                bucket.append((category_id, subcategory_ids, amount_range, merchants))
+
+            user_rows.append((user_id, f"{synthetic_prefix(self.seed)}{u}", f"synthetic.{self.seed}.{u}@example.com",
+                              'Synthetic', f"User {u}", ledger['accounts'][0][0], self.now_ms, self.now_ms))
+            ledgers.append(ledger)
+
+        # Users point at their default account, so accounts go in after users with FKs deferred
+        self.conn.execute('PRAGMA defer_foreign_keys = ON')
+        self.conn.executemany(
+            'INSERT INTO users (id, clerkId, email, firstName, lastName, defaultAccountId, createdAt, updatedAt) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', user_rows)
+        self.conn.executemany(
+            'INSERT INTO categories (id, name, type, userId, createdAt, updatedAt) VALUES (?, ?, ?, ?, ?, ?)', category_rows)
+        self.conn.executemany(
+            'INSERT INTO subcategories (id, name, categoryId, createdAt, updatedAt) VALUES (?, ?, ?, ?, ?)', subcategory_rows)
+        return ledgers
+
+    def transaction_rows(self, ledgers, count):
+        """Yield transaction rows, tracking each account's running balance"""
+        rand = self.random.random
+        randrange = self.random.randrange
+        choice = self.random.choice
+        start_ms = int(self.start.timestamp() * 1000)
+        # Dates are whole days, like the ones the transaction form submits
+        days = (self.end - self.start).days
+        day_ms = 86400000
+
+        for index in range(count):
+            ledger = ledgers[index % len(ledgers)]
+            is_income = rand() < INCOME_SHARE
+            category_id, subcategory_ids, (low, high), merchants = choice(ledger['income'] if is_income else ledger['expense'])
+            account = choice(ledger['accounts'][:2]) if is_income else choice(ledger['accounts'])
+            # Skew amounts toward the low end of the range, like real spending
+            amount = round(low + (high - low) * rand() ** 3, 2)
+            account[3] += amount if is_income else -amount
+            date = start_ms + randrange(days) * day_ms
+            subcategory_id = choice(subcategory_ids) if subcategory_ids and rand() < 0.7 else None
+            yield (make_id('t', self.seed, index), amount, choice(merchants), date, account[0],
+                   category_id, subcategory_id, ledger['user_id'], date, date)
+
+    def insert_transactions(self, ledgers, count):
+        sql = ('INSERT INTO transactions (id, amount, description, date, accountId, categoryId, subcategoryId, '
+               'userId, createdAt, updatedAt) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+        rows = self.transaction_rows(ledgers, count)
+        inserted = 0
+        while inserted < count:
+            batch = [row for _, row in zip(range(self.batch_size), rows)]
+            self.conn.executemany(sql, batch)
+            inserted += len(batch)
+            print(f"\r   {inserted:,}/{count:,} transactions", end='', flush=True)
+        print()
+
+    def insert_accounts(self, ledgers):
+        """Accounts go in last so their balance matches opening balance plus generated activity"""
+        rows = []
+        for ledger in ledgers:
+            for (account_id, account_type, opening, delta), (name, _, _) in zip(ledger['accounts'], ACCOUNTS):
+                rows.append((account_id, name, account_type, round(opening + delta, 2), opening,
+                             account_id == ledger['accounts'][0][0], ledger['user_id'], self.now_ms, self.now_ms))
+        self.conn.executemany(
+            'INSERT INTO accounts (id, name, type, balance, openingBalance, isDefault, userId, createdAt, updatedAt) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def generate(self, transactions):
+        """Replace this seed's synthetic ledger in one transaction"""
+        with self.conn:
+            removed = purge(self.conn, self.seed)
+            if removed:
+                print(f"🧹 Removed {removed} synthetic users from a previous run")
+            ledgers = self.create_reference_data()
+            self.insert_transactions(ledgers, transactions)
+            self.insert_accounts(ledgers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.ledger', description='Generate a large synthetic ledger in SQLite')
+    parser.add_argument('--transactions', type=int, default=1000000, help='transactions to create (default: %(default)s)')
+    parser.add_argument('--users', type=int, default=10, help='synthetic users to spread them across (default: %(default)s)')
+    parser.add_argument('--months', type=int, default=24, help='months of history (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='random seed (default: %(default)s)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='rows per executemany batch')
+    parser.add_argument('--db', default=None, help='SQLite database path (default: prisma/dev.db)')
+    parser.add_argument('--purge', action='store_true', help="remove this seed's synthetic data and exit")
+    args = parser.parse_args(argv)
+
+    if args.users < 1 or args.transactions < 0 or args.months < 1:
+        parser.error('--users and --months must be positive and --transactions not negative')
+
+    conn = connect(args.db)
+    # Bulk-load settings; durability of a regenerable dataset is not a concern
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA foreign_keys = ON')
+
+    try:
+        if args.purge:
+            with conn:
+                removed = purge(conn, args.seed)
+            print(f"🧹 Removed {removed} synthetic users for seed {args.seed}")
+            return 0
+
+        print(f"🏗️  Generating {args.transactions:,} transactions for {args.users} users (seed {args.seed})")
+        started = time.perf_counter()
+        LedgerGenerator(conn, seed=args.seed, users=args.users, months=args.months,
+                        batch_size=args.batch_size).generate(args.transactions)
+        elapsed = time.perf_counter() - started
+
+        rate = args.transactions / elapsed if elapsed else 0
+        print(f"✅ Done in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+        print(f"📊 Dataset: {table_counts(conn)}")
+
+        # Bulk inserts bypass the API, so bring the monthly rollup back in step
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'monthly_rollups'").fetchone():
+            buckets = backfill(conn)
+            print(f"📈 Rebuilt {buckets:,} monthly rollup buckets")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
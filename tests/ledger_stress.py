@@ -0,0 +1,242 @@
+"""
+Concurrency stress test for transaction writes and account balances
+Creates two empty scratch accounts, then fires hundreds of parallel creates,
+updates (moving rows between the accounts) and deletes (including the same
+row deleted twice at once) through /api/transactions. Afterwards every
+scratch account's balance must equal the signed sum of its transactions
+
+    python -m tests.ledger_stress
+    python -m tests.ledger_stress --creates 500 --workers 64 --keep
+    python -m tests.ledger_stress --db prisma/dev.db   # also verify monthly_rollups
+
+A 404 on the second of two deletes and a 409 on an update that lost a race
+are expected answers, not errors; anything else non-2xx is reported.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+
+from tests.client import API_BASE, create_session, iter_pages
+from tests.stats import summarize_latencies
+
+# Float sums can differ in the last digits depending on summation order
+TOLERANCE = 0.005
+MAX_ERROR_SAMPLES = 5
+
+
+class LedgerStress:
+    def __init__(self, workers=32, timeout=60, seed=None):
+        self.workers = workers
+        self.timeout = timeout
+        self.session = create_session(pool_size=workers)
+        self.random = random.Random(seed)
+        self.samples = []
+
+    def _call(self, kind, method, path, expected=(), **kwargs):
+        """One API call; returns the parsed body, or None for an expected or failed response"""
+        sample = {'kind': kind, 'status': None, 'error': None}
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, f"{API_BASE}{path}", timeout=self.timeout, **kwargs)
+            sample['status'] = response.status_code
+            if response.status_code in expected:
+                return None
+            body = response.json()
+            if response.status_code >= 400 or not body.get('success'):
+                sample['error'] = f"{kind}: HTTP {response.status_code}: {response.text[:200]}"
+                return None
+            return body.get('data')
+        except (requests.exceptions.RequestException, ValueError) as e:
+            sample['error'] = f"{kind}: {e}"
+            return None
+        finally:
+            sample['latency'] = time.perf_counter() - started
+            self.samples.append(sample)
+
+    def setup(self):
+        """Two zero-balance scratch accounts plus an income and an expense category"""
+        stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        accounts = [
+            self._call('setup', 'POST', '/accounts', json={'name': f"Ledger stress {stamp} {i}", 'type': 'BANK', 'balance': 0})
+            for i in (1, 2)
+        ]
+        if not all(accounts):
+            raise RuntimeError(f"Could not create scratch accounts: {self.errors()}")
+
+        categories = self._call('setup', 'GET', '/categories') or []
+        by_type = {}
+        for category in categories:
+            by_type.setdefault(category['type'], category)
+        for kind in ('INCOME', 'EXPENSE'):
+            if kind not in by_type:
+                by_type[kind] = self._call('setup', 'POST', '/categories', json={'name': f"Ledger stress {kind.lower()}", 'type': kind})
+        if not all(by_type.get(kind) for kind in ('INCOME', 'EXPENSE')):
+            raise RuntimeError(f"Could not find or create categories: {self.errors()}")
+        return [account['id'] for account in accounts], [by_type['INCOME']['id'], by_type['EXPENSE']['id']]
+
+    def _payload(self, account_ids, category_ids):
+        return {
+            'amount': round(self.random.uniform(1, 500), 2),
+            'description': 'Ledger stress',
+            'date': (datetime.now() - timedelta(days=self.random.randint(0, 90))).isoformat(),
+            'accountId': self.random.choice(account_ids),
+            'categoryId': self.random.choice(category_ids),
+        }
+
+    def run(self, creates, account_ids, category_ids):
+        """Create `creates` rows, then update, delete (twice) and create more, all in parallel"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            payloads = [self._payload(account_ids, category_ids) for _ in range(creates)]
+            created = [row for row in pool.map(lambda p: self._call('create', 'POST', '/transactions', json=p), payloads) if row]
+
+            self.random.shuffle(created)
+            quarter = len(created) // 4
+            to_delete, to_update = created[:quarter * 2], created[quarter * 2:quarter * 3]
+            jobs = []
+            for row in to_delete:
+                # Each row deleted twice at once: exactly one may reverse the balance
+                jobs += [('delete', row['id'])] * 2
+            for row in to_update:
+                jobs.append(('update', {'id': row['id'], **self._payload(account_ids, category_ids)}))
+            for _ in range(creates // 2):
+                jobs.append(('create', self._payload(account_ids, category_ids)))
+            self.random.shuffle(jobs)
+
+            def fire(job):
+                kind, arg = job
+                if kind == 'delete':
+                    return self._call(kind, 'DELETE', '/transactions', expected=(404,), params={'id': arg})
+                if kind == 'update':
+                    return self._call(kind, 'PUT', '/transactions', expected=(409,), json=arg)
+                return self._call(kind, 'POST', '/transactions', json=arg)
+
+            list(pool.map(fire, jobs))
+
+    def verify(self, account_ids):
+        """Each account's stored balance against the signed sum of its transactions"""
+        balances = {a['id']: a['balance'] for a in self._call('verify', 'GET', '/accounts', params={'fields': 'id,balance'}) or []}
+        results = []
+        for account_id in account_ids:
+            rows = [row for page in iter_pages(self.session, '/transactions', limit=200, accountId=account_id,
+                                               fields='amount,category.type') for row in page]
+            expected = sum(row['amount'] if row['category']['type'] == 'INCOME' else -row['amount'] for row in rows)
+            balance = balances.get(account_id)
+            results.append({
+                'account': account_id,
+                'transactions': len(rows),
+                'balance': None if balance is None else round(balance, 2),
+                'expected': round(expected, 2),
+                'ok': balance is not None and abs(balance - expected) <= TOLERANCE,
+            })
+        return results
+
+    def cleanup(self, account_ids):
+        """Delete the scratch accounts; their transactions go with them"""
+        for account_id in account_ids:
+            self._call('cleanup', 'DELETE', '/accounts', params={'id': account_id})
+
+    def errors(self):
+        return [s['error'] for s in self.samples if s['error']]
+
+    def summary(self):
+        by_kind = {}
+        for sample in self.samples:
+            by_kind.setdefault(sample['kind'], []).append(sample)
+        return {
+            kind: {
+                'requests': len(samples),
+                'errors': sum(1 for s in samples if s['error']),
+                'statuses': {str(status): sum(1 for s in samples if s['status'] == status)
+                             for status in sorted({s['status'] for s in samples}, key=str)},
+                'latency': summarize_latencies([s['latency'] for s in samples]),
+            }
+            for kind, samples in by_kind.items()
+        }
+
+
+def verify_rollups(db_path):
+    """Re-aggregate monthly_rollups from the database, if it is reachable from here"""
+    from tests.db import connect
+    from tests.rollups import verify
+
+    with connect(db_path) as conn:
+        buckets, mismatches = verify(conn)
+    return {'buckets': buckets, 'mismatches': len(mismatches), 'samples': mismatches[:MAX_ERROR_SAMPLES]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.ledger_stress',
+                                     description='Hammer transaction writes and check account balances')
+    parser.add_argument('--creates', type=int, default=300, help='transactions created in the first wave (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=32, help='parallel requests (default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=60.0, help='per-request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for amounts, dates and ordering')
+    parser.add_argument('--keep', action='store_true', help='keep the scratch accounts for inspection')
+    parser.add_argument('--db', default=None, help='also verify monthly_rollups in this SQLite database')
+    parser.add_argument('--output', default='ledger_stress.json', help='JSON report path (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    print("🚀 Finance Wizard Ledger Stress Test")
+    print(f"📍 API Base: {API_BASE}")
+    print(f"🧵 {args.workers} workers, {args.creates} creates then {args.creates // 2} creates, "
+          f"{args.creates // 4} updates and {args.creates // 2} double deletes")
+    print("=" * 80)
+
+    stress = LedgerStress(workers=args.workers, timeout=args.timeout, seed=args.seed)
+    account_ids, category_ids = stress.setup()
+    started = time.perf_counter()
+    try:
+        stress.run(args.creates, account_ids, category_ids)
+        elapsed = time.perf_counter() - started
+        balances = stress.verify(account_ids)
+        rollups = verify_rollups(args.db) if args.db else None
+    finally:
+        if not args.keep:
+            stress.cleanup(account_ids)
+
+    summary = stress.summary()
+    for kind, stats in summary.items():
+        print(f"   {kind:<8} {stats['requests']:>5} requests  statuses {stats['statuses']}  "
+              f"p50 {stats['latency']['p50_ms']}ms  p95 {stats['latency']['p95_ms']}ms")
+    print(f"⏱️ Write phase took {elapsed:.2f}s")
+    for result in balances:
+        icon = "✅" if result['ok'] else "❌"
+        print(f"{icon} Account {result['account']}: balance {result['balance']} vs {result['expected']} "
+              f"from {result['transactions']} transactions")
+    if rollups:
+        print(f"{'✅' if not rollups['mismatches'] else '❌'} monthly_rollups: {rollups['mismatches']} "
+              f"of {rollups['buckets']} buckets differ")
+    errors = stress.errors()
+    if errors:
+        print(f"⚠️ {len(errors)} unexpected responses, e.g.:")
+        for error in errors[:MAX_ERROR_SAMPLES]:
+            print(f"   {error}")
+
+    report = {
+        'started_at': datetime.now().isoformat(),
+        'api_base': API_BASE,
+        'workers': args.workers,
+        'creates': args.creates,
+        'write_phase_s': round(elapsed, 3),
+        'requests': summary,
+        'balances': balances,
+        'rollups': rollups,
+        'error_samples': errors[:MAX_ERROR_SAMPLES],
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"📝 Report written to {args.output}")
+
+    consistent = all(result['ok'] for result in balances) and not (rollups and rollups['mismatches'])
+    return 0 if consistent and not errors else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
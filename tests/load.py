@@ -0,0 +1,167 @@
+"""
+Load generator for the Finance Wizard read APIs
+Drives fixed request rates against /api/transactions, /api/analytics and
+/api/budgets from a worker pool and writes latency percentiles, throughput
+and error rate per endpoint and rate to a JSON report
+
+    python -m tests.load --rates 5 10 20 --duration 30
+    python -m tests.load --endpoints "/transactions?limit=50" --rates 50 --output tx.json
+
+Latency is measured from each request's scheduled send time, so a server
+that falls behind shows up as queueing delay instead of a lower request rate.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+from tests.client import API_BASE, create_session
+from tests.stats import summarize_latencies
+
+DEFAULT_ENDPOINTS = ['/transactions', '/analytics', '/budgets']
+DEFAULT_OUTPUT = 'load_results.json'
+
+# Error samples kept per step, enough to diagnose without bloating the report
+MAX_ERROR_SAMPLES = 5
+
+
+def _row_count(response):
+    """Rows returned by a list endpoint, or None for non-list payloads"""
+    try:
+        data = response.json().get('data')
+    except ValueError:
+        return None
+    return len(data) if isinstance(data, list) else None
+
+
+class LoadGenerator:
+    def __init__(self, workers=16, timeout=30):
+        self.workers = workers
+        self.timeout = timeout
+        self.session = create_session(pool_size=workers)
+
+    def _fire(self, url, scheduled):
+        """Send one request and time it against its scheduled start"""
+        sent = time.perf_counter()
+        sample = {'status': None, 'error': None, 'bytes': 0, 'rows': None}
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            sample['status'] = response.status_code
+            sample['bytes'] = len(response.content)
+            if response.status_code >= 400:
+                sample['error'] = f"HTTP {response.status_code}: {response.text[:200]}"
+            else:
+                sample['rows'] = _row_count(response)
+        except requests.exceptions.RequestException as e:
+            sample['error'] = str(e)
+        finished = time.perf_counter()
+        sample['latency'] = finished - scheduled
+        sample['service_time'] = finished - sent
+        return sample
+
+    def run_step(self, endpoint, rate, duration):
+        """Issue `rate` requests per second for `duration` seconds and summarize them"""
+        url = f"{API_BASE}{endpoint}"
+        total = max(1, int(rate * duration))
+        interval = 1.0 / rate
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            started = time.perf_counter()
+            futures = []
+            for i in range(total):
+                scheduled = started + i * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(pool.submit(self._fire, url, scheduled))
+            samples = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+
+        errors = [s for s in samples if s['error']]
+        ok = [s for s in samples if not s['error']]
+        rows = [s['rows'] for s in ok if s['rows'] is not None]
+        return {
+            'endpoint': endpoint,
+            'target_rate': rate,
+            'duration_s': round(elapsed, 3),
+            'requests': len(samples),
+            'errors': len(errors),
+            'error_rate': round(len(errors) / len(samples), 4),
+            'throughput_rps': round(len(ok) / elapsed, 3) if elapsed else None,
+            'latency': summarize_latencies([s['latency'] for s in samples]),
+            'service_time': summarize_latencies([s['service_time'] for s in samples]),
+            'mean_response_bytes': round(sum(s['bytes'] for s in ok) / len(ok)) if ok else None,
+            'rows_returned': max(rows) if rows else None,
+            'error_samples': [s['error'] for s in errors[:MAX_ERROR_SAMPLES]],
+        }
+
+
+def dataset_size(db_path):
+    """Table row counts from the SQLite database, if it is reachable from here"""
+    from tests.db import connect, table_counts
+
+    try:
+        with connect(db_path) as conn:
+            return table_counts(conn)
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def print_step(step):
+    latency = step['latency']
+    print(f"   {step['endpoint']:<28} {step['target_rate']:>7.1f} rps  "
+          f"p50 {latency['p50_ms']}ms  p95 {latency['p95_ms']}ms  p99 {latency['p99_ms']}ms  "
+          f"throughput {step['throughput_rps']} rps  errors {step['error_rate'] * 100:.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.load', description='Load test the Finance Wizard read APIs')
+    parser.add_argument('--endpoints', nargs='+', default=DEFAULT_ENDPOINTS,
+                        help='API paths relative to /api, query strings allowed (default: %(default)s)')
+    parser.add_argument('--rates', nargs='+', type=float, default=[5.0],
+                        help='request rates to step through, per endpoint, in requests/second')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per endpoint and rate')
+    parser.add_argument('--workers', type=int, default=16, help='worker pool size')
+    parser.add_argument('--timeout', type=float, default=30.0, help='per-request timeout in seconds')
+    parser.add_argument('--db', default=None, help='SQLite database to read row counts from (default: prisma/dev.db)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='JSON report path (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    if any(rate <= 0 for rate in args.rates):
+        parser.error('--rates must be positive')
+
+    print("🚀 Finance Wizard API Load Test")
+    print(f"📍 API Base: {API_BASE}")
+    print("=" * 80)
+
+    generator = LoadGenerator(workers=args.workers, timeout=args.timeout)
+    report = {
+        'started_at': datetime.now().isoformat(),
+        'api_base': API_BASE,
+        'workers': args.workers,
+        'dataset': dataset_size(args.db),
+        'steps': [],
+    }
+    print(f"📊 Dataset: {report['dataset']}")
+
+    for rate in args.rates:
+        for endpoint in args.endpoints:
+            step = generator.run_step(endpoint, rate, args.duration)
+            report['steps'].append(step)
+            print_step(step)
+
+    report['finished_at'] = datetime.now().isoformat()
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📝 Report written to {args.output}")
+
+    return 1 if any(step['errors'] for step in report['steps']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Reconcile account balances with their transactions
+An account's balance should equal its openingBalance plus the signed sum of
+its transactions. `check` finds every account that drifted with one grouped
+query, and `apply` also corrects them with the same batched updates as
+POST /api/accounts/reconcile, inside one transaction (safe to run nightly while
+the app is up). Accounts that predate the openingBalance column have it null;
+`baseline` records it from today's balances (run once after `prisma db push`
+adds the column to an existing database), and `apply` refuses to run until then
+
+    python -m tests.reconcile check
+    python -m tests.reconcile apply --user <userId>
+    python -m tests.reconcile baseline --db /tmp/scale.db
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+
+from tests.db import connect
+
+# Float sums can differ in the last digits depending on summation order
+TOLERANCE = 0.005
+
+# Accounts per UPDATE statement, as in lib/reconcile.js
+CORRECTION_BATCH_SIZE = 500
+
+# Signed sum of one account's transactions, for the correlated baseline update
+NET_SQL = """
+    SELECT SUM(CASE WHEN c."type" = 'INCOME' THEN t."amount" ELSE -t."amount" END)
+    FROM "transactions" t
+    JOIN "categories" c ON c."id" = t."categoryId"
+    WHERE t."accountId" = "accounts"."id"
+"""
+
+# (id, userId, name, balance, expected) for each account whose balance is off;
+# INCOME adds to a balance, every other category type subtracts. Same query as
+# findBalanceDrift in lib/reconcile.js
+DRIFT_SQL = """
+    SELECT a."id", a."userId", a."name", a."balance", a."openingBalance" + COALESCE(s."net", 0) AS "expected"
+    FROM "accounts" a
+    LEFT JOIN (
+        SELECT t."accountId", SUM(CASE WHEN c."type" = 'INCOME' THEN t."amount" ELSE -t."amount" END) AS "net"
+        FROM "transactions" t
+        JOIN "categories" c ON c."id" = t."categoryId"
+        {transaction_where}
+        GROUP BY t."accountId"
+    ) s ON s."accountId" = a."id"
+    WHERE a."openingBalance" IS NOT NULL AND ABS(a."balance" - (a."openingBalance" + COALESCE(s."net", 0))) > ? {account_where}
+    ORDER BY a."userId", a."id"
+"""
+
+
+def find_drift(conn, user_id=None):
+    """Return the number of accounts checked, how many have no opening balance yet, and the ones whose balance is off"""
+    if user_id:
+        sql = DRIFT_SQL.format(transaction_where='WHERE t."userId" = ?', account_where='AND a."userId" = ?')
+        params = (user_id, TOLERANCE, user_id)
+        accounts, unbaselined = conn.execute(
+            'SELECT COUNT(*), COUNT(*) - COUNT("openingBalance") FROM "accounts" WHERE "userId" = ?', (user_id,)).fetchone()
+    else:
+        sql = DRIFT_SQL.format(transaction_where='', account_where='')
+        params = (TOLERANCE,)
+        accounts, unbaselined = conn.execute('SELECT COUNT(*), COUNT(*) - COUNT("openingBalance") FROM "accounts"').fetchone()
+
+    drift = [
+        {'id': row[0], 'user': row[1], 'name': row[2], 'balance': row[3], 'expected': row[4], 'difference': row[3] - row[4]}
+        for row in conn.execute(sql, params)
+    ]
+    return accounts, unbaselined, drift
+
+
+def correction_sql(size):
+    """The batched CASE update of correctBalances in lib/reconcile.js, for `size` accounts"""
+    cases = ' '.join(['WHEN ? THEN ?'] * size)
+    placeholders = ', '.join(['?'] * size)
+    return (f'UPDATE "accounts" SET "balance" = "balance" + CASE "id" {cases} END, "updatedAt" = ? '
+            f'WHERE "id" IN ({placeholders})')
+
+
+def apply_corrections(conn, drift):
+    """Move each drifted balance back to opening balance plus transactions"""
+    # Increments, not overwrites: a transaction written since the check moved
+    # the balance and the expected value together, so the drift still holds
+    now_ms = int(time.time() * 1000)
+    corrected = 0
+    with conn:
+        for start in range(0, len(drift), CORRECTION_BATCH_SIZE):
+            batch = drift[start:start + CORRECTION_BATCH_SIZE]
+            params = [value for row in batch for value in (row['id'], -row['difference'])]
+            params += [now_ms] + [row['id'] for row in batch]
+            corrected += conn.execute(correction_sql(len(batch)), params).rowcount
+    return corrected
+
+
+def apply_baseline(conn, user_id=None):
+    """Record an opening balance for every account that has none, accepting its stored balance"""
+    # One statement, so a transaction written meanwhile lands either before
+    # (in both the balance and the sum) or after it
+    sql = f'UPDATE "accounts" SET "openingBalance" = "balance" - COALESCE(({NET_SQL}), 0) WHERE "openingBalance" IS NULL'
+    with conn:
+        if user_id:
+            return conn.execute(sql + ' AND "userId" = ?', (user_id,)).rowcount
+        return conn.execute(sql).rowcount
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.reconcile', description='Check or repair account balances')
+    parser.add_argument('command', choices=['check', 'apply', 'baseline'])
+    parser.add_argument('--user', default=None, help='limit to one user id')
+    parser.add_argument('--db', default=None, help='SQLite database path (default: prisma/dev.db)')
+    parser.add_argument('--show', type=int, default=10, help='discrepancies to print (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        started = time.perf_counter()
+        if args.command == 'baseline':
+            recorded = apply_baseline(conn, args.user)
+            print(f"✅ Recorded {recorded:,} opening balances in {time.perf_counter() - started:.2f}s")
+            return 0
+
+        accounts, unbaselined, drift = find_drift(conn, args.user)
+        checked = f"({time.perf_counter() - started:.2f}s)"
+        if unbaselined:
+            print(f"{'❌' if args.command == 'apply' else '⚠️'} {unbaselined:,} of {accounts:,} accounts have no "
+                  f"opening balance yet - run `python -m tests.reconcile baseline` first")
+            if args.command == 'apply':
+                return 2
+        if not drift:
+            print(f"✅ All {accounts - unbaselined:,} recorded account balances match their transactions {checked}")
+            return 1 if unbaselined else 0
+
+        print(f"{'❌' if args.command == 'check' else '⚠️'} {len(drift):,} of {accounts:,} account balances "
+              f"differ from their transactions {checked}")
+        for row in drift[:args.show]:
+            print(f"   {row['id']} ({row['name']}): stored {row['balance']:.2f}, "
+                  f"expected {row['expected']:.2f}, off by {row['difference']:+.2f}")
+
+        if args.command == 'check':
+            print("   Run `python -m tests.reconcile apply` to correct them")
+            return 1
+        started = time.perf_counter()
+        corrected = apply_corrections(conn, drift)
+        print(f"✅ Corrected {corrected:,} balances in {time.perf_counter() - started:.2f}s")
+        return 0
+    except sqlite3.OperationalError as e:
+        if 'no such column' in str(e):
+            print(f"❌ {e} - run `pnpm prisma db push` to add it")
+            return 2
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Test result recorder shared by the Finance Wizard API test suites
+Keeps the log_test record format every suite reports with
+"""
+
+import threading
+from datetime import datetime
+
+
+class ResultRecorder:
+    def __init__(self):
+        self.test_results = []
+        self.critical_issues = []
+        self.lock = threading.Lock()
+
+    def log_test(self, test_name, success, message, details=None, critical=False):
+        """Log test results"""
+        result = {
+            'test': test_name,
+            'success': success,
+            'message': message,
+            'details': details,
+            'timestamp': datetime.now().isoformat(),
+            'critical': critical
+        }
+        status = "✅ PASS" if success else "❌ FAIL"
+        priority = " [CRITICAL]" if critical else ""
+
+        # Checks run concurrently, so keep each record and its output together
+        with self.lock:
+            self.test_results.append(result)
+
+            if critical and not success:
+                self.critical_issues.append(result)
+
+            print(f"{status}{priority}: {test_name} - {message}")
+            if details and not success:
+                print(f"   Details: {details}")
+        return result
+
+    def counts(self):
+        """Return (total, passed, failed, critical_failed) for the recorded results"""
+        with self.lock:
+            total = len(self.test_results)
+            passed = len([r for r in self.test_results if r['success']])
+            return total, passed, total - passed, len(self.critical_issues)
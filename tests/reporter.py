@@ -0,0 +1,67 @@
+"""
+Summary reporter shared by the Finance Wizard API test suites
+Prints totals, a per-category breakdown and the critical issues list
+"""
+
+
+class Reporter:
+    def __init__(self, title, categories=None):
+        # categories: [(label, [substrings matched against the test name])], first match wins
+        self.title = title
+        self.categories = categories or []
+
+    def categorize(self, test_results):
+        """Group results by the first category whose markers appear in the test name"""
+        grouped = {label: [] for label, _ in self.categories}
+        for result in test_results:
+            for label, markers in self.categories:
+                if any(marker in result['test'] for marker in markers):
+                    grouped[label].append(result)
+                    break
+        return grouped
+
+    def print_summary(self, recorder):
+        """Print the summary for a recorder and return (passed, failed, critical_failed)"""
+        print("\n" + "=" * 80)
+        print(f"🏁 {self.title}")
+        print("=" * 80)
+
+        total_tests, passed_tests, failed_tests, critical_failed = recorder.counts()
+        success_rate = (passed_tests / total_tests) * 100 if total_tests else 0.0
+
+        print(f"📊 Total Tests: {total_tests}")
+        print(f"✅ Passed: {passed_tests}")
+        print(f"❌ Failed: {failed_tests}")
+        print(f"🚨 Critical Issues: {critical_failed}")
+        print(f"📈 Success Rate: {success_rate:.1f}%")
+
+        if self.categories:
+            # Print category summaries
+            for category, results in self.categorize(recorder.test_results).items():
+                if results:
+                    passed = len([r for r in results if r['success']])
+                    print(f"\n📋 {category}: {passed}/{len(results)} passed")
+
+                    for result in results:
+                        if not result['success']:
+                            status = "🚨" if result.get('critical') else "⚠️"
+                            print(f"   {status} {result['test']}: {result['message']}")
+        else:
+            # Show failed tests
+            failed_results = [r for r in recorder.test_results if not r['success']]
+            if failed_results:
+                print(f"\n❌ Failed Tests:")
+                for result in failed_results:
+                    print(f"   • {result['test']}: {result['message']}")
+
+        # Critical issues summary
+        if recorder.critical_issues:
+            print(f"\n🚨 CRITICAL ISSUES REQUIRING IMMEDIATE ATTENTION:")
+            for issue in recorder.critical_issues:
+                print(f"   🔴 {issue['test']}")
+                print(f"      Problem: {issue['message']}")
+                if issue['details']:
+                    print(f"      Details: {issue['details']}")
+                print()
+
+        return passed_tests, failed_tests, critical_failed
@@ -0,0 +1,98 @@
+"""
+Backfill and verify the monthly_rollups table
+The API keeps the rollup in step with transaction writes; this command
+rebuilds it from the transactions table (e.g. after a bulk load with
+tests.ledger) and checks that the stored buckets match a fresh aggregation
+
+    python -m tests.rollups backfill
+    python -m tests.rollups verify --user <userId>
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+
+from tests.db import connect
+
+# (userId, YYYY-MM, categoryId, accountId) -> (total, count), straight from the
+# transactions; Prisma stores DateTime as epoch milliseconds in SQLite
+AGGREGATE_SQL = """
+    SELECT "userId", strftime('%Y-%m', "date" / 1000, 'unixepoch') AS "month", "categoryId", "accountId",
+           SUM("amount") AS "total", COUNT(*) AS "count"
+    FROM "transactions"
+    {where}
+    GROUP BY "userId", "month", "categoryId", "accountId"
+"""
+
+# Float sums can differ in the last digits depending on summation order
+TOLERANCE = 0.005
+
+
+def _user_filter(user_id):
+    return ('WHERE "userId" = ?', (user_id,)) if user_id else ('', ())
+
+
+def backfill(conn, user_id=None):
+    """Replace the rollup rows (for one user, or everyone) with a fresh aggregation"""
+    where, params = _user_filter(user_id)
+    now_ms = int(time.time() * 1000)
+    with conn:
+        conn.execute(f'DELETE FROM "monthly_rollups" {where}', params)
+        conn.execute(
+            'INSERT INTO "monthly_rollups" ("userId", "month", "categoryId", "accountId", "total", "count", "updatedAt") '
+            f'SELECT *, {now_ms} FROM ({AGGREGATE_SQL.format(where=where)})', params)
+    return conn.execute(f'SELECT COUNT(*) FROM "monthly_rollups" {where}', params).fetchone()[0]
+
+
+def verify(conn, user_id=None):
+    """Compare stored buckets with a fresh aggregation and return the mismatches"""
+    where, params = _user_filter(user_id)
+    expected = {row[:4]: row[4:] for row in conn.execute(AGGREGATE_SQL.format(where=where), params)}
+    stored = {row[:4]: row[4:] for row in conn.execute(
+        f'SELECT "userId", "month", "categoryId", "accountId", "total", "count" FROM "monthly_rollups" {where}', params)}
+
+    mismatches = []
+    for key in expected.keys() | stored.keys():
+        want, have = expected.get(key), stored.get(key)
+        if want is None or have is None or want[1] != have[1] or abs(want[0] - have[0]) > TOLERANCE:
+            mismatches.append({'bucket': key, 'expected': want, 'stored': have})
+    return len(expected), mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.rollups', description='Backfill or verify the monthly rollup table')
+    parser.add_argument('command', choices=['backfill', 'verify'])
+    parser.add_argument('--user', default=None, help='limit to one user id')
+    parser.add_argument('--db', default=None, help='SQLite database path (default: prisma/dev.db)')
+    parser.add_argument('--show', type=int, default=10, help='mismatches to print (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        started = time.perf_counter()
+        if args.command == 'backfill':
+            rows = backfill(conn, args.user)
+            print(f"✅ Rebuilt {rows:,} rollup buckets in {time.perf_counter() - started:.2f}s")
+            return 0
+
+        buckets, mismatches = verify(conn, args.user)
+        if not mismatches:
+            print(f"✅ All {buckets:,} rollup buckets match the transactions ({time.perf_counter() - started:.2f}s)")
+            return 0
+        print(f"❌ {len(mismatches):,} of {buckets:,} buckets differ from the transactions")
+        for mismatch in mismatches[:args.show]:
+            print(f"   {mismatch['bucket']}: expected {mismatch['expected']}, stored {mismatch['stored']}")
+        print("   Run `python -m tests.rollups backfill` to rebuild")
+        return 1
+    except sqlite3.OperationalError as e:
+        if 'no such table' in str(e):
+            print(f"❌ {e} - run `pnpm prisma db push` to create it")
+            return 2
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
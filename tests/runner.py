@@ -0,0 +1,77 @@
+"""
+Concurrent check runner for the Finance Wizard API test suites
+Runs independent checks in parallel on worker threads behind an asyncio
+semaphore, so a full suite takes about as long as its slowest check
+"""
+
+import asyncio
+import os
+import time
+from functools import partial
+
+# Maximum number of checks in flight at once (override with TEST_CONCURRENCY)
+DEFAULT_CONCURRENCY = int(os.getenv('TEST_CONCURRENCY', '8'))
+
+
+def check_name(check):
+    """Readable name for a check callable (plain method or functools.partial)"""
+    if isinstance(check, partial):
+        args = ', '.join(str(arg) for arg in check.args)
+        return f"{check_name(check.func)}({args})"
+    return getattr(check, '__name__', repr(check))
+
+
+def fan_out(check, items):
+    """Build one check per item, unpacking tuple items into positional arguments"""
+    return [partial(check, *item) if isinstance(item, tuple) else partial(check, item) for item in items]
+
+
+def sequence(*checks):
+    """Chain checks that depend on each other so they run in order as one check"""
+    def run_sequence():
+        for check in checks:
+            check()
+
+    run_sequence.__name__ = ' -> '.join(check_name(check) for check in checks)
+    return run_sequence
+
+
+class AsyncCheckRunner:
+    def __init__(self, log_test, concurrency=None):
+        self.log_test = log_test
+        self.concurrency = max(1, concurrency or DEFAULT_CONCURRENCY)
+
+    async def _run_check(self, semaphore, check):
+        """Run one blocking check on a worker thread once a slot is free"""
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await asyncio.to_thread(check)
+            except Exception as e:
+                # A check that blows up still shows up in the results instead of killing the run
+                self.log_test(
+                    f"Check Runner - {check_name(check)}",
+                    False,
+                    "Check raised an unhandled exception",
+                    f"{type(e).__name__}: {e}"
+                )
+            return check_name(check), time.perf_counter() - started
+
+    async def gather(self, checks):
+        """Run all checks concurrently and return (name, seconds) timings in submission order"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*(self._run_check(semaphore, check) for check in checks))
+
+    def run(self, checks):
+        """Run checks to completion from synchronous code and print a timing summary"""
+        started = time.perf_counter()
+        timings = asyncio.run(self.gather(checks))
+        wall_time = time.perf_counter() - started
+        check_time = sum(seconds for _, seconds in timings)
+
+        print(f"\n⏱️  Ran {len(timings)} checks in {wall_time:.2f}s "
+              f"(sequential estimate {check_time:.2f}s, concurrency {self.concurrency})")
+        if timings:
+            slowest_name, slowest_time = max(timings, key=lambda timing: timing[1])
+            print(f"   Slowest check: {slowest_name} ({slowest_time:.2f}s)")
+        return timings
@@ -0,0 +1,282 @@
+"""
+Transaction search benchmark: LIKE scan vs the FTS5 trigram index
+Builds the search index from lib/search.js on a copy of the SQLite database,
+checks that both search paths return the same transactions, then times the
+queries behind GET /api/transactions?search= for common, rare, mid-word and
+missing terms and writes the latencies to a JSON report. The `like` path is
+the search as it ran before the index, a LIKE scan over the (userId, date, id)
+listing index; the `route` path is what the API runs for a date-ordered page:
+an index lookup for terms nobody's descriptions contain, then the same LIKE
+scan over the (userId, date, id, description) index from prisma/schema.prisma
+
+    python -m tests.ledger --transactions 1000000
+    python -m tests.search_bench --runs 20
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from tests.db import connect
+from tests.stats import summarize_latencies
+
+# Same statements as SEARCH_INDEX_SQL in lib/search.js
+SEARCH_INDEX_SQL = [
+    '''CREATE VIRTUAL TABLE IF NOT EXISTS "transactions_fts" USING fts5(
+        "description", content='transactions', content_rowid='rowid', tokenize='trigram'
+    )''',
+    '''CREATE TRIGGER IF NOT EXISTS "transactions_fts_insert" AFTER INSERT ON "transactions" BEGIN
+        INSERT INTO "transactions_fts"(rowid, "description") VALUES (new.rowid, new."description");
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS "transactions_fts_delete" AFTER DELETE ON "transactions" BEGIN
+        INSERT INTO "transactions_fts"("transactions_fts", rowid, "description") VALUES ('delete', old.rowid, old."description");
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS "transactions_fts_update" AFTER UPDATE OF "description" ON "transactions" BEGIN
+        INSERT INTO "transactions_fts"("transactions_fts", rowid, "description") VALUES ('delete', old.rowid, old."description");
+        INSERT INTO "transactions_fts"(rowid, "description") VALUES (new.rowid, new."description");
+    END''',
+]
+
+# Same probe as SEARCH_SYNC_SQL in lib/search.js: newest rows missing from the
+# index under their own rowid, i.e. the rowids moved since the index was built
+SEARCH_SYNC_SQL = '''
+    SELECT COUNT(*) FROM (
+        SELECT rowid, "description" FROM "transactions"
+        WHERE length(trim("description")) >= 3
+        ORDER BY rowid DESC LIMIT 8
+    ) p
+    WHERE NOT EXISTS (
+        SELECT 1 FROM "transactions_fts"
+        WHERE "transactions_fts" MATCH '"' || replace(trim(p."description"), '"', '""') || '"'
+          AND "transactions_fts".rowid = p.rowid
+    )
+'''
+
+PAGE = 51  # default page size + 1, as the transactions route fetches it
+ORDER = 't."date" DESC, t."id" DESC'
+# CROSS JOIN keeps the index as the outer loop, as in lib/search.js
+FTS_FROM = 'FROM "transactions_fts" CROSS JOIN "transactions" t ON t.rowid = "transactions_fts".rowid'
+# The listing index before description was added to it, and the one in
+# prisma/schema.prisma now; both are created in the copy if missing
+BASELINE_INDEX = ('transactions_userId_date_id_idx', '("userId", "date", "id")')
+SEARCH_INDEXES = [BASELINE_INDEX, ('transactions_userId_date_id_description_idx', '("userId", "date", "id", "description")')]
+BASELINE_FROM = f'FROM "transactions" t INDEXED BY "{BASELINE_INDEX[0]}"'
+# anyMatch() and the date-ordered query in lib/search.js
+ANY_MATCH_SQL = 'SELECT rowid FROM "transactions_fts" WHERE "transactions_fts" MATCH :phrase LIMIT 1'
+ROUTE_PAGE_SQL = f'SELECT t."id" FROM "transactions" t WHERE t."userId" = :user AND t."description" LIKE :like ORDER BY {ORDER} LIMIT {PAGE}'
+
+# (name, SQL) per search path; :user, :like and :phrase are bound per term
+QUERIES = {
+    'like': [
+        ('page', f'SELECT t."id" {BASELINE_FROM} WHERE t."userId" = :user AND t."description" LIKE :like '
+                 f'ORDER BY {ORDER} LIMIT {PAGE}'),
+        ('all matches', f'SELECT COUNT(*) {BASELINE_FROM} WHERE t."userId" = :user AND t."description" LIKE :like'),
+    ],
+    'fts': [
+        ('page', f'SELECT t."id" {FTS_FROM} WHERE "transactions_fts" MATCH :phrase AND t."userId" = :user '
+                 f'ORDER BY {ORDER} LIMIT {PAGE}'),
+        ('relevance page', f'SELECT t."id" {FTS_FROM} WHERE "transactions_fts" MATCH :phrase AND t."userId" = :user '
+                           f'ORDER BY "transactions_fts".rank, {ORDER} LIMIT {PAGE}'),
+        ('all matches', f'SELECT COUNT(*) {FTS_FROM} WHERE "transactions_fts" MATCH :phrase AND t."userId" = :user'),
+    ],
+}
+
+
+def route_page(conn, params):
+    """A date-ordered page the way searchTransactionIds fetches it"""
+    if conn.execute(ANY_MATCH_SQL, params).fetchone() is None:
+        return []
+    return conn.execute(ROUTE_PAGE_SQL, params).fetchall()
+
+
+QUERIES['route'] = [('page', route_page)]
+
+
+def build_index(conn):
+    """Create the FTS table, triggers and listing indexes and fill them; returns seconds taken"""
+    started = time.perf_counter()
+    with conn:
+        for name, columns in SEARCH_INDEXES:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "transactions" {columns}')
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'transactions_fts'").fetchone()
+        for sql in SEARCH_INDEX_SQL:
+            conn.execute(sql)
+        if not exists:
+            conn.execute('INSERT INTO "transactions_fts"("transactions_fts") VALUES (\'rebuild\')')
+    return time.perf_counter() - started
+
+
+def phrase(term):
+    """A literal substring as an FTS5 phrase, like searchPhrase() in lib/search.js"""
+    return '"' + term.strip().replace('"', '""') + '"'
+
+
+def sample_terms(conn, user_id):
+    """Search terms drawn from the user's own descriptions, from very common to absent"""
+    by_frequency = conn.execute(
+        'SELECT "description", COUNT(*) FROM "transactions" WHERE "userId" = ? GROUP BY "description" ORDER BY 2 DESC',
+        (user_id,)).fetchall()
+    if not by_frequency:
+        raise ValueError('No transactions to search; generate some with python -m tests.ledger')
+    common, rare = by_frequency[0][0], by_frequency[-1][0]
+    terms = {
+        'common': common.split()[0],
+        'rare': rare,
+        # Inside a word, which token-based indexes cannot answer
+        'mid-word': common.replace(' ', '')[1:5] if len(common.replace(' ', '')) >= 5 else common,
+        'missing': 'qzxv',
+    }
+    return {label: term for label, term in terms.items() if len(term.strip()) >= 3}
+
+
+def check_sync(conn, user_id):
+    """Insert, rename and delete a row in a rolled-back transaction; the index must follow each step"""
+    def fts_hits(term):
+        return conn.execute(f'SELECT COUNT(*) {FTS_FROM} WHERE "transactions_fts" MATCH ?', (phrase(term),)).fetchone()[0]
+
+    row = conn.execute('SELECT * FROM "transactions" WHERE "userId" = ? LIMIT 1', (user_id,)).fetchone()
+    columns = [c[1] for c in conn.execute('PRAGMA table_info("transactions")')]
+    record = dict(zip(columns, row))
+    record.update(id='search-bench-probe', description='Searchbench Probe Alpha')
+    if 'fingerprint' in record:
+        record['fingerprint'] = None  # unique
+    steps = []
+    try:
+        names = ', '.join(f'"{column}"' for column in record)
+        conn.execute(f'INSERT INTO "transactions" ({names}) VALUES ({", ".join("?" * len(record))})', list(record.values()))
+        steps.append(('insert', fts_hits('probe alpha') == 1))
+        conn.execute('UPDATE "transactions" SET "description" = ? WHERE "id" = ?', ('Searchbench Probe Beta', record['id']))
+        steps.append(('update', fts_hits('probe alpha') == 0 and fts_hits('probe beta') == 1))
+        conn.execute('DELETE FROM "transactions" WHERE "id" = ?', (record['id'],))
+        steps.append(('delete', fts_hits('probe beta') == 0))
+        conn.execute('INSERT INTO "transactions_fts"("transactions_fts", rank) VALUES (\'integrity-check\', 1)')
+        steps.append(('integrity-check', True))
+        steps.append(('rowids', conn.execute(SEARCH_SYNC_SQL).fetchone()[0] == 0))
+    finally:
+        conn.rollback()
+    return steps
+
+
+def measure(conn, sql, params, runs):
+    """Time a query, or a function of (conn, params) that runs several"""
+    if callable(sql):
+        plan, query = [sql.__name__], lambda: sql(conn, params)
+    else:
+        plan, query = [row[-1] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)], lambda: conn.execute(sql, params).fetchall()
+    result = query()  # also warms the page cache
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        query()
+        timings.append(time.perf_counter() - started)
+    return result, {'plan': plan, 'latency': summarize_latencies(timings)}
+
+
+def run(conn, user_id, terms, runs):
+    results, mismatches = [], []
+    for label, term in terms.items():
+        params = {'user': user_id, 'like': f'%{term}%', 'phrase': phrase(term)}
+        print(f"\n🔎 {label}: '{term}'")
+        rows = {}
+        for path, queries in QUERIES.items():
+            for name, sql in queries:
+                result, stats = measure(conn, sql, params, runs)
+                rows[(path, name)] = result
+                results.append({'term': term, 'kind': label, 'path': path, 'query': name, **stats})
+                print(f"   {path:<5} {name:<15} p50 {stats['latency']['p50_ms']:>9}ms  p95 {stats['latency']['p95_ms']:>9}ms  "
+                      f"{' | '.join(stats['plan'])}")
+        # Both paths must find the same transactions
+        if (rows[('like', 'all matches')] != rows[('fts', 'all matches')] or rows[('like', 'page')] != rows[('fts', 'page')]
+                or rows[('like', 'page')] != rows[('route', 'page')]):
+            mismatches.append({'term': term, 'like': rows[('like', 'all matches')], 'fts': rows[('fts', 'all matches')]})
+        print(f"   matches: {rows[('like', 'all matches')][0][0]:,} (LIKE) / {rows[('fts', 'all matches')][0][0]:,} (FTS)")
+    return results, mismatches
+
+
+def print_comparison(results):
+    print("\n📊 p50 LIKE before the index -> FTS (-> route, for pages):")
+    by_key = {}
+    for result in results:
+        by_key.setdefault((result['kind'], result['query']), {})[result['path']] = result['latency']['p50_ms']
+    for (kind, query), latency in by_key.items():
+        if 'like' in latency and 'fts' in latency:
+            before, after = latency['like'], latency.get('route', latency['fts'])
+            speedup = f"{before / after:,.1f}x" if after else 'n/a'
+            route = f" -> {latency['route']:>9}ms" if 'route' in latency else ''
+            print(f"   {kind:<10} {query:<15} {before:>9}ms -> {latency['fts']:>9}ms{route}  ({speedup})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.search_bench', description='Compare LIKE and FTS5 transaction search')
+    parser.add_argument('--db', default=None, help='SQLite database to copy (default: prisma/dev.db)')
+    parser.add_argument('--user', default=None, help='user id to search as (default: the one with most transactions)')
+    parser.add_argument('--term', action='append', default=[], help='search term to add (repeatable)')
+    parser.add_argument('--runs', type=int, default=20, help='timed runs per query (default: %(default)s)')
+    parser.add_argument('--in-place', action='store_true',
+                        help='benchmark the database itself instead of a copy; leaves the search and listing indexes built')
+    parser.add_argument('--output', default='search_bench.json', help='JSON report path (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    source = connect(args.db)
+    source_path = source.execute('PRAGMA database_list').fetchone()[2]
+    source.close()
+
+    workdir = None
+    path = source_path
+    if not args.in_place:
+        workdir = tempfile.mkdtemp(prefix='search-bench-')
+        path = os.path.join(workdir, 'bench.db')
+        shutil.copyfile(source_path, path)
+
+    conn = connect(path)
+    try:
+        user_id = args.user or conn.execute(
+            'SELECT "userId" FROM "transactions" GROUP BY "userId" ORDER BY COUNT(*) DESC LIMIT 1').fetchone()[0]
+        user_rows = conn.execute('SELECT COUNT(*) FROM "transactions" WHERE "userId" = ?', (user_id,)).fetchone()[0]
+        print("🚀 Transaction Search Benchmark")
+        print(f"📍 Database: {source_path}{'' if args.in_place else ' (copy)'}")
+        print(f"👤 User {user_id} with {user_rows:,} transactions")
+        print("=" * 80)
+
+        build_seconds = build_index(conn)
+        print(f"🏗️ Search index ready in {build_seconds:.2f}s")
+        steps = check_sync(conn, user_id)
+        print(f"🔁 Trigger sync: {', '.join(f'{step} {chr(9989) if ok else chr(10060)}' for step, ok in steps)}")
+
+        terms = sample_terms(conn, user_id)
+        terms.update({f'custom {i + 1}': term for i, term in enumerate(args.term)})
+        results, mismatches = run(conn, user_id, terms, args.runs)
+        print_comparison(results)
+
+        if mismatches:
+            print(f"\n❌ LIKE and FTS disagree for {len(mismatches)} term(s): {mismatches}")
+        else:
+            print("\n✅ LIKE and FTS return the same transactions for every term")
+
+        report = {
+            'database': source_path,
+            'user': user_id,
+            'user_transactions': user_rows,
+            'index_build_seconds': round(build_seconds, 3),
+            'sync_checks': dict(steps),
+            'runs': args.runs,
+            'terms': terms,
+            'results': results,
+            'mismatches': mismatches,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Report written to {args.output}")
+    finally:
+        conn.close()
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return 1 if mismatches or not all(ok for _, ok in steps) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
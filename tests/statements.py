@@ -0,0 +1,398 @@
+"""
+Bank statement format detection and normalization
+Sniffs each statement's layout from its header row and its date format from
+the first rows, compiles a column mapping once per file, then converts rows
+column-by-column in batches into the transaction shape the API imports
+(date, description, signed amount, type, account, category). Layouts are
+plugins: subclass StatementFormat and decorate it with @register_format,
+from this module or from one passed with --plugin
+
+    python -m tests.statements detect sample-data/*.csv
+    python -m tests.statements convert statements/ --out normalized/ --workers 4
+    python -m tests.statements convert hdfc.csv --plugin my_formats --format jsonl
+"""
+
+import argparse
+import csv
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+
+DEFAULT_BATCH_SIZE = 5000
+SNIFF_ROWS = 50
+
+# Tried in order; the first that parses every sampled date wins, so
+# month-first beats day-first unless a day above 12 rules it out
+DATE_FORMATS = ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%m/%d/%y', '%d/%m/%y', '%d-%m-%Y', '%d.%m.%Y', '%d %b %Y', '%b %d, %Y']
+
+# Header row of the normalized output, the columns POST /api/import accepts
+OUTPUT_FIELDS = ['date', 'description', 'amount', 'type', 'account', 'category']
+
+TYPE_NAMES = {
+    'income': 'INCOME', 'credit': 'INCOME', 'cr': 'INCOME', 'deposit': 'INCOME',
+    'expense': 'EXPENSE', 'debit': 'EXPENSE', 'dr': 'EXPENSE', 'withdrawal': 'EXPENSE',
+}
+
+FORMATS = []
+
+
+def register_format(cls):
+    """Class decorator that adds a StatementFormat to detection"""
+    FORMATS.append(cls())
+    return cls
+
+
+def _normalize(header):
+    return ' '.join(header.strip().lower().replace('_', ' ').split())
+
+
+def parse_amount(value):
+    """'1,234.50' -> 1234.5, '(12.00)' -> -12.0, '' -> None"""
+    text = value.strip().replace(',', '').replace('$', '')
+    if not text:
+        return None
+    if text.startswith('(') and text.endswith(')'):
+        return -float(text[1:-1])
+    return float(text)
+
+
+def detect_date_format(samples):
+    """Pick the first DATE_FORMATS entry that parses every non-empty sample"""
+    samples = [s.strip() for s in samples if s.strip()]
+    if not samples:
+        raise ValueError('No dates to detect a format from')
+    for fmt in DATE_FORMATS:
+        try:
+            for sample in samples:
+                datetime.strptime(sample, fmt)
+        except ValueError:
+            continue
+        return fmt
+    raise ValueError(f"Unrecognized date format, e.g. '{samples[0]}'")
+
+
+class StatementFormat:
+    """
+    One statement layout. `fields` maps output field -> accepted header names;
+    `required` lists the fields a header must provide for the layout to apply.
+    Override `amounts` for layouts that do not carry a single signed amount.
+    """
+
+    name = None
+    fields = {}
+    required = ()
+
+    def match(self, headers):
+        """Column index per field if every required field is present, else None"""
+        normalized = [_normalize(h) for h in headers]
+        columns = {}
+        for field, aliases in self.fields.items():
+            for alias in aliases:
+                if alias in normalized:
+                    columns[field] = normalized.index(alias)
+                    break
+        if all(field in columns for field in self.required):
+            return columns
+        return None
+
+    def amounts(self, columns):
+        """Signed amounts for a batch, from the column lists of that batch"""
+        return [parse_amount(v) for v in columns['amount']]
+
+
+@register_format
+class DebitCreditFormat(StatementFormat):
+    """Separate debit and credit columns, usually with a running balance"""
+
+    name = 'debit-credit'
+    fields = {
+        'date': ['transaction date', 'date', 'posting date', 'value date'],
+        'description': ['transaction description', 'description', 'narration', 'details'],
+        'debit': ['debit amount', 'debit', 'withdrawal amount', 'withdrawal'],
+        'credit': ['credit amount', 'credit', 'deposit amount', 'deposit'],
+        'balance': ['balance', 'running balance', 'closing balance'],
+        'account': ['account', 'account name'],
+        'category': ['category'],
+    }
+    required = ('date', 'description', 'debit', 'credit')
+
+    def amounts(self, columns):
+        result = []
+        for debit, credit in zip(columns['debit'], columns['credit']):
+            debit, credit = parse_amount(debit), parse_amount(credit)
+            result.append(-abs(debit) if debit else abs(credit) if credit else None)
+        return result
+
+
+@register_format
+class SignedAmountFormat(StatementFormat):
+    """One signed amount column, optionally with an explicit type"""
+
+    name = 'signed-amount'
+    fields = {
+        'date': ['date', 'transaction date', 'posting date', 'value date'],
+        'description': ['description', 'transaction description', 'narration', 'details', 'memo'],
+        'amount': ['amount', 'transaction amount'],
+        'type': ['type', 'transaction type'],
+        'account': ['account', 'account name'],
+        'category': ['category'],
+    }
+    required = ('date', 'description', 'amount')
+
+
+class StatementMapping:
+    """A format, its column positions and date format, compiled for one file"""
+
+    def __init__(self, statement_format, columns, date_format, default_account=''):
+        self.format = statement_format
+        self.columns = columns
+        self.date_format = date_format
+        self.default_account = default_account
+
+    def describe(self):
+        return {
+            'format': self.format.name,
+            'date_format': self.date_format,
+            'columns': self.columns,
+        }
+
+    def convert(self, rows):
+        """
+        Convert a batch of raw rows; returns (transactions, errors) where
+        errors are (row offset in batch, message)
+        """
+        # Column-wise: slice each mapped column out once, then convert whole lists
+        width = max(self.columns.values()) + 1
+        padded = [row + [''] * (width - len(row)) if len(row) < width else row for row in rows]
+        columns = {field: [row[i] for row in padded] for field, i in self.columns.items()}
+        empty = [''] * len(rows)
+
+        date_format = self.date_format
+        dates, errors = [], []
+        for offset, text in enumerate(columns['date']):
+            try:
+                dates.append(datetime.strptime(text.strip(), date_format).date().isoformat())
+            except ValueError:
+                dates.append(None)
+                errors.append((offset, f"Invalid date '{text}'"))
+
+        try:
+            amounts = self.format.amounts(columns)
+        except ValueError:
+            # Fall back to row by row only for the batch with a bad number
+            amounts = []
+            for offset in range(len(rows)):
+                try:
+                    amounts.extend(self.format.amounts({field: [values[offset]] for field, values in columns.items()}))
+                except ValueError:
+                    amounts.append(None)
+        types = [TYPE_NAMES.get(t.strip().lower()) for t in columns.get('type', empty)]
+        descriptions = [d.strip() for d in columns['description']]
+        accounts = [a.strip() or self.default_account for a in columns.get('account', empty)]
+        categories = [c.strip() for c in columns.get('category', empty)]
+
+        transactions = []
+        bad = {offset for offset, _ in errors}
+        for offset, (date, description, amount, kind, account, category) in enumerate(
+                zip(dates, descriptions, amounts, types, accounts, categories)):
+            if offset in bad:
+                continue
+            if not amount:
+                errors.append((offset, 'Missing or invalid amount'))
+                continue
+            if not description:
+                errors.append((offset, 'Missing description'))
+                continue
+            transactions.append({
+                'date': date,
+                'description': description,
+                'amount': round(amount, 2),
+                'type': kind or ('EXPENSE' if amount < 0 else 'INCOME'),
+                'account': account,
+                'category': category,
+            })
+        return transactions, sorted(errors)
+
+
+def detect(headers, sample_rows, default_account=''):
+    """Compile the mapping for a header row; the layout matching most fields wins"""
+    best = None
+    for statement_format in FORMATS:
+        columns = statement_format.match(headers)
+        if columns is not None and (best is None or len(columns) > len(best[1])):
+            best = (statement_format, columns)
+    if best is None:
+        raise ValueError(f"No statement format matches header {headers}")
+    statement_format, columns = best
+    date_format = detect_date_format(row[columns['date']] for row in sample_rows if len(row) > columns['date'])
+    return StatementMapping(statement_format, columns, date_format, default_account)
+
+
+def _batches(rows, size):
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+@contextmanager
+def open_statement(path, default_account=''):
+    """
+    Open a statement and detect its format; yields (mapping, rows) where rows
+    iterates the records after the header, blank lines skipped. Detection
+    happens on entry, so nothing downstream runs for an unrecognized file
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = (row for row in csv.reader(f) if any(cell.strip() for cell in row))
+        headers = next(rows, None)
+        if headers is None:
+            raise ValueError(f"{path} is empty")
+        sample = list(islice(rows, SNIFF_ROWS))
+        yield detect(headers, sample, default_account), _chain(sample, rows)
+
+
+def convert_rows(mapping, rows, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield (transactions, errors) per batch; error entries are (line number, message)"""
+    # Line numbers assume one physical line per record after the header
+    line = 2
+    for batch in _batches(rows, batch_size):
+        transactions, errors = mapping.convert(batch)
+        yield transactions, [(line + offset, message) for offset, message in errors]
+        line += len(batch)
+
+
+def _chain(first, rest):
+    yield from first
+    yield from rest
+
+
+def _output_path(path, out_dir, output_format):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(out_dir, f"{name}.normalized.{output_format}")
+
+
+def convert_file(path, out_dir, output_format='csv', batch_size=DEFAULT_BATCH_SIZE, default_account=''):
+    """Normalize one statement into out_dir and return a summary"""
+    started = time.perf_counter()
+    target = _output_path(path, out_dir, output_format)
+    converted, failed, errors = 0, 0, []
+    # The output is only created once the format is known, so an unrecognized
+    # file leaves nothing behind for a later bulk upload to pick up
+    with open_statement(path, default_account) as (mapping, rows), \
+            open(target, 'w', newline='', encoding='utf-8') as out:
+        writer = None
+        if output_format == 'csv':
+            writer = csv.DictWriter(out, fieldnames=OUTPUT_FIELDS)
+            writer.writeheader()
+        for transactions, batch_errors in convert_rows(mapping, rows, batch_size):
+            if writer:
+                writer.writerows(transactions)
+            else:
+                out.writelines(json.dumps(t) + '\n' for t in transactions)
+            converted += len(transactions)
+            failed += len(batch_errors)
+            errors.extend(batch_errors[:max(0, 20 - len(errors))])
+
+    return {
+        'source': path,
+        'output': target,
+        **mapping.describe(),
+        'converted': converted,
+        'failed': failed,
+        'errors': errors,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def load_plugins(modules):
+    """Import plugin modules; their @register_format classes join detection"""
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _convert_job(job):
+    path, out_dir, output_format, batch_size, default_account, plugins = job
+    # Worker processes start fresh under spawn, so plugins are loaded again
+    load_plugins(plugins)
+    try:
+        return convert_file(path, out_dir, output_format, batch_size, default_account)
+    except (OSError, ValueError) as e:
+        return {'source': path, 'error': str(e)}
+
+
+def _statement_paths(inputs):
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                if name.lower().endswith('.csv'):
+                    yield os.path.join(item, name)
+        else:
+            yield item
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.statements', description='Detect and normalize bank statement CSVs')
+    parser.add_argument('command', choices=['detect', 'convert'])
+    parser.add_argument('inputs', nargs='+', help='statement files or directories of .csv files')
+    parser.add_argument('--out', default='normalized', help='output directory for convert (default: %(default)s)')
+    parser.add_argument('--format', dest='output_format', choices=['csv', 'jsonl'], default='csv',
+                        help='output format; csv can be POSTed to /api/import (default: %(default)s)')
+    parser.add_argument('--account', default='', help='account name for statements without an account column')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='rows per batch (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=1, help='files converted in parallel (default: %(default)s)')
+    parser.add_argument('--plugin', action='append', default=[], help='module registering extra formats (repeatable)')
+    args = parser.parse_args(argv)
+
+    load_plugins(args.plugin)
+    paths = list(_statement_paths(args.inputs))
+    if not paths:
+        parser.error('no statement files found')
+
+    if args.command == 'detect':
+        failures = 0
+        for path in paths:
+            try:
+                with open_statement(path) as (mapping, _):
+                    info = mapping.describe()
+                print(f"✅ {path}: {info['format']}, dates {info['date_format']}, columns {info['columns']}")
+            except (OSError, ValueError) as e:
+                failures += 1
+                print(f"❌ {path}: {e}")
+        return 1 if failures else 0
+
+    os.makedirs(args.out, exist_ok=True)
+    jobs = [(path, args.out, args.output_format, args.batch_size, args.account, args.plugin) for path in paths]
+    started = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = list(pool.map(_convert_job, jobs))
+    else:
+        results = [_convert_job(job) for job in jobs]
+    elapsed = time.perf_counter() - started
+
+    total, failures = 0, 0
+    for result in results:
+        if 'error' in result:
+            failures += 1
+            print(f"❌ {result['source']}: {result['error']}")
+            continue
+        total += result['converted']
+        print(f"✅ {result['source']} -> {result['output']} ({result['format']}, {result['converted']:,} rows, "
+              f"{result['failed']:,} skipped, {result['seconds']}s)")
+        for line, message in result['errors'][:5]:
+            print(f"   line {line}: {message}")
+
+    rate = total / elapsed if elapsed else 0
+    print(f"\n📊 {total:,} transactions from {len(results)} file(s) in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Latency statistics shared by the load test and benchmarks
+"""
+
+import math
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (pct in 0-100)"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_latencies(seconds):
+    """Summarize latencies given in seconds as milliseconds"""
+    values = sorted(seconds)
+    if not values:
+        return {'count': 0, 'min_ms': None, 'mean_ms': None, 'p50_ms': None,
+                'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+
+    def ms(value):
+        return round(value * 1000, 3)
+
+    return {
+        'count': len(values),
+        'min_ms': ms(values[0]),
+        'mean_ms': ms(sum(values) / len(values)),
+        'p50_ms': ms(percentile(values, 50)),
+        'p95_ms': ms(percentile(values, 95)),
+        'p99_ms': ms(percentile(values, 99)),
+        'max_ms': ms(values[-1]),
+    }